@@ -1,7 +1,17 @@
 # backend/api/deps/auth_deps.py
+import functools
+from typing import Optional
+
 from fastapi import Depends, HTTPException
 from starlette.requests import Request
-from starlette.status import HTTP_403_FORBIDDEN
+from starlette.status import HTTP_401_UNAUTHORIZED, HTTP_403_FORBIDDEN
+
+from api.middleware.auth_middleware import extract_api_key, load_api_keys
+
+
+@functools.lru_cache(maxsize=1)
+def _api_keys():
+    return load_api_keys()
 
 def require_scope(scope: str):
     def _check(request: Request):
@@ -13,3 +23,23 @@ def require_scope(scope: str):
             raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Insufficient scope")
         return True
     return _check
+
+
+def require_api_key(scope: Optional[str] = None):
+    """
+    Per-route API key check for endpoints not behind AuthMiddleware.
+    Fails closed: with no keys configured every request is rejected.
+    """
+    def _check(request: Request):
+        api_key = extract_api_key(request)
+        if not api_key:
+            raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="API key required")
+        meta = _api_keys().get(api_key)
+        if not meta or not meta.get("active", True):
+            raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+        request.state.client_id = meta.get("client_id")
+        request.state.client_meta = meta
+        if scope is not None:
+            require_scope(scope)(request)
+        return meta
+    return _check
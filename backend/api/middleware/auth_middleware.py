@@ -60,6 +60,21 @@ def load_api_keys() -> Dict[str, Dict[str, Any]]:
     return {}
 
 
+def extract_api_key(request: Request) -> Optional[str]:
+    # Priority: X-API-KEY header -> Authorization: Bearer <key>
+    key = request.headers.get("x-api-key")
+    if key:
+        return key.strip()
+    auth = request.headers.get("authorization")
+    if not auth:
+        return None
+    # support "Bearer <token>"
+    parts = auth.split()
+    if len(parts) == 2 and parts[0].lower() == "bearer":
+        return parts[1].strip()
+    return None
+
+
 class AuthError(Exception):
     pass
 
@@ -72,18 +87,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
         self.enforce_acl = enforce_acl
 
     def _extract_key(self, request: Request) -> Optional[str]:
-        # Priority: X-API-KEY header -> Authorization: Bearer <key>
-        key = request.headers.get("x-api-key")
-        if key:
-            return key.strip()
-        auth = request.headers.get("authorization")
-        if not auth:
-            return None
-        # support "Bearer <token>"
-        parts = auth.split()
-        if len(parts) == 2 and parts[0].lower() == "bearer":
-            return parts[1].strip()
-        return None
+        return extract_api_key(request)
 
     def _unauthorized(self, msg="Unauthorized") -> Response:
         return JSONResponse({"detail": msg}, status_code=HTTP_401_UNAUTHORIZED)
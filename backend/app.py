@@ -11,12 +11,13 @@ Responsibilities:
 - Serve frontend static files
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, List
+import json
 import logging
 import time
 import os
@@ -27,6 +28,14 @@ logging.basicConfig(level=logging.INFO)
 
 # Import health check (lightweight, reload-safe)
 from monitoring.health import health_check
+from config.settings import (
+    BATCH_MAX_ITEMS, BATCH_MAX_CONCURRENCY,
+    ADMISSION_MAX_WORKERS, ADMISSION_MAX_QUEUE, ADMISSION_AGING_SEC,
+    ADMISSION_INTENT_LIMITS,
+    LLM_HEALTH_INTERVAL_SEC, LLM_HEALTH_TIMEOUT_SEC, LLM_HEALTH_DOWN_AFTER,
+)
+from orchestrator.admission_scheduler import AdmissionScheduler, AdmissionRejected
+from api.deps.auth_deps import require_api_key
 
 # Create FastAPI app instance (must be at module level for ASGI)
 app = FastAPI(title="ChetnaOS",
@@ -44,6 +53,13 @@ app.add_middleware(
 # Lazy-load heavy components to avoid reload issues
 # These are initialized in startup event, not at module level
 brain_router = None
+provider_monitor = None
+
+# Priority admission between /process and the brain router
+admission_scheduler = AdmissionScheduler(max_workers=ADMISSION_MAX_WORKERS,
+                                         aging_sec=ADMISSION_AGING_SEC,
+                                         intent_limits=ADMISSION_INTENT_LIMITS,
+                                         max_queue=ADMISSION_MAX_QUEUE)
 
 
 def format_response(raw_result: Any, context: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -153,6 +169,12 @@ def format_response(raw_result: Any, context: Dict[str, Any] = None) -> Dict[str
 class ProcessRequest(BaseModel):
     input: str
     context: Dict[str, Any] | None = None
+    stream: bool = False
+
+
+class BatchProcessRequest(BaseModel):
+    items: List[ProcessRequest]
+    max_concurrency: int | None = None
 
 
 class ProcessResponse(BaseModel):
@@ -165,9 +187,75 @@ class ProcessResponse(BaseModel):
 @app.get("/health")
 def health():
     """
-    Runtime health & readiness probe
+    Runtime health & readiness probe, with per-LLM-provider availability
+    from the background monitor.
+    """
+    status = health_check()
+    if provider_monitor is not None:
+        status["llm_providers"] = provider_monitor.snapshot()
+    return status
+
+
+def _get_brain_router():
+    """
+    Return the shared brain router, lazy-loading it if startup did not.
+    Returns None when initialization fails.
+    """
+    global brain_router
+    if brain_router is None:
+        try:
+            from orchestrator.brain_router_advanced import BrainRouterAdvanced
+            brain_router = BrainRouterAdvanced()
+        except Exception as e:
+            logger.error(f"Failed to initialize brain router: {e}")
+            return None
+    return brain_router
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.get("/metrics")
+def metrics():
+    """
+    In-process counters/timings, LLM layer stats and response cache
+    stats (if enabled).
     """
-    return health_check()
+    from monitoring.metrics import metrics_snapshot
+    from integrations.llm import LLMRegistry
+
+    snapshot = metrics_snapshot()
+    snapshot["admission"] = admission_scheduler.stats()
+    snapshot["llm"] = LLMRegistry.stats()
+    if brain_router is not None:
+        snapshot["reflection"] = brain_router.reflection_sink.stats()
+        if brain_router.response_cache is not None:
+            snapshot["response_cache"] = brain_router.response_cache.stats()
+    return snapshot
+
+
+@app.get("/metrics/stages")
+def stage_metrics():
+    """
+    Per-stage latency histograms, keyed "stage" or "stage:workflow".
+    """
+    from monitoring.tracing import tracer
+
+    return {"enabled": tracer.enabled, "stages": tracer.stage_stats()}
+
+
+@app.get("/traces/{trace_id}")
+def get_trace(trace_id: str):
+    """
+    Stage spans recorded for one request.
+    """
+    from monitoring.tracing import tracer
+
+    spans = tracer.get_trace(trace_id)
+    if spans is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return {"trace_id": trace_id, "spans": spans}
 
 
 @app.post("/process")
@@ -175,39 +263,56 @@ async def process(request: ProcessRequest):
     """
     Main cognitive execution endpoint.
     Returns normalized response with clear text reply.
+
+    With `"stream": true` the reply is sent as Server-Sent Events:
+    `chunk` events carry text as the LLM produces it, and a final
+    `result` event carries the usual format_response envelope.
     """
     try:
         context = request.context or {}
         context["trace_id"] = str(uuid.uuid4())
         
         if not request.input or not request.input.strip():
-            return format_response(
+            error = format_response(
                 {"status": "error", "reason": "Input text is required"},
                 context
             )
+            return _sse_response([_sse_event("result", error)]) if request.stream else error
 
-        # Lazy-load brain router if not initialized
-        global brain_router
-        if brain_router is None:
-            try:
-                from orchestrator.brain_router_advanced import BrainRouterAdvanced
-                brain_router = BrainRouterAdvanced()
-            except Exception as e:
-                logger.error(f"Failed to initialize brain router: {e}")
-                return format_response(
-                    {"status": "error", "reason": "System initialization error. Please try again."},
-                    context
-                )
-
-        # Route through brain router
-        result = brain_router.route(
-            user_input=request.input,
-            context=context
+        router = _get_brain_router()
+        if router is None:
+            error = format_response(
+                {"status": "error", "reason": "System initialization error. Please try again."},
+                context
+            )
+            return _sse_response([_sse_event("result", error)]) if request.stream else error
+
+        # Admission: intent priority decides who runs next under load
+        intent = router.intent_detector.detect(request.input,
+                                               client_id=context.get("client_id"))
+        priority = router.priority_engine.score(intent, context)
+
+        if request.stream:
+            return _sse_response(_stream_process(router, request.input, context,
+                                                 intent, priority))
+
+        # Route through brain router (async: LLM I/O never blocks the loop)
+        result = await admission_scheduler.run(
+            intent, priority,
+            lambda: router.aroute(user_input=request.input, context=context,
+                                  intent=intent, priority=priority)
         )
 
         # Format response using unified formatter
         return format_response(result, context)
 
+    except AdmissionRejected:
+        logger.warning("Admission queue full, request rejected")
+        return format_response(
+            {"status": "error", "reason": "Server busy. Please retry shortly."},
+            context
+        )
+
     except Exception as e:
         logger.exception("Fatal processing error")
         error_context = context if 'context' in locals() else {}
@@ -217,6 +322,95 @@ async def process(request: ProcessRequest):
         )
 
 
+def _sse_response(events) -> StreamingResponse:
+    return StreamingResponse(events,
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache",
+                                      "X-Accel-Buffering": "no"})
+
+
+async def _stream_process(router, user_input: str, context: Dict[str, Any],
+                          intent: str, priority: int):
+    """
+    SSE body for /process: text chunks, then the final envelope.
+    The admission slot is held until the stream finishes.
+    """
+    try:
+        async with admission_scheduler.slot(intent, priority):
+            async for item in router.astream_route(user_input=user_input,
+                                                   context=context,
+                                                   intent=intent,
+                                                   priority=priority):
+                if item["event"] == "chunk":
+                    yield _sse_event("chunk", {"text": item["text"]})
+                else:
+                    yield _sse_event("result",
+                                     format_response(item["result"], context))
+    except AdmissionRejected:
+        yield _sse_event("result", format_response(
+            {"status": "error", "reason": "Server busy. Please retry shortly."},
+            context
+        ))
+    except Exception as e:
+        logger.exception("Fatal streaming error")
+        yield _sse_event("result", format_response(
+            {"status": "error", "reason": f"Error processing request: {str(e)}"},
+            context
+        ))
+
+
+@app.post("/process/batch")
+async def process_batch(request: BatchProcessRequest):
+    """
+    Batch cognitive execution endpoint.
+
+    Streams one NDJSON line per input, in input order, as soon as that
+    item (and every item before it) is done:
+        {"index": int, ...format_response envelope...}
+
+    Every item goes through the admission scheduler like a single
+    /process request; items that find the queue full get a "Server busy"
+    line instead of failing the whole batch.
+    """
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {BATCH_MAX_ITEMS} items)")
+
+    router = _get_brain_router()
+    if router is None:
+        raise HTTPException(
+            status_code=503,
+            detail="System initialization error. Please try again.")
+
+    max_concurrency = min(request.max_concurrency or BATCH_MAX_CONCURRENCY,
+                          BATCH_MAX_CONCURRENCY)
+
+    # Empty inputs are answered inline; the rest go through the router
+    valid = [bool(item.input and item.input.strip()) for item in request.items]
+    routable = [(item.input, item.context or {})
+                for item, ok in zip(request.items, valid) if ok]
+
+    async def ndjson_lines():
+        results = router.aroute_many(routable,
+                                     max_concurrency=max_concurrency,
+                                     admission=admission_scheduler)
+        try:
+            for index, ok in enumerate(valid):
+                if ok:
+                    result = await results.__anext__()
+                else:
+                    result = {"status": "error",
+                              "reason": "Input text is required"}
+                line = {"index": index, **format_response(result)}
+                yield json.dumps(line, default=str) + "\n"
+        finally:
+            await results.aclose()
+
+    return StreamingResponse(ndjson_lines(),
+                             media_type="application/x-ndjson")
+
+
 @app.get("/")
 async def serve_frontend():
     """
@@ -234,7 +428,7 @@ def on_startup():
     Initialize heavy components on startup (reload-safe).
     This avoids module-level side effects that can break uvicorn reload.
     """
-    global brain_router
+    global brain_router, provider_monitor
     
     logger.info("ChetnaOS runtime starting...")
     
@@ -254,11 +448,20 @@ def on_startup():
             logger.info("LLM provider registered via fallback")
         except Exception as fallback_error:
             logger.warning(f"Fallback LLM registration also failed: {fallback_error}")
+
+    # Probe providers in the background (also pre-warms pooled connections)
+    if LLM_HEALTH_INTERVAL_SEC > 0:
+        from monitoring.provider_monitor import ProviderHealthMonitor
+        provider_monitor = ProviderHealthMonitor(interval=LLM_HEALTH_INTERVAL_SEC,
+                                                 timeout=LLM_HEALTH_TIMEOUT_SEC,
+                                                 down_after=LLM_HEALTH_DOWN_AFTER)
+        provider_monitor.start()
     
     # Initialize brain router (heavy component, lazy-loaded)
     try:
         from orchestrator.brain_router_advanced import BrainRouterAdvanced
         brain_router = BrainRouterAdvanced()
+        brain_router.reflection_sink.start()
         logger.info("BrainRouterAdvanced initialized")
     except Exception as e:
         logger.error(f"Failed to initialize BrainRouterAdvanced: {e}")
@@ -269,9 +472,25 @@ def on_startup():
 
 
 @app.on_event("shutdown")
-def on_shutdown():
+async def on_shutdown():
     logger.info("ChetnaOS runtime shutting down")
 
+    # Flush queued reflection records before the worker exits
+    if brain_router is not None:
+        brain_router.reflection_sink.stop()
+
+    if provider_monitor is not None:
+        await provider_monitor.stop()
+
+    # Close pooled LLM connections, return unused LLM budget leases and
+    # flush recorded LLM cassettes
+    from integrations.llm.http_pool import HTTPPool
+    from integrations.llm.ledger import TokenLedger
+    from integrations.llm.replay import ReplayProvider
+    await HTTPPool.aclose_all()
+    TokenLedger.close_all()
+    ReplayProvider.close_all()
+
 
 @app.post("/founder/approve/{trace_id}")
 def founder_approve(trace_id: str):
@@ -301,7 +520,8 @@ def founder_approve(trace_id: str):
         payload = record["payload"]
 
         # 🔁 Resume execution
-        workflow = brain_router._select_workflow(payload["intent"])
+        workflow = brain_router._select_workflow(
+            payload["intent"], payload["context"].get("client_id"))
         output = workflow.execute(user_input=payload["user_input"],
                                   intent=payload["intent"],
                                   context=payload["context"])
@@ -319,6 +539,22 @@ def founder_approve(trace_id: str):
         }
 
 
+@app.post("/workflows/reload", dependencies=[Depends(require_api_key("admin"))])
+def reload_workflows(client_id: str | None = None):
+    """
+    Hot-replace tenant workflows (all tenants when client_id is omitted).
+    Requires an API key with the "admin" (or "*") scope.
+    """
+    router = _get_brain_router()
+    if router is None:
+        raise HTTPException(status_code=503, detail="Brain router not initialized")
+
+    router.workflow_registry.reload(client_id)
+    router.intent_detector.reload_client(client_id)
+    router.dharma_net.policy_engine.reload_client(client_id)
+    return {"status": "reloaded", "client_id": client_id}
+
+
 # ASGI entry point guard for direct execution
 # When running: python backend/app.py, backend/ is in sys.path, so use "app:app"
 if __name__ == "__main__":
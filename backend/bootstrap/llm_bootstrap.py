@@ -1,13 +1,167 @@
-import os
+"""
+LLM Bootstrap
+-------------
+Builds the active LLM provider once at startup.
+
+Every provider named in CHETNA_LLM_PROVIDERS (default: ACTIVE_LLM_PROVIDER,
+i.e. "groq") is instantiated and added to an LLMRouter, which is then
+registered as the active provider. Providers that cannot start (missing
+API key, not implemented) are skipped with a warning.
+
+Optional layers wrap the router (outermost first):
+    SemanticCache → SingleFlight → MicroBatcher → LLMRouter
+
+With CHETNA_LLM_REPLAY=record the router is wrapped by a recording
+ReplayProvider; with CHETNA_LLM_REPLAY=replay a cassette replaces the
+router entirely (no network).
+"""
+
+import importlib
+import logging
+
+from config.settings import (
+    LLM_PROVIDERS,
+    LLM_ROUTING_POLICY,
+    LLM_SLO_MS,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_MIN_DELAY_MS,
+    LLM_BREAKER_FAILURES,
+    LLM_BREAKER_RESET_SEC,
+    LLM_SINGLE_FLIGHT_ENABLED,
+    LLM_MICRO_BATCH_ENABLED,
+    LLM_MICRO_BATCH_WINDOW_MS,
+    LLM_MICRO_BATCH_MAX_SIZE,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_EMBEDDER,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL_SEC,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_MAX_NAMESPACES,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CACHE_SIZE,
+    EMBEDDING_CACHE_PATH,
+    LLM_REPLAY_MODE,
+    LLM_REPLAY_CASSETTE,
+    LLM_REPLAY_LATENCY,
+    LLM_REPLAY_FIXED_MS,
+    LLM_REPLAY_MEDIAN_MS,
+    LLM_REPLAY_SPIKE_PROB,
+    LLM_REPLAY_SPIKE_FACTOR,
+)
 from integrations.llm import LLMRegistry
-from integrations.llm.groq_provider import GroqProvider
+from integrations.llm.router import LLMRouter
+
+logger = logging.getLogger("LLMBootstrap")
+
+PROVIDER_CLASSES = {
+    "groq": "integrations.llm.groq_provider:GroqProvider",
+    "openai": "integrations.llm.openai_provider:OpenAIProvider",
+    "local": "integrations.llm.local_llm:LocalLLMProvider",
+}
+
+
+def _load(spec: str):
+    module_name, attr = spec.split(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def create_provider(name: str):
+    if name not in PROVIDER_CLASSES:
+        raise RuntimeError(f"Unsupported LLM provider: {name}")
+    return _load(PROVIDER_CLASSES[name])()
+
+
+def build_router() -> LLMRouter:
+    router = LLMRouter(policy=LLM_ROUTING_POLICY,
+                       slo_ms=LLM_SLO_MS,
+                       hedge=LLM_HEDGE_ENABLED,
+                       hedge_min_delay_ms=LLM_HEDGE_MIN_DELAY_MS,
+                       failure_threshold=LLM_BREAKER_FAILURES,
+                       reset_timeout=LLM_BREAKER_RESET_SEC)
+
+    for name in LLM_PROVIDERS:
+        try:
+            router.add(name, create_provider(name))
+        except (ValueError, RuntimeError, ImportError) as e:
+            logger.warning(f"LLM provider {name} skipped: {e}")
+
+    if not router.providers:
+        raise RuntimeError(f"No LLM provider could be started ({', '.join(LLM_PROVIDERS)})")
+    return router
+
+
+def build_base():
+    """
+    The provider the optional layers wrap: router, recorder or replayer.
+    """
+    if LLM_REPLAY_MODE not in ("", "record", "replay"):
+        raise RuntimeError(f"Unsupported LLM replay mode: {LLM_REPLAY_MODE}")
+
+    if LLM_REPLAY_MODE == "replay":
+        from integrations.llm.replay import ReplayProvider
+        return ReplayProvider(LLM_REPLAY_CASSETTE, mode="replay",
+                              latency=LLM_REPLAY_LATENCY,
+                              fixed_ms=LLM_REPLAY_FIXED_MS,
+                              median_ms=LLM_REPLAY_MEDIAN_MS,
+                              spike_prob=LLM_REPLAY_SPIKE_PROB,
+                              spike_factor=LLM_REPLAY_SPIKE_FACTOR)
+
+    router = build_router()
+    if LLM_REPLAY_MODE == "record":
+        from integrations.llm.replay import ReplayProvider
+        return ReplayProvider(LLM_REPLAY_CASSETTE, mode="record", inner=router)
+    return router
+
+
+def build_embedder(spec: str):
+    """
+    Load a "module:callable" embedder (classes are instantiated with
+    their defaults), behind the embedding cache.
+    """
+    embedder = _load(spec)
+    if isinstance(embedder, type):
+        embedder = embedder()
+    if EMBEDDING_CACHE_SIZE > 0:
+        from memory.embedding_cache import EmbeddingCache
+        embedder = EmbeddingCache(embedder,
+                                  max_entries=EMBEDDING_CACHE_SIZE,
+                                  batch_size=EMBEDDING_BATCH_SIZE,
+                                  disk_path=EMBEDDING_CACHE_PATH or None)
+    return embedder
+
+
+def wrap_layers(provider):
+    if LLM_MICRO_BATCH_ENABLED:
+        from integrations.llm.micro_batcher import MicroBatcher
+        provider = MicroBatcher(provider,
+                                window_ms=LLM_MICRO_BATCH_WINDOW_MS,
+                                max_batch=LLM_MICRO_BATCH_MAX_SIZE)
+
+    if LLM_SINGLE_FLIGHT_ENABLED:
+        from integrations.llm.single_flight import SingleFlight
+        provider = SingleFlight(provider)
+
+    if SEMANTIC_CACHE_ENABLED:
+        if not SEMANTIC_CACHE_EMBEDDER:
+            logger.warning("Semantic cache enabled but no embedder configured "
+                           "(CHETNA_SEMANTIC_CACHE_EMBEDDER); skipped")
+        else:
+            from integrations.llm.semantic_cache import SemanticCache
+            provider = SemanticCache(provider,
+                                     embedder=build_embedder(SEMANTIC_CACHE_EMBEDDER),
+                                     threshold=SEMANTIC_CACHE_THRESHOLD,
+                                     ttl=SEMANTIC_CACHE_TTL_SEC,
+                                     max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+                                     max_namespaces=SEMANTIC_CACHE_MAX_NAMESPACES)
+    return provider
 
 
-def bootstrap_llm():
-    provider = os.getenv("ACTIVE_LLM_PROVIDER", "groq")
+def init_llm():
+    provider = wrap_layers(build_base())
+    LLMRegistry.register(provider)
+    logger.info(f"LLM provider active (layers={list(LLMRegistry.stats())})")
+    return provider
 
-    if provider == "groq":
-        LLMRegistry.register(GroqProvider())
 
-    else:
-        raise RuntimeError(f"Unsupported LLM provider: {provider}")
\ No newline at end of file
+# Backwards-compatible name
+bootstrap_llm = init_llm
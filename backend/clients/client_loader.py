@@ -1,9 +1,17 @@
 # backend/clients/client_loader.py
 
 import json
+import logging
 import os
+import re
 from typing import Dict
 
+from config.settings import CLIENT_PROJECTS_DIR
+
+logger = logging.getLogger("ClientLoader")
+
+_CLIENT_ID_RE = re.compile(r"^[\w-]+$")
+
 
 class ClientLoader:
     """
@@ -12,6 +20,10 @@ class ClientLoader:
 
     BASE_PATH = "client_projects"
 
+    @staticmethod
+    def is_valid_client_id(client_id: str) -> bool:
+        return bool(client_id) and bool(_CLIENT_ID_RE.match(client_id))
+
     @classmethod
     def load_client_config(cls, client_id: str) -> Dict:
         config_path = os.path.join(
@@ -27,3 +39,25 @@ class ClientLoader:
 
         with open(config_path, "r", encoding="utf-8") as f:
             return json.load(f)
+
+    @classmethod
+    def load_optional_config(cls, client_id: str) -> Dict:
+        """
+        Best-effort config read for hot paths (intent keywords, dharma
+        rules, ...). Missing, unreadable or unsafe client ids give {}.
+        """
+        if not cls.is_valid_client_id(client_id):
+            return {}
+
+        config_path = CLIENT_PROJECTS_DIR / client_id / "config.json"
+        if not config_path.is_file():
+            return {}
+
+        try:
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring config for {client_id}: {e}")
+            return {}
+
+        return config if isinstance(config, dict) else {}
@@ -35,6 +35,7 @@ API_KEY_HEADER = "X-CHETNA-API-KEY"
 
 MULTI_TENANT_ENABLED = True
 CLIENT_ISOLATION_ENABLED = True
+CLIENT_CACHE_MAX_TENANTS = int(os.getenv("CHETNA_CLIENT_CACHE_MAX_TENANTS", 512))  # per-tenant LRU caches
 
 
 # -------------------------------------------------
@@ -61,6 +62,146 @@ MAX_MEMORY_MB_PER_CLIENT = 256
 ENERGY_BUDGET_PER_DAY = 1000  # abstract units
 
 
+# -------------------------------------------------
+# Batch Processing (/process/batch)
+# -------------------------------------------------
+
+BATCH_MAX_ITEMS = int(os.getenv("CHETNA_BATCH_MAX_ITEMS", 5000))
+BATCH_MAX_CONCURRENCY = int(os.getenv("CHETNA_BATCH_MAX_CONCURRENCY", 16))
+
+
+# -------------------------------------------------
+# Admission Scheduler (/process)
+# -------------------------------------------------
+
+ADMISSION_MAX_WORKERS = int(os.getenv("CHETNA_ADMISSION_MAX_WORKERS", 32))
+ADMISSION_MAX_QUEUE = int(os.getenv("CHETNA_ADMISSION_MAX_QUEUE", 1000))
+ADMISSION_AGING_SEC = float(os.getenv("CHETNA_ADMISSION_AGING_SEC", 2.0))
+ADMISSION_INTENT_LIMITS = {
+    "custom": int(os.getenv("CHETNA_ADMISSION_LIMIT_CUSTOM", 16)),
+    "chat": int(os.getenv("CHETNA_ADMISSION_LIMIT_CHAT", 24)),
+}
+
+
+# -------------------------------------------------
+# Response Cache (BrainRouterAdvanced)
+# -------------------------------------------------
+
+RESPONSE_CACHE_ENABLED = os.getenv("CHETNA_RESPONSE_CACHE", "0") == "1"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("CHETNA_RESPONSE_CACHE_SIZE", 2048))
+
+
+# -------------------------------------------------
+# Stage Tracing (per-stage latency spans)
+# -------------------------------------------------
+
+TRACING_ENABLED = os.getenv("CHETNA_TRACING", "1") == "1"
+TRACING_MAX_TRACES = int(os.getenv("CHETNA_TRACING_MAX_TRACES", 1000))
+
+
+# -------------------------------------------------
+# Reflection Sink (off-hot-path reflection recording)
+# -------------------------------------------------
+
+REFLECTION_QUEUE_SIZE = int(os.getenv("CHETNA_REFLECTION_QUEUE_SIZE", 10000))
+REFLECTION_BATCH_SIZE = int(os.getenv("CHETNA_REFLECTION_BATCH_SIZE", 256))
+REFLECTION_FLUSH_INTERVAL_SEC = float(os.getenv("CHETNA_REFLECTION_FLUSH_SEC", 1.0))
+REFLECTION_FULL_POLICY = os.getenv("CHETNA_REFLECTION_FULL_POLICY", "drop")  # drop | block
+REFLECTION_LOG_PATH = str(BACKEND_DIR / "logs" / "reflection_records.jsonl")
+
+
+# -------------------------------------------------
+# LLM Providers / Routing
+# -------------------------------------------------
+
+LLM_PROVIDERS = [p.strip() for p in os.getenv(
+    "CHETNA_LLM_PROVIDERS", os.getenv("ACTIVE_LLM_PROVIDER", "groq")).split(",") if p.strip()]
+LLM_ROUTING_POLICY = os.getenv("CHETNA_LLM_POLICY", "cheapest_under_slo")  # | fastest | ordered
+LLM_SLO_MS = float(os.getenv("CHETNA_LLM_SLO_MS", 2000))
+LLM_HEDGE_ENABLED = os.getenv("CHETNA_LLM_HEDGE", "0") == "1"
+LLM_HEDGE_MIN_DELAY_MS = float(os.getenv("CHETNA_LLM_HEDGE_MIN_DELAY_MS", 50))
+LLM_BREAKER_FAILURES = int(os.getenv("CHETNA_LLM_BREAKER_FAILURES", 5))
+LLM_BREAKER_RESET_SEC = float(os.getenv("CHETNA_LLM_BREAKER_RESET_SEC", 30))
+LLM_SINGLE_FLIGHT_ENABLED = os.getenv("CHETNA_LLM_SINGLE_FLIGHT", "1") == "1"
+LLM_HEALTH_INTERVAL_SEC = float(os.getenv("CHETNA_LLM_HEALTH_INTERVAL_SEC", 15))  # 0 = off
+LLM_HEALTH_TIMEOUT_SEC = float(os.getenv("CHETNA_LLM_HEALTH_TIMEOUT_SEC", 5))
+LLM_HEALTH_DOWN_AFTER = int(os.getenv("CHETNA_LLM_HEALTH_DOWN_AFTER", 2))
+LLM_MICRO_BATCH_ENABLED = os.getenv("CHETNA_LLM_MICRO_BATCH", "0") == "1"
+LLM_MICRO_BATCH_WINDOW_MS = float(os.getenv("CHETNA_LLM_MICRO_BATCH_WINDOW_MS", 5))
+LLM_MICRO_BATCH_MAX_SIZE = int(os.getenv("CHETNA_LLM_MICRO_BATCH_MAX_SIZE", 16))
+
+
+# -------------------------------------------------
+# Local LLM (OpenAI-compatible server, e.g. llama.cpp / vLLM)
+# -------------------------------------------------
+
+LOCAL_LLM_BASE_URL = os.getenv("LOCAL_LLM_BASE_URL", "http://127.0.0.1:8080/v1")
+LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "local")
+LOCAL_LLM_MAX_CONCURRENCY = int(os.getenv("LOCAL_LLM_MAX_CONCURRENCY", 4))
+LOCAL_LLM_TIMEOUT_SEC = float(os.getenv("LOCAL_LLM_TIMEOUT_SEC", 120))
+LOCAL_LLM_BATCH_COMPLETIONS = os.getenv("LOCAL_LLM_BATCH_COMPLETIONS", "0") == "1"
+
+
+# -------------------------------------------------
+# LLM Record / Replay (load tests without network)
+# -------------------------------------------------
+
+LLM_REPLAY_MODE = os.getenv("CHETNA_LLM_REPLAY", "")  # "" | record | replay
+LLM_REPLAY_CASSETTE = os.getenv("CHETNA_LLM_CASSETTE",
+                                str(BACKEND_DIR / "logs" / "llm_cassette.jsonl"))
+LLM_REPLAY_LATENCY = os.getenv("CHETNA_LLM_REPLAY_LATENCY", "recorded")  # | fixed | distribution | none
+LLM_REPLAY_FIXED_MS = float(os.getenv("CHETNA_LLM_REPLAY_FIXED_MS", 100))
+LLM_REPLAY_MEDIAN_MS = float(os.getenv("CHETNA_LLM_REPLAY_MEDIAN_MS", 300))
+LLM_REPLAY_SPIKE_PROB = float(os.getenv("CHETNA_LLM_REPLAY_SPIKE_PROB", 0.01))
+LLM_REPLAY_SPIKE_FACTOR = float(os.getenv("CHETNA_LLM_REPLAY_SPIKE_FACTOR", 10))
+
+
+# -------------------------------------------------
+# LLM Budget (CostGuard ledger, shared by all workers)
+# -------------------------------------------------
+
+LLM_DAILY_TOKEN_LIMIT = int(os.getenv("CHETNA_LLM_DAILY_TOKENS", 250_000))
+LLM_DAILY_COST_LIMIT = float(os.getenv("CHETNA_LLM_DAILY_COST_USD", 5.00))
+LLM_LEDGER_PATH = os.getenv("CHETNA_LLM_LEDGER_PATH",
+                            str(BACKEND_DIR / "logs" / "llm_ledger.sqlite3"))
+LLM_LEDGER_LEASE_TOKENS = int(os.getenv("CHETNA_LLM_LEDGER_LEASE_TOKENS", 4000))
+
+
+# -------------------------------------------------
+# Prompt Budgets (tokens per workflow prompt)
+# -------------------------------------------------
+
+PROMPT_TOKEN_BUDGETS = {
+    "sales": int(os.getenv("CHETNA_PROMPT_BUDGET_SALES", 1024)),
+    "lead": int(os.getenv("CHETNA_PROMPT_BUDGET_LEAD", 768)),
+}
+
+# Compare against the legacy prompt on every Nth build only (0 = never)
+PROMPT_LEGACY_SAMPLE_EVERY = int(os.getenv("CHETNA_PROMPT_LEGACY_SAMPLE_EVERY", 16))
+
+
+# -------------------------------------------------
+# Semantic LLM Cache
+# -------------------------------------------------
+
+SEMANTIC_CACHE_ENABLED = os.getenv("CHETNA_SEMANTIC_CACHE", "0") == "1"
+SEMANTIC_CACHE_EMBEDDER = os.getenv("CHETNA_SEMANTIC_CACHE_EMBEDDER",
+                                    "memory.hashing_embedder:HashingEmbedder")  # "module:callable"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("CHETNA_SEMANTIC_CACHE_THRESHOLD", 0.92))
+SEMANTIC_CACHE_TTL_SEC = float(os.getenv("CHETNA_SEMANTIC_CACHE_TTL_SEC", 600))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("CHETNA_SEMANTIC_CACHE_SIZE", 1000))  # per namespace
+SEMANTIC_CACHE_MAX_NAMESPACES = int(os.getenv("CHETNA_SEMANTIC_CACHE_NAMESPACES", 256))
+
+
+# -------------------------------------------------
+# Embeddings (batching + content-hash cache)
+# -------------------------------------------------
+
+EMBEDDING_BATCH_SIZE = int(os.getenv("CHETNA_EMBEDDING_BATCH_SIZE", 64))
+EMBEDDING_CACHE_SIZE = int(os.getenv("CHETNA_EMBEDDING_CACHE_SIZE", 10_000))  # 0 = off
+EMBEDDING_CACHE_PATH = os.getenv("CHETNA_EMBEDDING_CACHE_PATH", "")  # "" = memory only
+
+
 # -------------------------------------------------
 # Logging
 # -------------------------------------------------
@@ -11,8 +11,16 @@ Goals:
 - Future support for multi-model reasoning
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
+
+
+class LLMProviderError(Exception):
+    """
+    Raised when an LLM backend fails (transport error, bad status, bad
+    payload). Provider-agnostic so callers never depend on HTTP libraries.
+    """
 
 
 class BaseLLMProvider(ABC):
@@ -44,16 +52,87 @@ class BaseLLMProvider(ABC):
         """
         raise NotImplementedError
 
+    async def agenerate(
+        self,
+        prompt: str,
+        context: Optional[List[Dict[str, str]]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async variant of `generate` (same return shape).
+
+        Providers with a native async client should override this.
+        The default runs the blocking `generate` in a worker thread so
+        the event loop is never held by an LLM round-trip.
+        """
+        return await asyncio.to_thread(self.generate, prompt, context,
+                                       **kwargs)
+
+    async def astream(
+        self,
+        prompt: str,
+        context: Optional[List[Dict[str, str]]] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream the response as text chunks, in order.
+
+        Joining every chunk yields the same text `generate` would return.
+        Providers with server-side streaming should override this; the
+        default emits the full `agenerate` text as a single chunk.
+        """
+        response = await self.agenerate(prompt, context, **kwargs)
+        text = response.get("text", "")
+        if text:
+            yield text
+
+    async def agenerate_batch(
+        self,
+        prompts: List[str],
+        **kwargs
+    ) -> List[Any]:
+        """
+        Generate one response per prompt (no conversation context).
+
+        Returns a list aligned with `prompts`; each item is a response
+        dict or the Exception that prompt failed with. Providers whose
+        backend accepts batched prompts should override this; the
+        default issues concurrent `agenerate` calls.
+        """
+        return await asyncio.gather(
+            *(self.agenerate(prompt, None, **kwargs) for prompt in prompts),
+            return_exceptions=True)
+
     @abstractmethod
     def health_check(self) -> bool:
         """Check if LLM provider is reachable"""
         raise NotImplementedError
 
+    async def ahealth_check(self) -> bool:
+        """Async `health_check` (default runs it in a worker thread)"""
+        return await asyncio.to_thread(self.health_check)
+
+
+# Routing / caching hints carried in **kwargs (never sent to a vendor)
+HINT_KWARGS = ("tenant", "semantic_key")
+
+
+def request_hints(user_input: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Keyword arguments workflows pass to generate/agenerate/astream so
+    caching layers can scope a call to its tenant and key it on the
+    user's own text rather than the whole templated prompt.
+    Providers ignore them.
+    """
+    return {"tenant": (context or {}).get("client_id"),
+            "semantic_key": user_input}
+
 
 class LLMRegistry:
     """
     Registry to manage active LLM provider.
-    Only one primary LLM is active at a time.
+    Only one primary LLM is active at a time; for several vendors,
+    register an LLMRouter (integrations.llm.router) as the active one.
     """
 
     _active_provider: Optional[BaseLLMProvider] = None
@@ -68,6 +147,21 @@ class LLMRegistry:
             raise RuntimeError("No LLM provider registered")
         return cls._active_provider
 
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """
+        Stats of every layer in the active provider chain, outermost
+        first (layers wrap the next one as `inner`).
+        """
+        layers = {}
+        provider = cls._active_provider
+        while provider is not None:
+            if hasattr(provider, "stats"):
+                name = getattr(provider, "layer_name", type(provider).__name__)
+                layers[name] = provider.stats()
+            provider = getattr(provider, "inner", None)
+        return layers
+
 
 class LLMResponseNormalizer:
     """
@@ -86,7 +180,9 @@ class LLMResponseNormalizer:
 
 
 __all__ = [
+    "LLMProviderError",
     "BaseLLMProvider",
     "LLMRegistry",
     "LLMResponseNormalizer",
+    "request_hints",
 ]
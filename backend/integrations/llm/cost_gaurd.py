@@ -3,10 +3,23 @@ Cost Guard / Energy Governor
 ----------------------------
 Prevents uncontrolled LLM usage.
 Acts as an economic + thermodynamic safety layer.
+
+Daily caps are enforced by a TokenLedger shared by every worker process
+(SQLite WAL file), so N workers share one budget instead of N. Each call
+reserves its estimated tokens up front, then commits the real usage or
+refunds the reservation on failure.
 """
 
-from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
+
+from config.settings import (
+    LLM_DAILY_TOKEN_LIMIT,
+    LLM_DAILY_COST_LIMIT,
+    LLM_LEDGER_PATH,
+    LLM_LEDGER_LEASE_TOKENS,
+)
+from integrations.llm.ledger import TokenLedger, Reservation, BudgetExceeded
+from integrations.llm.tokenizer import count_tokens
 
 
 class CostGuard:
@@ -14,51 +27,61 @@ class CostGuard:
     Controls token usage, cost burn, and autonomy limits.
     """
 
-    GLOBAL_DAILY_TOKEN_LIMIT = 250_000
-    GLOBAL_DAILY_COST_LIMIT = 5.00  # USD safety cap
+    GLOBAL_DAILY_TOKEN_LIMIT = LLM_DAILY_TOKEN_LIMIT
+    GLOBAL_DAILY_COST_LIMIT = LLM_DAILY_COST_LIMIT  # USD safety cap
 
-    _daily_tokens_used: int = 0
-    _daily_cost_used: float = 0.0
-    _last_reset: datetime = datetime.utcnow()
+    # Completion allowance reserved when the call sets no max_tokens
+    DEFAULT_COMPLETION_TOKENS = 256
 
-    def __init__(self, provider: str, cost_per_1k_tokens: float):
+    def __init__(self, provider: str, cost_per_1k_tokens: float,
+                 ledger: Optional[TokenLedger] = None):
         self.provider = provider
         self.cost_per_1k_tokens = cost_per_1k_tokens
-
-    def _reset_if_needed(self):
-        now = datetime.utcnow()
-        if now.date() != self._last_reset.date():
-            self._daily_tokens_used = 0
-            self._daily_cost_used = 0.0
-            self._last_reset = now
+        self.ledger = ledger or TokenLedger.shared(
+            LLM_LEDGER_PATH,
+            daily_token_limit=self.GLOBAL_DAILY_TOKEN_LIMIT,
+            daily_cost_limit=self.GLOBAL_DAILY_COST_LIMIT,
+            lease_tokens=LLM_LEDGER_LEASE_TOKENS)
 
     def estimate_cost(self, tokens: int) -> float:
         return (tokens / 1000) * self.cost_per_1k_tokens
 
-    def assert_allowed(self, prompt: str):
-        self._reset_if_needed()
+    def reserve(self, prompt: str, max_tokens: Optional[int] = None) -> Reservation:
+        """
+        Reserve prompt tokens plus the completion allowance.
+        Raises BudgetExceeded (a RuntimeError) when over the daily cap.
+        """
+        tokens = count_tokens(prompt) + (max_tokens or self.DEFAULT_COMPLETION_TOKENS)
+        return self.ledger.reserve(self.provider, tokens, self.estimate_cost(tokens))
 
-        estimated_tokens = max(1, len(prompt) // 4)
-        estimated_cost = self.estimate_cost(estimated_tokens)
+    async def areserve(self, prompt: str, max_tokens: Optional[int] = None) -> Reservation:
+        """
+        `reserve` for async callers: ledger I/O stays off the event loop.
+        """
+        tokens = count_tokens(prompt) + (max_tokens or self.DEFAULT_COMPLETION_TOKENS)
+        return await self.ledger.areserve(self.provider, tokens, self.estimate_cost(tokens))
 
-        if self._daily_tokens_used + estimated_tokens > self.GLOBAL_DAILY_TOKEN_LIMIT:
-            raise RuntimeError("Daily token budget exceeded")
+    def commit(self, reservation: Reservation, tokens: int):
+        self.ledger.commit(reservation, tokens, self.estimate_cost(tokens))
 
-        if self._daily_cost_used + estimated_cost > self.GLOBAL_DAILY_COST_LIMIT:
-            raise RuntimeError("Daily LLM cost budget exceeded")
+    async def acommit(self, reservation: Reservation, tokens: int):
+        await self.ledger.acommit(reservation, tokens, self.estimate_cost(tokens))
 
-    def record_usage(self, tokens: int):
-        self._reset_if_needed()
+    def refund(self, reservation: Reservation):
+        self.ledger.refund(reservation)
 
+    def assert_allowed(self, prompt: str):
+        self.refund(self.reserve(prompt))
+
+    def record_usage(self, tokens: int):
         cost = self.estimate_cost(tokens)
-        self._daily_tokens_used += tokens
-        self._daily_cost_used += cost
+        self.ledger.commit(self.ledger.reserve(self.provider, tokens, cost),
+                           tokens, cost)
 
     def snapshot(self) -> Dict:
-        return {
-            "provider": self.provider,
-            "tokens_used_today": self._daily_tokens_used,
-            "cost_used_today": round(self._daily_cost_used, 4),
-            "token_limit": self.GLOBAL_DAILY_TOKEN_LIMIT,
-            "cost_limit": self.GLOBAL_DAILY_COST_LIMIT,
-        }
+        snapshot = self.ledger.snapshot(self.provider)
+        snapshot["provider"] = self.provider
+        return snapshot
+
+
+__all__ = ["CostGuard", "BudgetExceeded"]
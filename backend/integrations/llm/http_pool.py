@@ -0,0 +1,151 @@
+"""
+Shared HTTP Connection Pools
+----------------------------
+Process-wide keep-alive pools for HTTP-based LLM providers.
+
+- One pool per (base_url, pool settings); every provider instance that
+  talks to the same endpoint reuses the same connections
+- Async pools are bound to the event loop that created them: each loop
+  gets its own pool (a per-loop registry), and `aclose_all` closes every
+  one at shutdown, each on its own loop. Pools of loops that have already been closed can no longer be
+  awaited; they are dropped the next time a pool is created
+- HTTP/2 is used when requested and the `h2` package is installed
+"""
+
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+import importlib.util
+import logging
+import threading
+
+import httpx
+
+logger = logging.getLogger("HTTPPool")
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+DEFAULT_POOL_CONFIG = {
+    "pool_size": 32,           # max open connections per endpoint
+    "keepalive": 16,           # idle connections kept warm
+    "keepalive_expiry": 60.0,  # seconds an idle connection may live
+    "timeout": 60.0,           # read / write / pool timeout (seconds)
+    "connect_timeout": 5.0,
+    "http2": True,             # only honoured when h2 is installed
+}
+
+
+def pool_config(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Merge provider config over pool defaults (unknown keys ignored).
+    """
+    config = config or {}
+    return {key: config.get(key, default)
+            for key, default in DEFAULT_POOL_CONFIG.items()}
+
+
+def _client_kwargs(base_url: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "base_url": base_url,
+        "http2": bool(settings["http2"]) and HTTP2_AVAILABLE,
+        "limits": httpx.Limits(
+            max_connections=settings["pool_size"],
+            max_keepalive_connections=settings["keepalive"],
+            keepalive_expiry=settings["keepalive_expiry"],
+        ),
+        "timeout": httpx.Timeout(settings["timeout"],
+                                 connect=settings["connect_timeout"]),
+    }
+
+
+class HTTPPool:
+    """
+    Registry of shared httpx clients.
+    """
+
+    # (event loop, pool key) -> client
+    _async_clients: Dict[Tuple[asyncio.AbstractEventLoop, Tuple], httpx.AsyncClient] = {}
+    _sync_clients: Dict[Tuple, httpx.Client] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(base_url: str, settings: Dict[str, Any]) -> Tuple:
+        return (base_url,) + tuple(sorted(settings.items()))
+
+    @classmethod
+    def get_async(cls, base_url: str,
+                  config: Optional[Dict[str, Any]] = None) -> httpx.AsyncClient:
+        settings = pool_config(config)
+        key = (asyncio.get_running_loop(), cls._key(base_url, settings))
+
+        client = cls._async_clients.get(key)
+        if client is not None and not client.is_closed:
+            return client
+
+        with cls._lock:
+            client = cls._async_clients.get(key)
+            if client is None or client.is_closed:
+                cls._prune_closed_loops()
+                client = httpx.AsyncClient(**_client_kwargs(base_url, settings))
+                cls._async_clients[key] = client
+            return client
+
+    @classmethod
+    def get_sync(cls, base_url: str,
+                 config: Optional[Dict[str, Any]] = None) -> httpx.Client:
+        settings = pool_config(config)
+        key = cls._key(base_url, settings)
+
+        client = cls._sync_clients.get(key)
+        if client is not None and not client.is_closed:
+            return client
+
+        with cls._lock:
+            client = cls._sync_clients.get(key)
+            if client is None or client.is_closed:
+                client = httpx.Client(**_client_kwargs(base_url, settings))
+                cls._sync_clients[key] = client
+            return client
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "async_pools": len(cls._async_clients),
+            "event_loops": len({loop for loop, _ in cls._async_clients}),
+            "sync_pools": len(cls._sync_clients),
+            "http2_available": HTTP2_AVAILABLE,
+        }
+
+    @classmethod
+    async def aclose_all(cls, timeout: float = 5.0):
+        """
+        Close every pool (call from application shutdown).
+        """
+        with cls._lock:
+            async_entries = list(cls._async_clients.items())
+            sync_clients = list(cls._sync_clients.values())
+            cls._async_clients.clear()
+            cls._sync_clients.clear()
+
+        loop = asyncio.get_running_loop()
+        for (owner, _), client in async_entries:
+            try:
+                if owner is loop:
+                    await client.aclose()
+                elif owner.is_running():
+                    future = asyncio.run_coroutine_threadsafe(client.aclose(), owner)
+                    await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+                elif not owner.is_closed():
+                    # Stopped (but reusable) loop: run the close on it
+                    await asyncio.to_thread(owner.run_until_complete, client.aclose())
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP pool {client.base_url}: {e}")
+        for client in sync_clients:
+            client.close()
+
+    @classmethod
+    def _prune_closed_loops(cls):
+        """
+        Forget pools whose event loop is closed (caller holds _lock).
+        """
+        for key in [k for k in cls._async_clients if k[0].is_closed()]:
+            del cls._async_clients[key]
@@ -0,0 +1,372 @@
+"""
+Token / Cost Ledger
+-------------------
+Daily LLM budget shared by every worker process.
+
+- Storage: one SQLite database in WAL mode, so all uvicorn workers on a
+  host enforce the same daily token and cost caps
+- Hot path stays in memory: each process leases budget from the shared
+  file in blocks (`lease_tokens`) and serves reserve/commit/refund from
+  its local lease under a thread lock; the file is only touched when a
+  lease runs out, and to flush actual usage (at most every
+  `flush_interval` seconds)
+- SQLite I/O never runs under that lock, and `areserve` / `acommit`
+  (used on the event loop) run it in a worker thread
+- Enforcement is conservative: leased budget counts as spent until it
+  is returned (`close()`), so the caps hold even if a worker dies
+- A reservation is taken before each call, then committed with the
+  real token count or refunded if the call fails
+"""
+
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger("TokenLedger")
+
+
+class BudgetExceeded(RuntimeError):
+    """
+    Raised when a reservation would exceed the daily cap.
+    """
+
+
+class Reservation:
+    __slots__ = ("provider", "tokens", "cost", "day")
+
+    def __init__(self, provider: str, tokens: int, cost: float, day: str):
+        self.provider = provider
+        self.tokens = tokens
+        self.cost = cost
+        self.day = day
+
+
+def _today() -> str:
+    return datetime.datetime.utcnow().date().isoformat()
+
+
+class TokenLedger:
+    """
+    SQLite-WAL backed daily budget with per-process leases.
+    """
+
+    _shared: Dict[str, "TokenLedger"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 path: str,
+                 daily_token_limit: int = 250_000,
+                 daily_cost_limit: float = 5.00,
+                 lease_tokens: int = 4_000,
+                 flush_interval: float = 1.0):
+        self.path = path
+        self.daily_token_limit = daily_token_limit
+        self.daily_cost_limit = daily_cost_limit
+        self.lease_tokens = lease_tokens
+        self.lease_cost = daily_cost_limit * lease_tokens / max(1, daily_token_limit)
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()      # in-memory lease / pending usage
+        self._io_lock = threading.Lock()   # SQLite connection
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+
+        self._day = _today()
+        self._tokens_left = 0
+        self._cost_left = 0.0
+        # (day, provider) -> [tokens, cost, calls]
+        self._pending: Dict[Tuple[str, str], list] = {}
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def shared(cls, path: str, **kwargs) -> "TokenLedger":
+        """
+        One ledger object per file in this process.
+        """
+        with cls._shared_lock:
+            ledger = cls._shared.get(path)
+            if ledger is None:
+                ledger = cls._shared[path] = cls(path, **kwargs)
+            return ledger
+
+    @classmethod
+    def close_all(cls):
+        with cls._shared_lock:
+            ledgers = list(cls._shared.values())
+            cls._shared.clear()
+        for ledger in ledgers:
+            ledger.close()
+
+    # ------------------------------------------------------------------
+    # Hot path
+    # ------------------------------------------------------------------
+
+    def reserve(self, provider: str, tokens: int, cost: float) -> Reservation:
+        reservation = self._try_reserve(provider, tokens, cost)
+        if reservation is None:
+            reservation = self._reserve_leasing(provider, tokens, cost)
+        return reservation
+
+    async def areserve(self, provider: str, tokens: int, cost: float) -> Reservation:
+        """
+        `reserve` for the event loop: a new lease is taken in a worker thread.
+        """
+        reservation = self._try_reserve(provider, tokens, cost)
+        if reservation is None:
+            reservation = await asyncio.to_thread(self._reserve_leasing,
+                                                  provider, tokens, cost)
+        return reservation
+
+    def commit(self, reservation: Reservation, tokens: int, cost: float):
+        """
+        Settle a reservation with the real usage.
+        """
+        pending = self._settle(reservation, tokens, cost)
+        if pending:
+            self._write_usage(pending)
+
+    async def acommit(self, reservation: Reservation, tokens: int, cost: float):
+        """
+        `commit` for the event loop: a due flush runs in a worker thread.
+        """
+        pending = self._settle(reservation, tokens, cost)
+        if pending:
+            await asyncio.to_thread(self._write_usage, pending)
+
+    def refund(self, reservation: Reservation):
+        with self._lock:
+            if reservation.day == self._day:
+                self._tokens_left += reservation.tokens
+                self._cost_left += reservation.cost
+
+    # ------------------------------------------------------------------
+    # Reporting / lifecycle
+    # ------------------------------------------------------------------
+
+    def snapshot(self, provider: Optional[str] = None) -> Dict[str, Any]:
+        self._flush()
+        with self._lock:
+            self._roll_day()
+            day = self._day
+        with self._io_lock:
+            conn = self._connection()
+            leased_tokens, leased_cost = self._leased(conn, day)
+            if provider is None:
+                row = conn.execute(
+                    "SELECT COALESCE(SUM(tokens), 0), COALESCE(SUM(cost), 0), "
+                    "COALESCE(SUM(calls), 0) FROM usage WHERE day = ?",
+                    (day,)).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT COALESCE(SUM(tokens), 0), COALESCE(SUM(cost), 0), "
+                    "COALESCE(SUM(calls), 0) FROM usage WHERE day = ? AND provider = ?",
+                    (day, provider)).fetchone()
+
+        return {
+            "day": day,
+            "tokens_used_today": row[0],
+            "cost_used_today": round(row[1], 4),
+            "calls_today": row[2],
+            "tokens_committed_to_workers": leased_tokens,
+            "token_limit": self.daily_token_limit,
+            "cost_limit": self.daily_cost_limit,
+        }
+
+    def close(self):
+        """
+        Flush usage and give the unused lease back to other workers.
+        """
+        if self._conn is None:
+            return
+        self._flush()
+        with self._lock:
+            day = self._day
+            tokens_left, cost_left = self._tokens_left, self._cost_left
+            self._tokens_left = 0
+            self._cost_left = 0.0
+        with self._io_lock:
+            if self._conn is None:
+                return
+            if tokens_left > 0 or cost_left > 0:
+                self._write_lease(day, -max(0, tokens_left), -max(0.0, cost_left))
+            self._conn.close()
+            self._conn = None
+
+    # ------------------------------------------------------------------
+    # Local lease (caller holds nothing; takes self._lock)
+    # ------------------------------------------------------------------
+
+    def _try_reserve(self, provider: str, tokens: int,
+                     cost: float) -> Optional[Reservation]:
+        with self._lock:
+            self._roll_day()
+            if self._tokens_left < tokens or self._cost_left < cost:
+                return None
+            self._tokens_left -= tokens
+            self._cost_left -= cost
+            return Reservation(provider, tokens, cost, self._day)
+
+    def _reserve_leasing(self, provider: str, tokens: int,
+                         cost: float) -> Reservation:
+        with self._io_lock:  # one lease at a time per process
+            while True:
+                reservation = self._try_reserve(provider, tokens, cost)
+                if reservation is not None:
+                    return reservation
+                with self._lock:
+                    day = self._day
+                    need_tokens = tokens - self._tokens_left
+                    need_cost = cost - self._cost_left
+                leased_tokens, leased_cost = self._lease(day, need_tokens, need_cost)
+                with self._lock:
+                    if self._day == day:
+                        self._tokens_left += leased_tokens
+                        self._cost_left += leased_cost
+
+    def _settle(self, reservation: Reservation, tokens: int,
+                cost: float) -> Optional[Dict[Tuple[str, str], list]]:
+        """
+        Book usage locally; returns the pending usage when a flush is due.
+        """
+        with self._lock:
+            if reservation.day == self._day:
+                # Return (or take) the difference to the local lease
+                self._tokens_left += reservation.tokens - tokens
+                self._cost_left += reservation.cost - cost
+            pending = self._pending.setdefault((reservation.day, reservation.provider),
+                                               [0, 0.0, 0])
+            pending[0] += tokens
+            pending[1] += cost
+            pending[2] += 1
+            if time.monotonic() - self._last_flush > self.flush_interval:
+                return self._take_pending()
+        return None
+
+    def _take_pending(self) -> Dict[Tuple[str, str], list]:
+        """
+        Caller holds self._lock.
+        """
+        self._last_flush = time.monotonic()
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def _flush(self):
+        with self._lock:
+            pending = self._take_pending()
+        if pending:
+            self._write_usage(pending)
+
+    def _roll_day(self):
+        """
+        Caller holds self._lock. Pending usage keeps its own day.
+        """
+        today = _today()
+        if today != self._day:
+            self._day = today
+            self._tokens_left = 0
+            self._cost_left = 0.0
+
+    # ------------------------------------------------------------------
+    # Storage (caller holds self._io_lock)
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0,
+                                   isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS budget ("
+                         "day TEXT PRIMARY KEY, leased_tokens INTEGER NOT NULL, "
+                         "leased_cost REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS usage ("
+                         "day TEXT, provider TEXT, tokens INTEGER NOT NULL, "
+                         "cost REAL NOT NULL, calls INTEGER NOT NULL, "
+                         "PRIMARY KEY (day, provider))")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _leased(conn, day: str) -> Tuple[int, float]:
+        row = conn.execute("SELECT leased_tokens, leased_cost FROM budget "
+                           "WHERE day = ?", (day,)).fetchone()
+        return row if row else (0, 0.0)
+
+    def _lease(self, day: str, min_tokens: int, min_cost: float) -> Tuple[int, float]:
+        """
+        Move budget from the shared file into this process.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            leased_tokens, leased_cost = self._leased(conn, day)
+            tokens_free = self.daily_token_limit - leased_tokens
+            cost_free = self.daily_cost_limit - leased_cost
+            if min_tokens > tokens_free:
+                raise BudgetExceeded("Daily token budget exceeded")
+            if min_cost > cost_free:
+                raise BudgetExceeded("Daily LLM cost budget exceeded")
+
+            tokens = min(tokens_free, max(min_tokens, self.lease_tokens))
+            cost = min(cost_free, max(min_cost, self.lease_cost))
+            self._upsert_lease(conn, day, tokens, cost)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return tokens, cost
+
+    def _write_lease(self, day: str, tokens: int, cost: float):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._upsert_lease(conn, day, tokens, cost)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _upsert_lease(conn, day: str, tokens: int, cost: float):
+        conn.execute("INSERT INTO budget (day, leased_tokens, leased_cost) "
+                     "VALUES (?, ?, ?) ON CONFLICT(day) DO UPDATE SET "
+                     "leased_tokens = leased_tokens + excluded.leased_tokens, "
+                     "leased_cost = leased_cost + excluded.leased_cost",
+                     (day, tokens, cost))
+
+    def _write_usage(self, pending: Dict[Tuple[str, str], list]):
+        conn = None
+        try:
+            with self._io_lock:
+                conn = self._connection()
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT INTO usage (day, provider, tokens, cost, calls) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT(day, provider) DO UPDATE SET "
+                    "tokens = tokens + excluded.tokens, cost = cost + excluded.cost, "
+                    "calls = calls + excluded.calls",
+                    [(day, provider, t, c, n)
+                     for (day, provider), (t, c, n) in pending.items()])
+                conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.error(f"Ledger flush failed: {e}")
+            if conn is not None:
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+            # Keep the usage for the next flush
+            with self._lock:
+                for key, (t, c, n) in pending.items():
+                    entry = self._pending.setdefault(key, [0, 0.0, 0])
+                    entry[0] += t
+                    entry[1] += c
+                    entry[2] += n
@@ -1,23 +1,40 @@
 """
-Local LLM Provider (Placeholder)
---------------------------------
-This is a placeholder for local LLM integration (e.g., Ollama, llama.cpp).
-Implement BaseLLMProvider interface when needed.
+Local LLM Provider
+------------------
+Talks to a local OpenAI-compatible inference server (llama.cpp
+`llama-server`, vLLM, Ollama's /v1 endpoint, ...) for data-residency
+tenants and offline benchmarking.
+
+- Same pooled keep-alive client, streaming and batching as the other
+  OpenAI-compatible providers
+- Concurrency is capped (LOCAL_LLM_MAX_CONCURRENCY) to the server's
+  parallel decode slots, so excess requests queue here instead of
+  timing out on the server
+- No API key or cost guard: local tokens are not billed
 """
 
-from integrations.llm import BaseLLMProvider
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional
+
+from config.settings import (
+    LOCAL_LLM_BASE_URL,
+    LOCAL_LLM_MODEL,
+    LOCAL_LLM_MAX_CONCURRENCY,
+    LOCAL_LLM_TIMEOUT_SEC,
+    LOCAL_LLM_BATCH_COMPLETIONS,
+)
+from integrations.llm.openai_compat import OpenAICompatibleProvider
+
+
+class LocalLLMProvider(OpenAICompatibleProvider):
+    """Local LLM Provider"""
 
+    default_base_url = LOCAL_LLM_BASE_URL
+    default_model = LOCAL_LLM_MODEL
+    api_key_env = "LOCAL_LLM_API_KEY"  # optional, e.g. llama-server --api-key
 
-class LocalLLMProvider(BaseLLMProvider):
-    """Local LLM Provider - Not yet implemented"""
-    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = dict(config or {})
+        config.setdefault("max_concurrency", LOCAL_LLM_MAX_CONCURRENCY)
+        config.setdefault("timeout", LOCAL_LLM_TIMEOUT_SEC)
+        config.setdefault("batch_completions", LOCAL_LLM_BATCH_COMPLETIONS)
         super().__init__(config)
-        raise NotImplementedError("LocalLLMProvider is not yet implemented")
-    
-    def generate(self, prompt: str, context: Optional[List[Dict[str, str]]] = None, **kwargs) -> Dict[str, Any]:
-        raise NotImplementedError("LocalLLMProvider is not yet implemented")
-    
-    def health_check(self) -> bool:
-        return False
@@ -0,0 +1,173 @@
+"""
+LLM Micro-Batcher
+-----------------
+Collects concurrent `agenerate` calls and sends them upstream as one
+batch request (inference servers such as vLLM / llama.cpp get far more
+throughput from one batched request than from N single ones).
+
+- Calls are grouped by (model, params); a group is dispatched when it
+  reaches `max_batch` prompts or `window_ms` after its first prompt
+- The inner provider's `agenerate_batch` does the upstream call; its
+  per-prompt results (or exceptions) are handed back to each caller. A
+  failed, short or cancelled batch fails (or cancels) every caller
+- A caller cancelled before dispatch is left out of the batch
+- Calls with conversation context, sync `generate` and streaming pass
+  straight through
+"""
+
+from typing import Dict, Any, List, Optional, AsyncIterator
+import asyncio
+import json
+
+from integrations.llm import BaseLLMProvider, LLMProviderError
+from monitoring.metrics import increment_metric, record_metric
+
+
+class _Batch:
+    __slots__ = ("kwargs", "prompts", "futures", "timer")
+
+    def __init__(self, kwargs: Dict[str, Any]):
+        self.kwargs = kwargs
+        self.prompts: List[str] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher(BaseLLMProvider):
+    """
+    Window / size triggered batching in front of `inner`.
+    """
+
+    layer_name = "micro_batcher"
+
+    def __init__(self, inner: BaseLLMProvider,
+                 window_ms: float = 10.0,
+                 max_batch: int = 16):
+        super().__init__({})
+        self.inner = inner
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._open: Dict[tuple, _Batch] = {}
+        self._inflight = set()
+
+        self.batches = 0
+        self.batched_calls = 0
+        self.passthrough = 0
+
+    # ------------------------------------------------------------------
+    # BaseLLMProvider contract
+    # ------------------------------------------------------------------
+
+    def generate(self, prompt: str,
+                 context: Optional[List[Dict[str, str]]] = None,
+                 **kwargs) -> Dict[str, Any]:
+        self.passthrough += 1
+        return self.inner.generate(prompt, context, **kwargs)
+
+    async def agenerate(self, prompt: str,
+                        context: Optional[List[Dict[str, str]]] = None,
+                        **kwargs) -> Dict[str, Any]:
+        if context:
+            self.passthrough += 1
+            return await self.inner.agenerate(prompt, context, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        key = (id(loop), json.dumps(
+            {k: v for k, v in kwargs.items() if k != "semantic_key"},
+            sort_keys=True, default=str))
+
+        batch = self._open.get(key)
+        if batch is None:
+            batch = self._open[key] = _Batch(kwargs)
+            batch.timer = loop.call_later(self.window, self._dispatch, key, batch)
+
+        future = loop.create_future()
+        batch.prompts.append(prompt)
+        batch.futures.append(future)
+        if len(batch.prompts) >= self.max_batch:
+            self._dispatch(key, batch)
+
+        return dict(await future)
+
+    async def agenerate_batch(self, prompts: List[str], **kwargs) -> List[Any]:
+        return await self.inner.agenerate_batch(prompts, **kwargs)
+
+    async def astream(self, prompt: str,
+                      context: Optional[List[Dict[str, str]]] = None,
+                      **kwargs) -> AsyncIterator[str]:
+        async for chunk in self.inner.astream(prompt, context, **kwargs):
+            yield chunk
+
+    def health_check(self) -> bool:
+        return self.inner.health_check()
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, key: tuple, batch: _Batch):
+        if self._open.get(key) is batch:
+            del self._open[key]
+        batch.timer.cancel()
+
+        live = [(p, f) for p, f in zip(batch.prompts, batch.futures)
+                if not f.done()]
+        if not live:
+            return
+
+        self.batches += 1
+        self.batched_calls += len(live)
+        record_metric("llm_micro_batch_size", len(live))
+        if len(live) > 1:
+            increment_metric("llm_calls_batched", len(live))
+
+        task = asyncio.ensure_future(self._run([p for p, _ in live],
+                                               [f for _, f in live],
+                                               batch.kwargs))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, prompts: List[str], futures: List[asyncio.Future],
+                   kwargs: Dict[str, Any]):
+        error = None
+        try:
+            results = await self.inner.agenerate_batch(prompts, **kwargs)
+            if len(results) != len(prompts):
+                raise LLMProviderError(
+                    f"{self.inner.__class__.__name__}: {len(results)} results "
+                    f"for {len(prompts)} prompts")
+
+            for future, result in zip(futures, results):
+                if future.done():
+                    continue  # caller cancelled while the batch was in flight
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            # No caller is ever left waiting: failures reach every pending
+            # caller, and a cancelled batch cancels them
+            for future in futures:
+                if future.done():
+                    continue
+                if error is None:
+                    future.cancel()
+                else:
+                    future.set_exception(error)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "batched_calls": self.batched_calls,
+            "avg_batch_size": round(self.batched_calls / self.batches, 2)
+            if self.batches else 0.0,
+            "passthrough": self.passthrough,
+        }
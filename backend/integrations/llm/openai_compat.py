@@ -0,0 +1,315 @@
+"""
+OpenAI-Compatible Provider Base
+-------------------------------
+Shared implementation for providers that speak the OpenAI
+chat-completions protocol over HTTP (Groq, OpenAI, llama.cpp / vLLM
+servers, ...).
+
+- Sync `generate` and async `agenerate` both go through the shared
+  keep-alive pools in `http_pool`, so connections are reused across
+  requests and provider instances
+- Pool size, timeouts and HTTP/2 come from the provider config
+  (see http_pool.DEFAULT_POOL_CONFIG)
+- `astream` uses server-side streaming (SSE deltas)
+- Optional "max_concurrency" caps in-flight requests per provider
+  instance (e.g. the decode slots of a local inference server)
+"""
+
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional, AsyncIterator
+import asyncio
+import json
+import os
+import threading
+import time
+
+import httpx
+
+from integrations.llm import BaseLLMProvider, LLMProviderError
+from integrations.llm.http_pool import HTTPPool
+from integrations.llm.tokenizer import count_tokens
+
+# Generation kwargs forwarded to the API; anything else is ignored
+GENERATION_PARAMS = ("temperature", "max_tokens", "top_p", "stop", "seed")
+
+
+class OpenAICompatibleProvider(BaseLLMProvider):
+    """
+    Base class for OpenAI-protocol HTTP providers.
+    """
+
+    default_base_url: Optional[str] = None
+    default_model: Optional[str] = None
+    api_key_env: Optional[str] = None
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        super().__init__(config)
+        base_url = self.config.get("base_url") or self.default_base_url
+        if not base_url:
+            raise ValueError(f"{self.__class__.__name__} needs a base_url")
+
+        self.base_url = base_url.rstrip("/")
+        self.model = self.config.get("model", self.default_model)
+        self.api_key = self.config.get("api_key") or (
+            os.getenv(self.api_key_env) if self.api_key_env else None)
+        self.cost_guard = None
+
+        self.max_concurrency = self.config.get("max_concurrency")
+        self._sync_slots = (threading.BoundedSemaphore(self.max_concurrency)
+                            if self.max_concurrency else None)
+        self._async_slots = None
+        self._async_slots_loop = None
+
+    # ------------------------------------------------------------------
+    # BaseLLMProvider contract
+    # ------------------------------------------------------------------
+
+    def generate(self, prompt: str,
+                 context: Optional[List[Dict[str, str]]] = None,
+                 **kwargs) -> Dict[str, Any]:
+        payload, reservation = self._before(prompt, context, kwargs)
+        start = time.perf_counter()
+        try:
+            with self._sync_slots or nullcontext():
+                response = HTTPPool.get_sync(self.base_url, self.config).post(
+                    "/chat/completions", json=payload, headers=self._headers())
+            response.raise_for_status()
+            data = response.json()
+        except BaseException as e:
+            self._refund(reservation)
+            if isinstance(e, (httpx.HTTPError, ValueError)):
+                raise self._error(e) from e
+            raise
+        return self._after(data, payload, start, reservation)
+
+    async def agenerate(self, prompt: str,
+                        context: Optional[List[Dict[str, str]]] = None,
+                        **kwargs) -> Dict[str, Any]:
+        payload, reservation = await self._abefore(prompt, context, kwargs)
+        start = time.perf_counter()
+        try:
+            client = HTTPPool.get_async(self.base_url, self.config)
+            async with self._async_slot():
+                response = await client.post("/chat/completions", json=payload,
+                                             headers=self._headers())
+            response.raise_for_status()
+            data = response.json()
+        except BaseException as e:
+            self._refund(reservation)
+            if isinstance(e, (httpx.HTTPError, ValueError)):
+                raise self._error(e) from e
+            raise
+        return await self._aafter(data, payload, start, reservation)
+
+    async def agenerate_batch(self, prompts: List[str], **kwargs) -> List[Any]:
+        """
+        One /completions request with a list of prompts when the server
+        supports it (config "batch_completions": true, e.g. vLLM /
+        llama.cpp); otherwise concurrent chat calls.
+        """
+        if not self.config.get("batch_completions"):
+            return await super().agenerate_batch(prompts, **kwargs)
+
+        payload = self._payload("", None, kwargs)
+        del payload["messages"]
+        payload["prompt"] = list(prompts)
+        reservation = None
+        if self.cost_guard is not None:
+            completion = (payload.get("max_tokens")
+                          or self.cost_guard.DEFAULT_COMPLETION_TOKENS)
+            reservation = await self.cost_guard.areserve("".join(prompts),
+                                                         completion * len(prompts))
+
+        start = time.perf_counter()
+        try:
+            client = HTTPPool.get_async(self.base_url, self.config)
+            async with self._async_slot():
+                response = await client.post("/completions", json=payload,
+                                             headers=self._headers())
+            response.raise_for_status()
+            data = response.json()
+            choices = sorted(data["choices"], key=lambda c: c.get("index", 0))
+        except BaseException as e:
+            self._refund(reservation)
+            if isinstance(e, (httpx.HTTPError, ValueError, KeyError, TypeError)):
+                raise self._error(e) from e
+            raise
+
+        latency_ms = int((time.perf_counter() - start) * 1000)
+        model = data.get("model", self.model)
+        results = []
+        for i in range(len(prompts)):
+            if i >= len(choices):
+                results.append(LLMProviderError(
+                    f"{self.__class__.__name__}: missing batch choice {i}"))
+                continue
+            text = choices[i].get("text") or ""
+            results.append({"text": text,
+                            "tokens_used": count_tokens(prompts[i]) + count_tokens(text),
+                            "model": model, "latency_ms": latency_ms})
+
+        if reservation is not None:
+            usage = (data.get("usage") or {}).get("total_tokens")
+            await self.cost_guard.acommit(reservation, usage or sum(
+                r["tokens_used"] for r in results if isinstance(r, dict)))
+        return results
+
+    async def astream(self, prompt: str,
+                      context: Optional[List[Dict[str, str]]] = None,
+                      **kwargs) -> AsyncIterator[str]:
+        payload, reservation = await self._abefore(prompt, context, kwargs)
+        payload["stream"] = True
+        parts = []
+        try:
+            client = HTTPPool.get_async(self.base_url, self.config)
+            async with self._async_slot():
+                async with client.stream("POST", "/chat/completions", json=payload,
+                                         headers=self._headers()) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        try:
+                            delta = json.loads(data)["choices"][0].get("delta") or {}
+                        except (ValueError, KeyError, IndexError, TypeError):
+                            continue
+                        text = delta.get("content")
+                        if text:
+                            parts.append(text)
+                            yield text
+        except BaseException as e:
+            self._refund(reservation)
+            if isinstance(e, httpx.HTTPError):
+                raise self._error(e) from e
+            raise
+
+        if reservation is not None:
+            await self.cost_guard.acommit(reservation,
+                                          count_tokens(self._prompt_text(payload))
+                                          + count_tokens("".join(parts)))
+
+    def health_check(self) -> bool:
+        try:
+            response = HTTPPool.get_sync(self.base_url, self.config).get(
+                "/models", headers=self._headers())
+        except httpx.HTTPError:
+            return False
+        return response.is_success
+
+    async def ahealth_check(self) -> bool:
+        """
+        Probe through the async pool (keeps its connections warm).
+        """
+        try:
+            client = HTTPPool.get_async(self.base_url, self.config)
+            response = await client.get("/models", headers=self._headers())
+        except httpx.HTTPError:
+            return False
+        return response.is_success
+
+    # ------------------------------------------------------------------
+    # Internal Helpers
+    # ------------------------------------------------------------------
+
+    def _async_slot(self):
+        if not self.max_concurrency:
+            return nullcontext()
+        # asyncio primitives are bound to the loop that first uses them
+        loop = asyncio.get_running_loop()
+        if self._async_slots_loop is not loop:
+            self._async_slots = asyncio.Semaphore(self.max_concurrency)
+            self._async_slots_loop = loop
+        return self._async_slots
+
+    def _error(self, error: Exception) -> LLMProviderError:
+        # httpx timeouts stringify to ""
+        return LLMProviderError(f"{self.__class__.__name__}: "
+                                f"{str(error) or type(error).__name__}")
+
+    def _headers(self) -> Dict[str, str]:
+        if not self.api_key:
+            return {}
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def _payload(self, prompt: str,
+                 context: Optional[List[Dict[str, str]]],
+                 kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        messages = list(context or [])
+        messages.append({"role": "user", "content": prompt})
+
+        payload = {"model": self.model, "messages": messages}
+        for key in GENERATION_PARAMS:
+            if key in kwargs:
+                payload[key] = kwargs[key]
+            elif key in self.config:
+                payload[key] = self.config[key]
+        return payload
+
+    def _before(self, prompt: str, context, kwargs):
+        """
+        Build the payload and reserve budget for it (None without a guard).
+        """
+        payload = self._payload(prompt, context, kwargs)
+        reservation = None
+        if self.cost_guard is not None:
+            reservation = self.cost_guard.reserve(self._prompt_text(payload),
+                                                  payload.get("max_tokens"))
+        return payload, reservation
+
+    async def _abefore(self, prompt: str, context, kwargs):
+        """
+        `_before` for async calls: a ledger lease runs off the event loop.
+        """
+        payload = self._payload(prompt, context, kwargs)
+        reservation = None
+        if self.cost_guard is not None:
+            reservation = await self.cost_guard.areserve(self._prompt_text(payload),
+                                                         payload.get("max_tokens"))
+        return payload, reservation
+
+    @staticmethod
+    def _prompt_text(payload: Dict[str, Any]) -> str:
+        """
+        The message text budgeted for a chat payload.
+        """
+        return "".join(m.get("content", "") for m in payload["messages"])
+
+    def _refund(self, reservation):
+        if reservation is not None:
+            self.cost_guard.refund(reservation)
+
+    def _after(self, data: Dict[str, Any], payload: Dict[str, Any], start: float,
+               reservation=None) -> Dict[str, Any]:
+        result = self._result(data, payload, start, reservation)
+        if reservation is not None:
+            self.cost_guard.commit(reservation, result["tokens_used"])
+        return result
+
+    async def _aafter(self, data: Dict[str, Any], payload: Dict[str, Any],
+                      start: float, reservation=None) -> Dict[str, Any]:
+        result = self._result(data, payload, start, reservation)
+        if reservation is not None:
+            await self.cost_guard.acommit(reservation, result["tokens_used"])
+        return result
+
+    def _result(self, data: Dict[str, Any], payload: Dict[str, Any], start: float,
+                reservation=None) -> Dict[str, Any]:
+        try:
+            text = data["choices"][0]["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError) as e:
+            self._refund(reservation)
+            raise LLMProviderError(f"{self.__class__.__name__}: malformed response") from e
+
+        # Servers that omit usage (often llama.cpp / local) are billed
+        # prompt + completion, the same as the reservation
+        tokens_used = (data.get("usage") or {}).get("total_tokens") or \
+            count_tokens(self._prompt_text(payload)) + count_tokens(text)
+        return {
+            "text": text,
+            "tokens_used": tokens_used,
+            "model": data.get("model", self.model),
+            "latency_ms": int((time.perf_counter() - start) * 1000),
+        }
@@ -1,23 +1,29 @@
 """
-OpenAI LLM Provider (Placeholder)
-----------------------------------
-This is a placeholder for OpenAI integration.
-Implement BaseLLMProvider interface when needed.
+OpenAI LLM Provider
+-------------------
+OpenAI chat-completions over the shared keep-alive pool.
 """
 
-from integrations.llm import BaseLLMProvider
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional
 
+from integrations.llm.cost_gaurd import CostGuard
+from integrations.llm.openai_compat import OpenAICompatibleProvider
+
+
+class OpenAIProvider(OpenAICompatibleProvider):
+    """OpenAI LLM Provider"""
+
+    default_base_url = "https://api.openai.com/v1"
+    default_model = "gpt-4o-mini"
+    api_key_env = "OPENAI_API_KEY"
 
-class OpenAIProvider(BaseLLMProvider):
-    """OpenAI LLM Provider - Not yet implemented"""
-    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         super().__init__(config)
-        raise NotImplementedError("OpenAIProvider is not yet implemented")
-    
-    def generate(self, prompt: str, context: Optional[List[Dict[str, str]]] = None, **kwargs) -> Dict[str, Any]:
-        raise NotImplementedError("OpenAIProvider is not yet implemented")
-    
-    def health_check(self) -> bool:
-        return False
+
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY missing")
+
+        self.cost_guard = CostGuard(
+            provider="openai",
+            cost_per_1k_tokens=0.0006  # approx gpt-4o-mini blended pricing
+        )
@@ -0,0 +1,312 @@
+"""
+Record / Replay LLM Provider
+----------------------------
+Deterministic LLM stand-in for load tests and offline benchmarks.
+
+- record: wraps a real provider and appends every call (request key,
+  response text, tokens, model, latency) to a cassette file
+- replay: serves responses from the cassette with no network, using a
+  configurable latency model:
+    "recorded"     → the latency measured while recording
+    "fixed"        → `fixed_ms` for every call
+    "distribution" → log-normal around `median_ms` (spread `sigma`),
+                     with probability `spike_prob` of a `spike_factor`×
+                     tail spike
+    "none"         → no delay
+
+Cassette: one compact JSON object per line (gzip if the path ends in
+.gz): {"k": key, "t": text, "n": tokens, "m": model, "l": latency_ms}.
+Recording keeps one buffered append writer per cassette file (a single
+gzip member), written from a worker thread on async paths and closed by
+`ReplayProvider.close_all()` at shutdown; recorded entries are only
+written, never kept in memory. Streams are recorded with token counts
+from the tokenizer. A cassette cut short by a crash loads up to its
+last complete line.
+The key hashes prompt, context and generation params (routing hints
+excluded). In replay, prompts that were never recorded either fail
+(`on_miss="error"`) or get recorded responses in rotation
+(`on_miss="cycle"`), which keeps load tests running when prompts carry
+per-request data.
+"""
+
+from typing import Dict, Any, List, Optional, AsyncIterator
+import asyncio
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+
+from integrations.llm import BaseLLMProvider, LLMProviderError, HINT_KWARGS
+from integrations.llm.tokenizer import count_tokens
+
+logger = logging.getLogger("ReplayProvider")
+
+LATENCY_MODES = ("recorded", "fixed", "distribution", "none")
+
+
+def request_key(prompt: str, context, kwargs: Dict[str, Any]) -> str:
+    params = {k: v for k, v in kwargs.items() if k not in HINT_KWARGS}
+    raw = json.dumps([prompt, context, params], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class CassetteWriter:
+    """
+    Buffered append writer for one cassette file.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._file = _open(path, "a")
+        self._lock = threading.Lock()
+
+    def write(self, line: str):
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ReplayProvider(BaseLLMProvider):
+    """
+    Records calls to `inner` into a cassette, or replays a cassette.
+    """
+
+    layer_name = "replay"
+
+    # One writer per cassette path in this process
+    _writers: Dict[str, CassetteWriter] = {}
+    _writers_lock = threading.Lock()
+
+    def __init__(self,
+                 cassette: str,
+                 mode: str = "replay",
+                 inner: Optional[BaseLLMProvider] = None,
+                 latency: str = "recorded",
+                 fixed_ms: float = 100.0,
+                 median_ms: float = 300.0,
+                 sigma: float = 0.3,
+                 spike_prob: float = 0.01,
+                 spike_factor: float = 10.0,
+                 on_miss: str = "cycle",
+                 seed: Optional[int] = 0):
+        super().__init__({})
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Unknown replay latency mode: {latency}")
+        if mode == "record" and inner is None:
+            raise ValueError("Record mode needs an inner provider")
+
+        self.cassette = cassette
+        self.mode = mode
+        self.inner = inner
+        self.latency = latency
+        self.fixed_ms = fixed_ms
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.spike_prob = spike_prob
+        self.spike_factor = spike_factor
+        self.on_miss = on_miss
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._served: Dict[str, int] = {}
+        self._all: List[Dict[str, Any]] = []
+        if mode == "replay":
+            self._load()
+            if not self._all:
+                raise ValueError(f"Cassette is empty or missing: {cassette}")
+        self._rotation = itertools.cycle(self._all) if self._all else None
+
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # BaseLLMProvider contract
+    # ------------------------------------------------------------------
+
+    def generate(self, prompt: str,
+                 context: Optional[List[Dict[str, str]]] = None,
+                 **kwargs) -> Dict[str, Any]:
+        key = request_key(prompt, context, kwargs)
+        if self.mode == "record":
+            start = time.perf_counter()
+            response = self.inner.generate(prompt, context, **kwargs)
+            self._store(self._entry(key, response, start))
+            return response
+
+        entry = self._lookup(key)
+        time.sleep(self._delay(entry))
+        return self._response(entry)
+
+    async def agenerate(self, prompt: str,
+                        context: Optional[List[Dict[str, str]]] = None,
+                        **kwargs) -> Dict[str, Any]:
+        key = request_key(prompt, context, kwargs)
+        if self.mode == "record":
+            start = time.perf_counter()
+            response = await self.inner.agenerate(prompt, context, **kwargs)
+            await asyncio.to_thread(self._store, self._entry(key, response, start))
+            return response
+
+        entry = self._lookup(key)
+        await asyncio.sleep(self._delay(entry))
+        return self._response(entry)
+
+    async def astream(self, prompt: str,
+                      context: Optional[List[Dict[str, str]]] = None,
+                      **kwargs) -> AsyncIterator[str]:
+        if self.mode == "record":
+            key = request_key(prompt, context, kwargs)
+            start = time.perf_counter()
+            parts = []
+            async for chunk in self.inner.astream(prompt, context, **kwargs):
+                parts.append(chunk)
+                yield chunk
+            text = "".join(parts)
+            response = {"text": text,
+                        "tokens_used": count_tokens(prompt) + count_tokens(text)}
+            await asyncio.to_thread(self._store, self._entry(key, response, start))
+            return
+
+        # Replay: the delay is spread evenly over word-sized chunks
+        entry = self._lookup(request_key(prompt, context, kwargs))
+        words = entry["t"].split(" ")
+        step = self._delay(entry) / max(1, len(words))
+        for i, word in enumerate(words):
+            await asyncio.sleep(step)
+            yield word if i == len(words) - 1 else word + " "
+
+    def health_check(self) -> bool:
+        if self.mode == "record":
+            return self.inner.health_check()
+        return True
+
+    def close(self):
+        """
+        Flush and close this cassette's writer (recording reopens it).
+        """
+        with self._writers_lock:
+            writer = self._writers.pop(self.cassette, None)
+        if writer is not None:
+            writer.close()
+
+    @classmethod
+    def close_all(cls):
+        """
+        Flush and close every cassette writer (call at shutdown).
+        """
+        with cls._writers_lock:
+            writers = list(cls._writers.values())
+            cls._writers.clear()
+        for writer in writers:
+            writer.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "cassette": self.cassette,
+            "latency": self.latency,
+            "entries": len(self._all),
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
+
+    # ------------------------------------------------------------------
+    # Cassette
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if not os.path.exists(self.cassette):
+            return
+        try:
+            with _open(self.cassette, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        self._add(json.loads(line))
+        except (EOFError, ValueError) as e:
+            # Recorder killed before close(): keep the complete lines
+            logger.warning(f"Cassette {self.cassette} is truncated ({e}); "
+                           f"loaded {len(self._all)} entries")
+
+    def _add(self, entry: Dict[str, Any]):
+        self._entries.setdefault(entry["k"], []).append(entry)
+        self._all.append(entry)
+
+    @staticmethod
+    def _entry(key: str, response: Dict[str, Any], start: float) -> Dict[str, Any]:
+        return {
+            "k": key,
+            "t": response.get("text", ""),
+            "n": response.get("tokens_used", 0),
+            "m": response.get("model", "unknown"),
+            "l": int((time.perf_counter() - start) * 1000),
+        }
+
+    def _store(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        self._writer().write(line)
+        with self._lock:
+            self.recorded += 1
+
+    def _writer(self) -> CassetteWriter:
+        with self._writers_lock:
+            writer = self._writers.get(self.cassette)
+            if writer is None:
+                writer = self._writers[self.cassette] = CassetteWriter(self.cassette)
+            return writer
+
+    def _lookup(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if entries:
+                # Same prompt recorded several times → serve them in turn
+                served = self._served.get(key, 0)
+                self._served[key] = served + 1
+                self.replayed += 1
+                return entries[served % len(entries)]
+
+            self.misses += 1
+            if self.on_miss == "error":
+                raise LLMProviderError(f"No recorded response for request {key}")
+            self.replayed += 1
+            return next(self._rotation)
+
+    def _response(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {"text": entry["t"], "tokens_used": entry["n"],
+                "model": entry["m"], "latency_ms": entry["l"]}
+
+    def _delay(self, entry: Dict[str, Any]) -> float:
+        if self.latency == "none":
+            return 0.0
+        if self.latency == "recorded":
+            return entry["l"] / 1000
+        if self.latency == "fixed":
+            return self.fixed_ms / 1000
+
+        with self._lock:
+            ms = self.median_ms * math.exp(self._rng.gauss(0.0, self.sigma))
+            if self._rng.random() < self.spike_prob:
+                ms *= self.spike_factor
+        return ms / 1000
@@ -0,0 +1,489 @@
+"""
+LLM Router
+----------
+Routes each request across several LLM providers (Groq, OpenAI,
+Claude, local) instead of a single active one.
+
+- Per-provider stats: EWMA latency, EWMA error rate, tokens and cost
+- Selection policies:
+    "cheapest_under_slo" → cheapest provider whose EWMA latency meets the
+                           SLO; providers over the SLO follow, fastest first
+    "fastest"            → lowest EWMA latency first
+    "ordered"            → registration order (plain failover)
+- Circuit breaker per provider: `failure_threshold` consecutive failures
+  open it for `reset_timeout` seconds, then one probe call decides
+  whether it closes again. Ranking only peeks at breakers; the half-open
+  probe slot is claimed by the provider actually being called
+- Hedging (async only): if the chosen provider has not answered after
+  its p95 latency, the next candidate is fired too and the first
+  success wins; the loser is cancelled
+- Failed calls fall through to the next candidate. BudgetExceeded (the
+  shared daily cap) is not a provider failure: it is re-raised without
+  touching breakers or trying other candidates
+
+The router is itself a BaseLLMProvider, so workflows keep calling
+`LLMRegistry.get().generate(...)` unchanged.
+"""
+
+from collections import deque
+from typing import Dict, Any, List, Optional, AsyncIterator
+import asyncio
+import logging
+import threading
+import time
+
+from integrations.llm import BaseLLMProvider, LLMProviderError
+from integrations.llm.ledger import BudgetExceeded
+from integrations.llm.tokenizer import count_tokens
+
+logger = logging.getLogger("LLMRouter")
+
+POLICIES = ("cheapest_under_slo", "fastest", "ordered")
+
+
+class CircuitBreaker:
+    """
+    Closed → open after N consecutive failures → half-open after
+    `reset_timeout` (one probe) → closed on success / open on failure.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def peek(self) -> bool:
+        """
+        Would `available()` admit a call right now? (No side effects.)
+        """
+        if self.state == "closed":
+            return True
+        now = time.monotonic()
+        if self.state == "open":
+            return now - self.opened_at >= self.reset_timeout
+        return now - self.probe_started > self.reset_timeout
+
+    def available(self) -> bool:
+        """
+        Admit a call; claims the half-open probe slot when there is one.
+        """
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            if self.state == "open":
+                if now - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                self.probe_started = now
+                return True
+            # half_open: a single probe at a time (retry if it went missing)
+            if now - self.probe_started > self.reset_timeout:
+                self.probe_started = now
+                return True
+            return False
+
+    def release(self):
+        """
+        Give back a claimed probe slot whose call never completed
+        (e.g. a cancelled hedge), so the next call can probe at once.
+        """
+        with self._lock:
+            if self.state == "half_open":
+                self.probe_started = 0.0
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def trip(self) -> float:
+        """
+        Open immediately (e.g. a background health probe found it down).
+        Returns the open timestamp, the token `untrip` needs.
+        """
+        with self._lock:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            return self.opened_at
+
+    def untrip(self, opened_at: float) -> bool:
+        """
+        Close a breaker opened by `trip()`, unless real calls have
+        reopened or half-opened it since.
+        """
+        with self._lock:
+            if self.state != "open" or self.opened_at != opened_at:
+                return False
+            self.state = "closed"
+            self.failures = 0
+            return True
+
+
+class RoutedProvider:
+    """
+    One provider plus its routing stats and breaker.
+    """
+
+    def __init__(self, name: str, provider: BaseLLMProvider,
+                 cost_per_1k_tokens: float = 0.0,
+                 breaker: Optional[CircuitBreaker] = None,
+                 alpha: float = 0.2,
+                 window: int = 256):
+        self.name = name
+        self.provider = provider
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.breaker = breaker or CircuitBreaker()
+        self.alpha = alpha
+
+        self.ewma_latency_ms: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.tokens = 0
+        self.cost = 0.0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_success(self, latency_sec: float, tokens: int):
+        latency_ms = latency_sec * 1000
+        with self._lock:
+            self.calls += 1
+            self.tokens += tokens
+            self.cost += tokens / 1000 * self.cost_per_1k_tokens
+            self._latencies.append(latency_ms)
+            if self.ewma_latency_ms is None:
+                self.ewma_latency_ms = latency_ms
+            else:
+                self.ewma_latency_ms += self.alpha * (latency_ms - self.ewma_latency_ms)
+            self.ewma_error_rate *= 1 - self.alpha
+        self.breaker.record_success()
+
+    def record_failure(self):
+        with self._lock:
+            self.calls += 1
+            self.errors += 1
+            self.ewma_error_rate += self.alpha * (1 - self.ewma_error_rate)
+        was_open = self.breaker.state == "open"
+        self.breaker.record_failure()
+        if not was_open and self.breaker.state == "open":
+            logger.warning(f"Circuit opened for LLM provider: {self.name}")
+
+    def p95_ms(self) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.p95_ms()
+        return {
+            "state": self.breaker.state,
+            "calls": self.calls,
+            "errors": self.errors,
+            "ewma_latency_ms": None if self.ewma_latency_ms is None
+            else round(self.ewma_latency_ms, 2),
+            "p95_latency_ms": None if p95 is None else round(p95, 2),
+            "ewma_error_rate": round(self.ewma_error_rate, 4),
+            "tokens": self.tokens,
+            "cost_usd": round(self.cost, 6),
+            "cost_per_1k_tokens": self.cost_per_1k_tokens,
+        }
+
+
+class LLMRouter(BaseLLMProvider):
+    """
+    Latency / cost-aware router over several providers.
+    """
+
+    layer_name = "router"
+
+    def __init__(self,
+                 policy: str = "cheapest_under_slo",
+                 slo_ms: float = 2000.0,
+                 max_error_rate: float = 0.5,
+                 hedge: bool = False,
+                 hedge_min_delay_ms: float = 50.0,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0):
+        super().__init__({})
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown LLM routing policy: {policy}")
+
+        self.policy = policy
+        self.slo_ms = slo_ms
+        self.max_error_rate = max_error_rate
+        self.hedge = hedge
+        self.hedge_min_delay_ms = hedge_min_delay_ms
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.providers: List[RoutedProvider] = []
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def add(self, name: str, provider: BaseLLMProvider,
+            cost_per_1k_tokens: Optional[float] = None) -> RoutedProvider:
+        """
+        Add a provider. Cost defaults to the provider's CostGuard rate.
+        """
+        if cost_per_1k_tokens is None:
+            guard = getattr(provider, "cost_guard", None)
+            cost_per_1k_tokens = getattr(guard, "cost_per_1k_tokens", 0.0)
+
+        entry = RoutedProvider(
+            name, provider, cost_per_1k_tokens,
+            breaker=CircuitBreaker(self.failure_threshold, self.reset_timeout))
+        self.providers = [p for p in self.providers if p.name != name] + [entry]
+        return entry
+
+    def get(self, name: str) -> Optional[RoutedProvider]:
+        for entry in self.providers:
+            if entry.name == name:
+                return entry
+        return None
+
+    # ------------------------------------------------------------------
+    # BaseLLMProvider contract
+    # ------------------------------------------------------------------
+
+    def generate(self, prompt: str,
+                 context: Optional[List[Dict[str, str]]] = None,
+                 **kwargs) -> Dict[str, Any]:
+        errors = []
+        for entry in self.candidates():
+            if not entry.breaker.available():
+                continue
+            if errors:
+                self.failovers += 1
+            start = time.perf_counter()
+            try:
+                response = entry.provider.generate(prompt, context, **kwargs)
+            except BudgetExceeded:
+                entry.breaker.release()
+                raise
+            except Exception as e:
+                entry.record_failure()
+                errors.append(f"{entry.name}: {e}")
+                continue
+            return self._accept(entry, response, start)
+        raise self._exhausted(errors)
+
+    async def agenerate(self, prompt: str,
+                        context: Optional[List[Dict[str, str]]] = None,
+                        **kwargs) -> Dict[str, Any]:
+        candidates = self.candidates()
+        errors = []
+        i = 0
+        while i < len(candidates):
+            if errors:
+                self.failovers += 1
+            primary = candidates[i]
+            backup = candidates[i + 1] if self.hedge and i + 1 < len(candidates) else None
+            i += 2 if backup is not None else 1
+            try:
+                if backup is None:
+                    return await self._acall(primary, prompt, context, kwargs)
+                return await self._ahedged(primary, backup, prompt, context, kwargs)
+            except LLMProviderError as e:
+                errors.append(str(e))
+        raise self._exhausted(errors)
+
+    async def agenerate_batch(self, prompts: List[str], **kwargs) -> List[Any]:
+        """
+        Send the whole batch to the best candidate, failing over as a unit.
+        """
+        errors = []
+        for entry in self.candidates():
+            if not entry.breaker.available():
+                continue
+            if errors:
+                self.failovers += 1
+            start = time.perf_counter()
+            try:
+                results = await entry.provider.agenerate_batch(prompts, **kwargs)
+            except asyncio.CancelledError:
+                raise
+            except BudgetExceeded:
+                entry.breaker.release()
+                raise
+            except Exception as e:
+                entry.record_failure()
+                errors.append(f"{entry.name}: {e}")
+                continue
+            entry.record_success(time.perf_counter() - start, sum(
+                r.get("tokens_used", 0) or 0 for r in results if isinstance(r, dict)))
+            return [dict(r, provider=entry.name) if isinstance(r, dict) else r
+                    for r in results]
+        raise self._exhausted(errors)
+
+    async def astream(self, prompt: str,
+                      context: Optional[List[Dict[str, str]]] = None,
+                      **kwargs) -> AsyncIterator[str]:
+        """
+        Stream from the best candidate; fails over only before the first
+        chunk has been emitted.
+        """
+        errors = []
+        for entry in self.candidates():
+            if not entry.breaker.available():
+                continue
+            start = time.perf_counter()
+            chunks = []
+            try:
+                async for chunk in entry.provider.astream(prompt, context, **kwargs):
+                    chunks.append(chunk)
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit, BudgetExceeded):
+                entry.breaker.release()
+                raise
+            except Exception as e:
+                entry.record_failure()
+                if chunks:
+                    raise
+                errors.append(f"{entry.name}: {e}")
+                continue
+            entry.record_success(time.perf_counter() - start,
+                                 count_tokens(prompt) + count_tokens("".join(chunks)))
+            return
+        raise self._exhausted(errors)
+
+    def health_check(self) -> bool:
+        return any(entry.provider.health_check() for entry in self.providers)
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+
+    def candidates(self) -> List[RoutedProvider]:
+        """
+        Providers with a non-open breaker, best first for the policy.
+
+        Side-effect free: breakers are only peeked at here. Callers claim
+        a provider with `breaker.available()` right before calling it.
+        """
+        available = [e for e in self.providers if e.breaker.peek()]
+
+        # Unhealthy providers go last regardless of policy
+        healthy = [e for e in available if e.ewma_error_rate <= self.max_error_rate]
+        flaky = [e for e in available if e.ewma_error_rate > self.max_error_rate]
+        flaky.sort(key=lambda e: e.ewma_error_rate)
+
+        if self.policy == "fastest":
+            healthy.sort(key=self._latency_key)
+        elif self.policy == "cheapest_under_slo":
+            within = [e for e in healthy if self._latency_key(e) <= self.slo_ms]
+            over = [e for e in healthy if self._latency_key(e) > self.slo_ms]
+            within.sort(key=lambda e: (e.cost_per_1k_tokens, self._latency_key(e)))
+            over.sort(key=self._latency_key)
+            healthy = within + over
+
+        return healthy + flaky
+
+    @staticmethod
+    def _latency_key(entry: RoutedProvider) -> float:
+        # Unmeasured providers are assumed fast so they get sampled
+        return entry.ewma_latency_ms if entry.ewma_latency_ms is not None else 0.0
+
+    def _hedge_delay(self, entry: RoutedProvider) -> float:
+        p95 = entry.p95_ms()
+        if p95 is None:
+            p95 = self.slo_ms
+        return max(p95, self.hedge_min_delay_ms) / 1000
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    def _accept(self, entry: RoutedProvider, response: Dict[str, Any],
+                start: float) -> Dict[str, Any]:
+        entry.record_success(time.perf_counter() - start,
+                             response.get("tokens_used", 0) or 0)
+        response = dict(response)
+        response["provider"] = entry.name
+        return response
+
+    async def _acall(self, entry: RoutedProvider, prompt, context,
+                     kwargs) -> Dict[str, Any]:
+        if not entry.breaker.available():
+            raise LLMProviderError(f"{entry.name}: circuit open")
+        start = time.perf_counter()
+        try:
+            response = await entry.provider.agenerate(prompt, context, **kwargs)
+        except (asyncio.CancelledError, BudgetExceeded):
+            entry.breaker.release()
+            raise
+        except Exception as e:
+            entry.record_failure()
+            raise LLMProviderError(f"{entry.name}: {e}") from e
+        return self._accept(entry, response, start)
+
+    async def _ahedged(self, primary: RoutedProvider, backup: RoutedProvider,
+                       prompt, context, kwargs) -> Dict[str, Any]:
+        first = asyncio.ensure_future(self._acall(primary, prompt, context, kwargs))
+        pending = {first}
+        errors = []
+        try:
+            done, pending = await asyncio.wait(pending,
+                                               timeout=self._hedge_delay(primary))
+            hedging = not done
+            if hedging:
+                self.hedged += 1
+            else:
+                try:
+                    return first.result()
+                except LLMProviderError as e:
+                    errors.append(str(e))  # fast failure → plain failover
+
+            pending.add(asyncio.ensure_future(
+                self._acall(backup, prompt, context, kwargs)))
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        result = task.result()
+                    except LLMProviderError as e:
+                        errors.append(str(e))
+                        continue
+                    if hedging and task is not first:
+                        self.hedge_wins += 1
+                    return result
+            raise LLMProviderError("; ".join(errors))
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _exhausted(errors: List[str]) -> LLMProviderError:
+        if not errors:
+            return LLMProviderError("No LLM provider available (all circuits open)")
+        return LLMProviderError("All LLM providers failed: " + "; ".join(errors))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "slo_ms": self.slo_ms,
+            "hedge": self.hedge,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "providers": {e.name: e.stats() for e in self.providers},
+        }
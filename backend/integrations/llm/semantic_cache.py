@@ -0,0 +1,230 @@
+"""
+Semantic LLM Cache
+------------------
+Answers paraphrased prompts ("plot ka rate kya hai" / "price of plots?")
+from earlier completions instead of paying for a new LLM call.
+
+- Wraps any BaseLLMProvider (`inner`); a hit never reaches it
+- The text that is embedded is the caller's `semantic_key` hint (the
+  user's own words, see integrations.llm.request_hints), falling back to
+  the whole prompt
+- Namespaces: one SemanticIndex per (tenant, prompt template, params),
+  where the template is the prompt with the semantic key cut out — a
+  hit is only possible when everything except the user's wording matches
+- Entries expire after `ttl` seconds; each namespace keeps at most
+  `max_entries` (oldest evicted first) and at most `max_namespaces`
+  namespaces are kept (least recently used evicted)
+- Calls with conversation `context` are never cached
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable
+import hashlib
+import itertools
+import json
+import threading
+import time
+
+from integrations.llm import BaseLLMProvider, HINT_KWARGS
+from memory.semantic_index import SemanticIndex
+from monitoring.metrics import increment_metric
+
+
+class _Namespace:
+    def __init__(self, embedder):
+        self.index = SemanticIndex(embedder)
+        self.entries: "OrderedDict[str, float]" = OrderedDict()  # id -> expires_at
+
+
+class SemanticCache(BaseLLMProvider):
+    """
+    Similarity-keyed response cache in front of an LLM provider.
+    """
+
+    layer_name = "semantic_cache"
+
+    def __init__(self,
+                 inner: BaseLLMProvider,
+                 embedder: Callable[[str], Any],
+                 threshold: float = 0.92,
+                 ttl: float = 600.0,
+                 max_entries: int = 1000,
+                 max_namespaces: int = 256):
+        super().__init__({})
+        self.inner = inner
+        self.embedder = embedder
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_namespaces = max_namespaces
+
+        self._namespaces: "OrderedDict[str, _Namespace]" = OrderedDict()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.expired = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # BaseLLMProvider contract
+    # ------------------------------------------------------------------
+
+    def generate(self, prompt: str,
+                 context: Optional[List[Dict[str, str]]] = None,
+                 **kwargs) -> Dict[str, Any]:
+        lookup = self._lookup(prompt, context, kwargs)
+        if lookup is not None and lookup[0] is not None:
+            return lookup[0]
+        response = self.inner.generate(prompt, context, **kwargs)
+        self._store(lookup, response)
+        return response
+
+    async def agenerate(self, prompt: str,
+                        context: Optional[List[Dict[str, str]]] = None,
+                        **kwargs) -> Dict[str, Any]:
+        lookup = self._lookup(prompt, context, kwargs)
+        if lookup is not None and lookup[0] is not None:
+            return lookup[0]
+        response = await self.inner.agenerate(prompt, context, **kwargs)
+        self._store(lookup, response)
+        return response
+
+    async def astream(self, prompt: str,
+                      context: Optional[List[Dict[str, str]]] = None,
+                      **kwargs) -> AsyncIterator[str]:
+        lookup = self._lookup(prompt, context, kwargs)
+        if lookup is not None and lookup[0] is not None:
+            if lookup[0].get("text"):
+                yield lookup[0]["text"]
+            return
+
+        parts = []
+        async for chunk in self.inner.astream(prompt, context, **kwargs):
+            parts.append(chunk)
+            yield chunk
+        self._store(lookup, {"text": "".join(parts)})
+
+    def health_check(self) -> bool:
+        return self.inner.health_check()
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = sum(len(ns.entries) for ns in self._namespaces.values())
+            namespaces = len(self._namespaces)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "entries": entries,
+            "namespaces": namespaces,
+            "threshold": self.threshold,
+            **({"embeddings": self.embedder.stats()}
+               if hasattr(self.embedder, "stats") else {}),
+        }
+
+    def clear(self, tenant: Optional[str] = None):
+        """
+        Drop every namespace, or only those of one tenant.
+        """
+        with self._lock:
+            if tenant is None:
+                self._namespaces.clear()
+                return
+            prefix = f"{tenant}:"
+            for name in [n for n in self._namespaces if n.startswith(prefix)]:
+                del self._namespaces[name]
+
+    @staticmethod
+    def namespace_for(prompt: str, kwargs: Dict[str, Any]) -> str:
+        key_text = kwargs.get("semantic_key") or ""
+        template = prompt.replace(key_text, "\x00") if key_text else ""
+        params = {k: v for k, v in kwargs.items() if k not in HINT_KWARGS}
+        digest = hashlib.sha1(
+            json.dumps([template, params], sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        return f"{kwargs.get('tenant') or '_'}:{digest}"
+
+    def _lookup(self, prompt: str, context, kwargs):
+        """
+        (cached response | None, namespace, key text, vector), or None
+        when the call must bypass the cache.
+        """
+        if context or not prompt:
+            self.bypassed += 1
+            return None
+
+        name = self.namespace_for(prompt, kwargs)
+        text = kwargs.get("semantic_key") or prompt
+        vector = self.embedder(text)
+
+        with self._lock:
+            namespace = self._namespaces.get(name)
+            if namespace is not None:
+                self._namespaces.move_to_end(name)
+                hit = self._search(namespace, vector)
+                if hit is not None:
+                    self.hits += 1
+                    increment_metric("llm_semantic_cache_hit")
+                    return dict(hit, cached=True), name, text, vector
+
+        self.misses += 1
+        increment_metric("llm_semantic_cache_miss")
+        return None, name, text, vector
+
+    def _search(self, namespace: _Namespace, vector):
+        now = time.monotonic()
+        for score, item_id, metadata in namespace.index.store.search(vector, top_k=3):
+            if score < self.threshold:
+                break
+            if metadata["expires_at"] <= now:
+                continue
+            return metadata["response"]
+
+        # Purge expired entries from the front (oldest first)
+        while namespace.entries:
+            item_id, expires_at = next(iter(namespace.entries.items()))
+            if expires_at > now:
+                break
+            namespace.entries.popitem(last=False)
+            namespace.index.remove(item_id)
+            self.expired += 1
+        return None
+
+    def _store(self, lookup, response: Dict[str, Any]):
+        if lookup is None or not isinstance(response, dict) or not response.get("text"):
+            return
+        _, name, text, vector = lookup
+        item_id = str(next(self._ids))
+        expires_at = time.monotonic() + self.ttl
+        response = {k: v for k, v in response.items() if k != "cached"}
+
+        with self._lock:
+            namespace = self._namespaces.get(name)
+            if namespace is None:
+                namespace = self._namespaces[name] = _Namespace(self.embedder)
+                if len(self._namespaces) > self.max_namespaces:
+                    _, dropped = self._namespaces.popitem(last=False)
+                    self.evictions += len(dropped.entries)
+            else:
+                self._namespaces.move_to_end(name)
+
+            namespace.index.add_vector(item_id, vector,
+                                       {"response": response,
+                                        "expires_at": expires_at,
+                                        "text": text})
+            namespace.entries[item_id] = expires_at
+            while len(namespace.entries) > self.max_entries:
+                old_id, _ = namespace.entries.popitem(last=False)
+                namespace.index.remove(old_id)
+                self.evictions += 1
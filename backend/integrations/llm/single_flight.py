@@ -0,0 +1,157 @@
+"""
+Single-Flight LLM Calls
+-----------------------
+Collapses concurrent identical LLM calls into one upstream call.
+
+During broadcast campaigns hundreds of users send the same reply within
+seconds; every identical (model, prompt, context, params) call that
+arrives while one is already in flight waits for that call instead of
+issuing its own.
+
+- Async: the upstream call runs as its own task; every caller awaits it
+  through `asyncio.shield`, so one caller being cancelled never cancels
+  the others. The task is cancelled only when every caller has gone.
+- Sync: followers block on the leader's result (threads)
+- Errors are delivered to every waiter and never cached — the next call
+  after a failure goes upstream again
+- Each waiter gets its own copy of the response dict
+- Streaming calls pass straight through
+"""
+
+from typing import Dict, Any, List, Optional, AsyncIterator
+import asyncio
+import json
+import threading
+
+from integrations.llm import BaseLLMProvider
+from monitoring.metrics import increment_metric
+
+
+class _SyncCall:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(BaseLLMProvider):
+    """
+    Coalesces identical in-flight calls to `inner`.
+    """
+
+    layer_name = "single_flight"
+
+    def __init__(self, inner: BaseLLMProvider):
+        super().__init__({})
+        self.inner = inner
+        self._sync_calls: Dict[tuple, _SyncCall] = {}
+        self._async_calls: Dict[tuple, _AsyncCall] = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.upstream = 0
+        self.coalesced = 0
+
+    def key(self, prompt: str, context, kwargs: Dict[str, Any]) -> tuple:
+        params = {k: v for k, v in kwargs.items() if k != "semantic_key"}
+        return (getattr(self.inner, "model", None), prompt,
+                json.dumps([context, params], sort_keys=True, default=str))
+
+    # ------------------------------------------------------------------
+    # BaseLLMProvider contract
+    # ------------------------------------------------------------------
+
+    def generate(self, prompt: str,
+                 context: Optional[List[Dict[str, str]]] = None,
+                 **kwargs) -> Dict[str, Any]:
+        key = self.key(prompt, context, kwargs)
+        with self._lock:
+            self.calls += 1
+            call = self._sync_calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._sync_calls[key] = _SyncCall()
+                self.upstream += 1
+            else:
+                self._coalesce()
+
+        if leader:
+            try:
+                call.result = self.inner.generate(prompt, context, **kwargs)
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    self._sync_calls.pop(key, None)
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return dict(call.result)
+
+    async def agenerate(self, prompt: str,
+                        context: Optional[List[Dict[str, str]]] = None,
+                        **kwargs) -> Dict[str, Any]:
+        key = (id(asyncio.get_running_loop()),) + self.key(prompt, context, kwargs)
+        self.calls += 1
+
+        call = self._async_calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(self.inner.agenerate(prompt, context, **kwargs))
+            call = self._async_calls[key] = _AsyncCall(task)
+            task.add_done_callback(lambda _t: self._forget(key, call))
+            self.upstream += 1
+        else:
+            self._coalesce()
+
+        call.waiters += 1
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                call.task.cancel()  # last waiter gone — nobody needs it
+            raise
+        finally:
+            call.waiters -= 1
+        return dict(result)
+
+    async def astream(self, prompt: str,
+                      context: Optional[List[Dict[str, str]]] = None,
+                      **kwargs) -> AsyncIterator[str]:
+        async for chunk in self.inner.astream(prompt, context, **kwargs):
+            yield chunk
+
+    def health_check(self) -> bool:
+        return self.inner.health_check()
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _coalesce(self):
+        self.coalesced += 1
+        increment_metric("llm_calls_coalesced")
+
+    def _forget(self, key: tuple, call: _AsyncCall):
+        if self._async_calls.get(key) is call:
+            del self._async_calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "upstream": self.upstream,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._sync_calls) + len(self._async_calls),
+        }
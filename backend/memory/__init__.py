@@ -1,10 +1,20 @@
 from .vector_store import VectorStore
+from .persistent_store import PersistentVectorStore
+from .ann_index import IVFIndex, HNSWIndex, build_index
+from .embedding_cache import EmbeddingCache
+from .hashing_embedder import HashingEmbedder
 from .semantic_index import SemanticIndex
 from .episodic import EpisodicMemory
 from .memory_engine import MemoryEngine
 
 __all__ = [
     "VectorStore",
+    "PersistentVectorStore",
+    "IVFIndex",
+    "HNSWIndex",
+    "build_index",
+    "EmbeddingCache",
+    "HashingEmbedder",
     "SemanticIndex",
     "EpisodicMemory",
     "MemoryEngine",
@@ -0,0 +1,410 @@
+"""
+Approximate Nearest-Neighbour Indexes
+-------------------------------------
+Drop-in replacements for VectorStore when an exact O(N) scan per query
+gets too slow. Same API (add / add_many / remove / search / search_many,
+hits as (score, item_id, metadata)), plus save() / load().
+
+- IVFIndex: inverted-file index in pure NumPy. Vectors are bucketed by
+  their nearest of `nlist` spherical k-means centroids; a query scans only
+  the `nprobe` closest buckets. Trains itself once `train_size` vectors
+  have been added (exact scan until then); later inserts are assigned
+  incrementally. Raise `nprobe` for recall, lower it for latency.
+- HNSWIndex: graph index backed by `hnswlib` (optional dependency).
+  Incremental inserts; `ef` trades recall for latency at query time.
+
+Removes are tombstones; IVFIndex compacts once half of its rows are dead.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+import json
+import os
+
+import numpy as np
+
+from .vector_store import VectorStore, SearchHit, normalize, top_k_indices
+from .persistent_store import PersistentVectorStore
+
+try:
+    import hnswlib
+except ImportError:  # optional dependency
+    hnswlib = None
+
+
+class IVFIndex:
+    """
+    Inverted-file (k-means bucketed) cosine index.
+    """
+
+    def __init__(self,
+                 dim: Optional[int] = None,
+                 nlist: int = 256,
+                 nprobe: int = 8,
+                 train_size: Optional[int] = None,
+                 kmeans_iters: int = 10,
+                 seed: int = 0):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size or nlist * 16
+        self.kmeans_iters = kmeans_iters
+        self.seed = seed
+
+        self._matrix: Optional[np.ndarray] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._deleted = 0
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self._rows: Dict[str, List[int]] = {}
+
+        self.centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._lists: List[List[int]] = []
+        self._list_cache: Dict[int, np.ndarray] = {}
+
+    def __len__(self):
+        return self._size - self._deleted
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(self, item_id: str, vector: Sequence[float], metadata: dict = None):
+        self.add_many([item_id], [vector], [metadata])
+
+    def add_many(self, item_ids: Sequence[str], vectors,
+                 metadatas: Optional[Sequence[dict]] = None):
+        vectors = normalize(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        if len(item_ids) != len(vectors):
+            raise ValueError("item_ids and vectors differ in length")
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dim {self.dim}, got {vectors.shape[1]}")
+
+        start, end = self._size, self._size + len(vectors)
+        self._reserve(end)
+        self._matrix[start:end] = vectors
+        self._alive[start:end] = True
+        self._size = end
+        metadatas = metadatas or [None] * len(item_ids)
+        for row, (item_id, meta) in enumerate(zip(item_ids, metadatas), start):
+            self.ids.append(item_id)
+            self.metadata.append(meta or {})
+            self._rows.setdefault(item_id, []).append(row)
+
+        if self.trained:
+            self._assign_rows(np.arange(start, end))
+        elif len(self) >= self.train_size:
+            self.train()
+
+    def remove(self, item_id: str):
+        rows = self._rows.pop(item_id, None)
+        if not rows:
+            return
+        self._alive[rows] = False
+        self._deleted += len(rows)
+        if self._deleted > self._size // 2:
+            self._compact()
+
+    def train(self):
+        """
+        (Re)fit the centroids on the live vectors and rebuild the buckets.
+        """
+        live = np.flatnonzero(self._alive[:self._size])
+        if not len(live):
+            return
+        rng = np.random.default_rng(self.seed)
+        sample = self._matrix[rng.choice(live, min(len(live), self.nlist * 64),
+                                         replace=False)]
+        k = min(self.nlist, len(sample))
+        centroids = sample[rng.choice(len(sample), k, replace=False)].copy()
+
+        # Spherical k-means: assign by dot product, centroids re-normalized
+        for _ in range(self.kmeans_iters):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=k)
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = normalize(sums)
+
+        self.centroids = centroids
+        self._assign = np.full(len(self._matrix), -1, dtype=np.int32)
+        self._lists = [[] for _ in range(k)]
+        self._list_cache.clear()
+        self._assign_rows(live)
+
+    def _assign_rows(self, rows: np.ndarray):
+        for offset in range(0, len(rows), 65536):
+            chunk = rows[offset:offset + 65536]
+            labels = np.argmax(self._matrix[chunk] @ self.centroids.T, axis=1)
+            self._assign[chunk] = labels
+            for row, label in zip(chunk.tolist(), labels.tolist()):
+                self._lists[label].append(row)
+                self._list_cache.pop(label, None)
+
+    def _reserve(self, size: int):
+        if self._matrix is not None and size <= len(self._matrix):
+            return
+        capacity = max(size, 1024,
+                       2 * (len(self._matrix) if self._matrix is not None else 0))
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        alive = np.zeros(capacity, dtype=bool)
+        assign = np.full(capacity, -1, dtype=np.int32)
+        if self._matrix is not None:
+            matrix[:self._size] = self._matrix[:self._size]
+            alive[:self._size] = self._alive[:self._size]
+            assign[:self._size] = self._assign[:self._size]
+        self._matrix, self._alive, self._assign = matrix, alive, assign
+
+    def _compact(self):
+        live = np.flatnonzero(self._alive[:self._size])
+        self._matrix[:len(live)] = self._matrix[live]
+        self._assign[:len(live)] = self._assign[live]
+        self._alive[:] = False
+        self._alive[:len(live)] = True
+        self.ids = [self.ids[i] for i in live]
+        self.metadata = [self.metadata[i] for i in live]
+        self._size, self._deleted = len(live), 0
+
+        self._rows = {}
+        for row, item_id in enumerate(self.ids):
+            self._rows.setdefault(item_id, []).append(row)
+        if self.trained:
+            self._lists = [[] for _ in range(len(self.centroids))]
+            for row, label in enumerate(self._assign[:self._size].tolist()):
+                self._lists[label].append(row)
+            self._list_cache.clear()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def search(self, query_vector: Sequence[float], top_k: int = 3) -> List[SearchHit]:
+        return self.search_many([query_vector], top_k)[0]
+
+    def search_many(self, query_vectors, top_k: int = 3) -> List[List[SearchHit]]:
+        queries = normalize(np.atleast_2d(np.asarray(query_vectors, dtype=np.float32)))
+        if not len(self):
+            return [[] for _ in range(len(queries))]
+
+        if not self.trained:
+            live = np.flatnonzero(self._alive[:self._size])
+            scores = queries @ self._matrix[live].T
+            best = top_k_indices(scores, top_k)
+            return [[self._hit(live[i], scores[q, i]) for i in row]
+                    for q, row in enumerate(best)]
+
+        probes = top_k_indices(queries @ self.centroids.T, self.nprobe)
+        results = []
+        for query, lists in zip(queries, probes):
+            rows = np.concatenate([self._bucket(label) for label in lists.tolist()])
+            rows = rows[self._alive[rows]]
+            scores = self._matrix[rows] @ query
+            results.append([self._hit(rows[i], scores[i])
+                            for i in top_k_indices(scores, top_k)])
+        return results
+
+    def _bucket(self, label: int) -> np.ndarray:
+        rows = self._list_cache.get(label)
+        if rows is None:
+            rows = self._list_cache[label] = np.asarray(self._lists[label], dtype=np.int64)
+        return rows
+
+    def _hit(self, row: int, score: float) -> SearchHit:
+        return float(score), self.ids[row], self.metadata[row]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        if self._deleted:
+            self._compact()
+        state = {
+            "dim": self.dim, "nlist": self.nlist, "nprobe": self.nprobe,
+            "train_size": self.train_size, "kmeans_iters": self.kmeans_iters,
+            "seed": self.seed, "ids": self.ids, "metadata": self.metadata,
+        }
+        with open(path, "wb") as f:
+            np.savez(f,
+                     matrix=self._matrix[:self._size] if self._size else np.zeros((0, 0)),
+                     assign=self._assign[:self._size],
+                     centroids=self.centroids if self.trained else np.zeros((0, 0)),
+                     state=np.array(json.dumps(state)))
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        with np.load(path) as data:
+            state = json.loads(str(data["state"]))
+            index = cls(dim=state["dim"], nlist=state["nlist"], nprobe=state["nprobe"],
+                        train_size=state["train_size"],
+                        kmeans_iters=state["kmeans_iters"], seed=state["seed"])
+            size = len(state["ids"])
+            if size:
+                index._reserve(size)
+                index._matrix[:size] = data["matrix"]
+                index._alive[:size] = True
+                index._assign[:size] = data["assign"]
+            if data["centroids"].size:
+                index.centroids = data["centroids"].astype(np.float32)
+        index._size = size
+        index.ids = state["ids"]
+        index.metadata = state["metadata"]
+        for row, item_id in enumerate(index.ids):
+            index._rows.setdefault(item_id, []).append(row)
+        if index.trained:
+            index._lists = [[] for _ in range(len(index.centroids))]
+            for row, label in enumerate(index._assign[:size].tolist()):
+                index._lists[label].append(row)
+        return index
+
+
+class HNSWIndex:
+    """
+    Hierarchical navigable small-world graph index (hnswlib).
+    """
+
+    def __init__(self,
+                 dim: Optional[int] = None,
+                 M: int = 16,
+                 ef_construction: int = 200,
+                 ef: int = 64,
+                 capacity: int = 1024):
+        if hnswlib is None:
+            raise ImportError("HNSWIndex requires the 'hnswlib' package")
+        self.dim = dim
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef = ef
+        self._initial_capacity = capacity
+        self._index = None
+        self._dead: set = set()
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self._rows: Dict[str, List[int]] = {}
+
+    def __len__(self):
+        return len(self.ids) - len(self._dead)
+
+    def _create(self, capacity: int):
+        self._index = hnswlib.Index(space="ip", dim=self.dim)
+        self._index.init_index(max_elements=capacity, M=self.M,
+                               ef_construction=self.ef_construction)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(self, item_id: str, vector: Sequence[float], metadata: dict = None):
+        self.add_many([item_id], [vector], [metadata])
+
+    def add_many(self, item_ids: Sequence[str], vectors,
+                 metadatas: Optional[Sequence[dict]] = None):
+        vectors = normalize(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        if len(item_ids) != len(vectors):
+            raise ValueError("item_ids and vectors differ in length")
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dim {self.dim}, got {vectors.shape[1]}")
+
+        start = len(self.ids)
+        if self._index is None:
+            self._create(max(self._initial_capacity, len(vectors)))
+        capacity = self._index.get_max_elements()
+        if start + len(vectors) > capacity:
+            self._index.resize_index(max(start + len(vectors), 2 * capacity))
+        self._index.add_items(vectors, np.arange(start, start + len(vectors)))
+
+        metadatas = metadatas or [None] * len(item_ids)
+        for row, (item_id, meta) in enumerate(zip(item_ids, metadatas), start):
+            self.ids.append(item_id)
+            self.metadata.append(meta or {})
+            self._rows.setdefault(item_id, []).append(row)
+
+    def remove(self, item_id: str):
+        for row in self._rows.pop(item_id, []):
+            self._index.mark_deleted(row)
+            self._dead.add(row)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def search(self, query_vector: Sequence[float], top_k: int = 3) -> List[SearchHit]:
+        return self.search_many([query_vector], top_k)[0]
+
+    def search_many(self, query_vectors, top_k: int = 3) -> List[List[SearchHit]]:
+        queries = normalize(np.atleast_2d(np.asarray(query_vectors, dtype=np.float32)))
+        k = min(top_k, len(self))
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        self._index.set_ef(max(self.ef, k))
+        labels, distances = self._index.knn_query(queries, k=k)
+        # "ip" distance is 1 - dot product
+        return [[(float(1.0 - d), self.ids[label], self.metadata[label])
+                 for label, d in zip(row_labels.tolist(), row_distances.tolist())]
+                for row_labels, row_distances in zip(labels, distances)]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """
+        Writes the graph to `path` and ids / metadata to `path`.meta.json.
+        """
+        state = {
+            "dim": self.dim, "M": self.M, "ef_construction": self.ef_construction,
+            "ef": self.ef, "ids": self.ids, "metadata": self.metadata,
+            "deleted": sorted(self._dead),
+        }
+        if self._index is not None:
+            self._index.save_index(path)
+        with open(path + ".meta.json", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path: str) -> "HNSWIndex":
+        with open(path + ".meta.json", encoding="utf-8") as f:
+            state = json.load(f)
+        index = cls(dim=state["dim"], M=state["M"],
+                    ef_construction=state["ef_construction"], ef=state["ef"])
+        index.ids = state["ids"]
+        index.metadata = state["metadata"]
+        index._dead = set(state["deleted"])
+        for row, item_id in enumerate(index.ids):
+            if row not in index._dead:
+                index._rows.setdefault(item_id, []).append(row)
+        if os.path.exists(path) and index.ids:
+            index._index = hnswlib.Index(space="ip", dim=index.dim)
+            index._index.load_index(path, max_elements=max(len(index.ids),
+                                                           index._initial_capacity))
+        return index
+
+
+INDEX_TYPES = {
+    "exact": VectorStore,
+    "persistent": PersistentVectorStore,
+    "ivf": IVFIndex,
+    "hnsw": HNSWIndex,
+}
+
+
+def build_index(kind: str = "exact", **params):
+    """
+    Create an index by name: "exact", "persistent" (needs `path`),
+    "ivf" or "hnsw".
+    """
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Unknown vector index type: {kind}")
+    return INDEX_TYPES[kind](**params)
@@ -0,0 +1,192 @@
+"""
+Embedding Cache
+---------------
+Content-hash keyed cache in front of an embedder.
+
+- Key: blake2b of (namespace, text); the namespace defaults to the
+  embedder's name so a different model never reuses stale vectors
+- Tier 1: in-memory LRU of float32 vectors (`max_entries`)
+- Tier 2 (optional): SQLite file at `disk_path`, shared by restarts and
+  by every worker on the host; disk hits are promoted to memory
+- Misses are deduplicated and embedded in batches of `batch_size`, using
+  the embedder's `embed_many(texts)` when it has one
+- The cache is itself an embedder: `cache(text)` / `cache.embed_many(texts)`
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+logger = logging.getLogger("EmbeddingCache")
+
+
+def embed_batches(embedder: Callable, texts: Sequence[str],
+                  batch_size: int = 64) -> np.ndarray:
+    """
+    Embed `texts` in chunks, with `embedder.embed_many` when available.
+    """
+    embed_many = getattr(embedder, "embed_many", None)
+    chunks = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        if embed_many is not None:
+            chunks.append(np.asarray(embed_many(batch), dtype=np.float32))
+        else:
+            chunks.append(np.asarray([embedder(text) for text in batch], dtype=np.float32))
+    if not chunks:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.concatenate(chunks)
+
+
+class EmbeddingCache:
+    """
+    LRU (+ optional SQLite) cache of text → vector.
+    """
+
+    def __init__(self,
+                 embedder: Callable[[str], Any],
+                 max_entries: int = 10_000,
+                 batch_size: int = 64,
+                 disk_path: Optional[str] = None,
+                 namespace: Optional[str] = None):
+        self.embedder = embedder
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.disk_path = disk_path
+        self.namespace = namespace or getattr(
+            embedder, "name", getattr(embedder, "__qualname__", type(embedder).__name__))
+
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if disk_path:
+            self._open_disk()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.batches = 0
+
+    # ------------------------------------------------------------------
+    # Embedder interface
+    # ------------------------------------------------------------------
+
+    def __call__(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        keys = [self._key(text) for text in texts]
+        found: Dict[bytes, np.ndarray] = {}
+
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            self.hits += sum(1 for key in keys if key in found)
+
+        missing = list(dict.fromkeys(k for k in keys if k not in found))
+        if missing and self._conn is not None:
+            from_disk = self._disk_get(missing)
+            self.disk_hits += sum(1 for key in keys if key in from_disk)
+            found.update(from_disk)
+            self._remember(from_disk)
+            missing = [key for key in missing if key not in from_disk]
+
+        if missing:
+            texts_by_key = dict(zip(keys, texts))
+            vectors = embed_batches(self.embedder, [texts_by_key[k] for k in missing],
+                                    self.batch_size)
+            self.batches += -(-len(missing) // self.batch_size)
+            self.misses += sum(1 for key in keys if key not in found)
+            computed = dict(zip(missing, vectors))
+            found.update(computed)
+            self._remember(computed)
+            if self._conn is not None:
+                self._disk_put(computed)
+
+        return np.stack([found[key] for key in keys]) if keys \
+            else np.zeros((0, 0), dtype=np.float32)
+
+    # ------------------------------------------------------------------
+    # Tiers
+    # ------------------------------------------------------------------
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.blake2b(f"{self.namespace}\x00{text}".encode(),
+                               digest_size=16).digest()
+
+    def _remember(self, vectors: Dict[bytes, np.ndarray]):
+        with self._lock:
+            for key, vector in vectors.items():
+                self._memory[key] = vector
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _open_disk(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.disk_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.disk_path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings "
+                           "(key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+        self._disk_lock = threading.Lock()
+
+    def _disk_get(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        found = {}
+        try:
+            with self._disk_lock:
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN "
+                        f"({','.join('?' * len(chunk))})", chunk).fetchall()
+                    for key, blob in rows:
+                        found[bytes(key)] = np.frombuffer(blob, dtype=np.float32)
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+        return found
+
+    def _disk_put(self, vectors: Dict[bytes, np.ndarray]):
+        try:
+            with self._disk_lock:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, np.asarray(vector, dtype=np.float32).tobytes())
+                     for key, vector in vectors.items()])
+                self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "batches": self.batches,
+            "entries": len(self._memory),
+            "disk": self.disk_path,
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,118 @@
+"""
+Hashing Embedder
+----------------
+Built-in CPU embedder: no model download, no training required.
+
+- Features: character n-grams (default 3–5) of the lowercased UTF-8
+  text, padded with spaces so word starts / ends are features too
+- Hashed: every n-gram is hashed (polynomial rolling hash + splitmix64
+  finalizer) into `dim` signed buckets (the "hashing trick", a sparse
+  random projection), so the output size is fixed
+- TF-IDF-like: sublinear term frequency (log1p), optional IDF weights
+  learned with `fit(corpus)`; rows are L2-normalized
+- Vectorized: a whole batch is hashed with a few NumPy passes over one
+  concatenated byte array
+- Deterministic: the same text gives the same vector in every process,
+  worker and restart (no Python `hash()` salt involved)
+"""
+
+from typing import Optional, Sequence, Tuple
+import zlib
+
+import numpy as np
+
+_MULTIPLIER = np.uint64(0x100000001B3)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    h = h ^ (h >> np.uint64(30))
+    h = h * _MIX1
+    h = h ^ (h >> np.uint64(27))
+    h = h * _MIX2
+    return h ^ (h >> np.uint64(31))
+
+
+class HashingEmbedder:
+    """
+    Hashed character n-gram embedder.
+    """
+
+    def __init__(self,
+                 dim: int = 256,
+                 ngram_range: Tuple[int, int] = (3, 5),
+                 n_features: int = 1 << 20,
+                 seed: int = 0):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.n_features = n_features
+        self.seed = seed
+        self.idf: Optional[np.ndarray] = None
+        self.name = f"hashing-{dim}-{ngram_range[0]}{ngram_range[1]}-{seed}"
+
+    def __call__(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+
+        rows, hashes = self._ngrams(texts)
+        buckets = (hashes % np.uint64(self.dim)).astype(np.int64)
+        weights = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+        if self.idf is not None:
+            weights *= self.idf[self._features(hashes)]
+
+        counts = np.bincount(rows * self.dim + buckets, weights=weights,
+                             minlength=len(texts) * self.dim)
+        vectors = counts.reshape(len(texts), self.dim)
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32)
+
+    def fit(self, corpus: Sequence[str]) -> "HashingEmbedder":
+        """
+        Learn smoothed IDF weights over the hashed n-gram features.
+        """
+        corpus = list(corpus)
+        rows, hashes = self._ngrams(corpus)
+        pairs = np.unique(rows * self.n_features + self._features(hashes))
+        df = np.bincount(pairs % self.n_features, minlength=self.n_features)
+        self.idf = np.log((1 + len(corpus)) / (1 + df)) + 1.0
+        # Vectors change with the IDF: give cached embeddings a new namespace
+        self.name = f"{self.name.split('/')[0]}/idf-{zlib.crc32(self.idf.tobytes()):08x}"
+        return self
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _features(self, hashes: np.ndarray) -> np.ndarray:
+        return ((hashes >> np.uint64(32)) % np.uint64(self.n_features)).astype(np.int64)
+
+    def _ngrams(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (text row, 64-bit hash) of every n-gram in the batch.
+        """
+        joined = "\x00".join(f" {text.lower().replace(chr(0), ' ')} " for text in texts)
+        data = np.frombuffer(joined.encode("utf-8"), dtype=np.uint8)
+        separators = np.concatenate(([0], np.cumsum(data == 0)))
+
+        all_rows, all_hashes = [], []
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            count = len(data) - n + 1
+            if count <= 0:
+                continue
+            h = np.full(count, (self.seed << 8) + n, dtype=np.uint64)
+            for offset in range(n):
+                h = h * _MULTIPLIER + data[offset:offset + count].astype(np.uint64)
+            # Drop n-grams that span two texts
+            valid = separators[n:n + count] == separators[:count]
+            all_rows.append(separators[:count][valid])
+            all_hashes.append(_mix(h[valid]))
+        if not all_rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint64)
+        return np.concatenate(all_rows), np.concatenate(all_hashes)
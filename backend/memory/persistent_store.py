@@ -0,0 +1,511 @@
+"""
+Persistent Vector Store
+-----------------------
+Disk-backed VectorStore: survives restarts without re-embedding, and a
+restarted worker serves queries right after opening the directory.
+
+Layout of the store directory:
+    manifest.json              dim, live segment ids, deletes generation
+    seg-<id>.f32               append-only raw float32 rows (L2-normalized)
+    seg-<id>.jsonl             sidecar metadata log, one [id, metadata]
+                               line per row, in row order
+    deletes-<generation>.jsonl tombstones, {"d": [[segment, row], ...]}
+
+- Vectors and metadata are opened with mmap / pread: only line offsets
+  and a live-row mask are kept in the Python heap; ids and metadata are
+  read for the final top-k hits only
+- A segment holds `segment_rows` rows, then a new one is started
+- Deletes are tombstones; the id → rows index they need is built on the
+  first delete after a restart
+- Once `compact_ratio` of the rows are dead, a background thread rewrites
+  the sealed segments that hold tombstones with live rows only; switching
+  the manifest is the commit point
+- A row exists once both its vector and its metadata line are on disk;
+  a torn tail (crash mid-add) is truncated on open
+- Single writer: one process owns a directory
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from .vector_store import SearchHit, normalize, top_k_indices
+
+logger = logging.getLogger("PersistentVectorStore")
+
+MANIFEST = "manifest.json"
+
+
+def _grow(array: np.ndarray, size: int, fill) -> np.ndarray:
+    if size <= len(array):
+        return array
+    grown = np.full(max(size, 1024, 2 * len(array)), fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class _Segment:
+    """
+    One vector file + metadata file pair; only offsets and mask in heap.
+    """
+
+    def __init__(self, directory: str, segment_id: int, dim: int):
+        self.id = segment_id
+        self.dim = dim
+        self.path = os.path.join(directory, f"seg-{segment_id:06d}.f32")
+        self.meta_path = os.path.join(directory, f"seg-{segment_id:06d}.jsonl")
+        self.rows = 0
+        self.meta_size = 0
+        self.offsets = np.zeros(0, dtype=np.int64)  # row -> metadata line start
+        self.alive = np.zeros(0, dtype=bool)
+        self.dead = 0
+        self._map: Optional[np.ndarray] = None
+        # Held open so readers keep working after compaction unlinks the file
+        self._reader = None
+
+    def __len__(self):
+        return self.rows
+
+    def load(self):
+        """
+        Index metadata lines and drop a torn tail from either file.
+        """
+        row_bytes = self.dim * 4
+        for path in (self.path, self.meta_path):
+            if not os.path.exists(path):
+                open(path, "wb").close()
+        vector_rows = os.path.getsize(self.path) // row_bytes
+        meta_bytes = os.path.getsize(self.meta_path)
+        ends = np.zeros(0, dtype=np.int64)
+        if meta_bytes:
+            ends = np.flatnonzero(np.memmap(self.meta_path, dtype=np.uint8, mode="r") == 10)
+        self.rows = min(len(ends), vector_rows)
+        self.offsets = np.zeros(self.rows, dtype=np.int64)
+        if self.rows:
+            self.offsets[1:] = ends[:self.rows - 1] + 1
+            self.meta_size = int(ends[self.rows - 1] + 1)
+        self.alive = np.ones(self.rows, dtype=bool)
+
+        for path, size in ((self.path, self.rows * row_bytes),
+                           (self.meta_path, self.meta_size)):
+            if os.path.getsize(path) > size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+        self._open_reader()
+
+    def extend(self, line_lengths: Sequence[int]):
+        start, end = self.rows, self.rows + len(line_lengths)
+        self.offsets = _grow(self.offsets, end, 0)
+        self.alive = _grow(self.alive, end, False)
+        self.offsets[start:end] = self.meta_size + np.concatenate(
+            ([0], np.cumsum(line_lengths[:-1], dtype=np.int64)))
+        self.alive[start:end] = True
+        self.meta_size += int(sum(line_lengths))
+        self.rows = end
+        self._open_reader()
+
+    def vectors(self) -> Optional[np.ndarray]:
+        """
+        Read-only mmap over the committed rows (remapped when it grew).
+        """
+        rows = self.rows
+        if self._map is None or len(self._map) != rows:
+            self._map = np.memmap(self.path, dtype=np.float32, mode="r",
+                                  shape=(rows, self.dim)) if rows else None
+        return self._map
+
+    def line(self, row: int) -> bytes:
+        start = int(self.offsets[row])
+        end = int(self.offsets[row + 1]) if row + 1 < self.rows else self.meta_size
+        self._open_reader()
+        return os.pread(self._reader.fileno(), end - start, start)
+
+    def entry(self, row: int) -> Tuple[str, Dict[str, Any]]:
+        item_id, metadata = json.loads(self.line(row))
+        return item_id, metadata
+
+    def _open_reader(self):
+        if self._reader is None:
+            self._reader = open(self.meta_path, "rb")
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        self._map = None
+
+
+class PersistentVectorStore:
+    """
+    mmap-backed, append-only vector store with the VectorStore API.
+    """
+
+    def __init__(self,
+                 path: str,
+                 dim: Optional[int] = None,
+                 segment_rows: int = 65536,
+                 compact_ratio: float = 0.3,
+                 fsync: bool = False):
+        self.path = path
+        self.dim = dim
+        self.segment_rows = segment_rows
+        self.compact_ratio = compact_ratio
+        self.fsync = fsync
+
+        self._segments: List[_Segment] = []
+        # id -> [(segment, row)]; None until needed after a restart
+        self._locations: Optional[Dict[str, List[Tuple[_Segment, int]]]] = {}
+        self._generation = 0
+        self._next_segment = 0
+        self._live = 0
+        self._dead = 0
+        self._lock = threading.RLock()
+        self._compactor: Optional[threading.Thread] = None
+        self._vector_file = None
+        self._meta_file = None
+        self._deletes_file = None
+
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(self._file(MANIFEST)):
+            self._open()
+
+    def __len__(self):
+        return self._live
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _deletes_path(self, generation: int) -> str:
+        return self._file(f"deletes-{generation:06d}.jsonl")
+
+    # ------------------------------------------------------------------
+    # Open / manifest
+    # ------------------------------------------------------------------
+
+    def _open(self):
+        with open(self._file(MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.dim = manifest["dim"]
+        self._generation = manifest["generation"]
+        self._next_segment = manifest["next_segment"]
+        by_id = {}
+        for segment_id in manifest["segments"]:
+            segment = _Segment(self.path, segment_id, self.dim)
+            segment.load()
+            self._segments.append(segment)
+            by_id[segment_id] = segment
+            self._live += segment.rows
+
+        deletes_path = self._deletes_path(self._generation)
+        if os.path.exists(deletes_path):
+            size = 0
+            with open(deletes_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn last line
+                    size += len(line)
+                    self._tombstone([(by_id[s], row) for s, row in json.loads(line)["d"]
+                                     if s in by_id and row < by_id[s].rows])
+            if os.path.getsize(deletes_path) > size:
+                with open(deletes_path, "r+b") as f:
+                    f.truncate(size)
+
+        self._locations = None
+        self._remove_stray_files()
+        logger.info(f"Opened {self.path}: {self._live} vectors, "
+                    f"{len(self._segments)} segments")
+
+    def _write_manifest(self):
+        manifest = {
+            "dim": self.dim,
+            "generation": self._generation,
+            "next_segment": self._next_segment,
+            "segments": [segment.id for segment in self._segments],
+        }
+        tmp = self._file(MANIFEST + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file(MANIFEST))
+
+    def _remove_stray_files(self):
+        keep = {os.path.basename(self._deletes_path(self._generation))}
+        for segment in self._segments:
+            keep.add(os.path.basename(segment.path))
+            keep.add(os.path.basename(segment.meta_path))
+        for name in os.listdir(self.path):
+            if (name.startswith(("seg-", "deletes-")) and name not in keep) \
+                    or name.endswith(".tmp"):
+                os.remove(self._file(name))
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(self, item_id: str, vector: Sequence[float], metadata: dict = None):
+        self.add_many([item_id], [vector], [metadata])
+
+    def add_many(self, item_ids: Sequence[str], vectors,
+                 metadatas: Optional[Sequence[dict]] = None):
+        vectors = normalize(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        if len(item_ids) != len(vectors):
+            raise ValueError("item_ids and vectors differ in length")
+        metadatas = metadatas or [None] * len(item_ids)
+        lines = [(json.dumps([item_id, metadata or {}], ensure_ascii=False,
+                             separators=(",", ":")) + "\n").encode()
+                 for item_id, metadata in zip(item_ids, metadatas)]
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected vectors of dim {self.dim}, got {vectors.shape[1]}")
+
+            offset = 0
+            while offset < len(vectors):
+                segment = self._active_segment()
+                take = min(len(vectors) - offset, self.segment_rows - segment.rows)
+                chunk = lines[offset:offset + take]
+                # Vector first: a row counts once its metadata line exists
+                self._vector_file.write(vectors[offset:offset + take].tobytes())
+                self._vector_file.flush()
+                self._meta_file.write(b"".join(chunk))
+                self._meta_file.flush()
+                if self.fsync:
+                    os.fsync(self._vector_file.fileno())
+                    os.fsync(self._meta_file.fileno())
+
+                first_row = segment.rows
+                segment.extend([len(line) for line in chunk])
+                if self._locations is not None:
+                    for row, item_id in enumerate(item_ids[offset:offset + take], first_row):
+                        self._locations.setdefault(item_id, []).append((segment, row))
+                self._live += take
+                offset += take
+
+    def remove(self, item_id: str):
+        with self._lock:
+            locations = self._id_index().pop(item_id, None)
+            if not locations:
+                return
+            self._log_deletes([[segment.id, row] for segment, row in locations])
+            self._tombstone(locations)
+            if self._dead > self.compact_ratio * (self._live + self._dead):
+                self.compact(background=True)
+
+    def _tombstone(self, locations: List[Tuple[_Segment, int]]):
+        for segment, row in locations:
+            if segment.alive[row]:
+                segment.alive[row] = False
+                segment.dead += 1
+                self._live -= 1
+                self._dead += 1
+
+    def _id_index(self) -> Dict[str, List[Tuple[_Segment, int]]]:
+        if self._locations is None:
+            locations: Dict[str, List[Tuple[_Segment, int]]] = {}
+            for segment in self._segments:
+                if not segment.rows:
+                    continue
+                with open(segment.meta_path, "rb") as f:
+                    for row, line in enumerate(f):
+                        if row >= segment.rows:
+                            break
+                        if segment.alive[row]:
+                            locations.setdefault(json.loads(line)[0], []).append((segment, row))
+            self._locations = locations
+        return self._locations
+
+    def _active_segment(self) -> _Segment:
+        segment = self._segments[-1] if self._segments else None
+        if segment is None or segment.rows >= self.segment_rows:
+            segment = _Segment(self.path, self._next_segment, self.dim)
+            self._next_segment += 1
+            self._segments.append(segment)
+            self._close_writers()
+            self._write_manifest()
+        if self._vector_file is None:
+            self._vector_file = open(segment.path, "ab")
+            self._meta_file = open(segment.meta_path, "ab")
+        return segment
+
+    def _log_deletes(self, rows: List[List[int]]):
+        if self._deletes_file is None:
+            self._deletes_file = open(self._deletes_path(self._generation), "a",
+                                      encoding="utf-8")
+        self._deletes_file.write(json.dumps({"d": rows}, separators=(",", ":")) + "\n")
+        self._deletes_file.flush()
+        if self.fsync:
+            os.fsync(self._deletes_file.fileno())
+
+    def _close_writers(self):
+        for handle in (self._vector_file, self._meta_file):
+            if handle is not None:
+                handle.close()
+        self._vector_file = self._meta_file = None
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def compact(self, background: bool = False):
+        """
+        Rewrite sealed segments that hold tombstones, keeping live rows.
+        """
+        with self._lock:
+            running = self._compactor
+            if running is not None and not running.is_alive():
+                running = None
+            if background:
+                if running is None:
+                    self._compactor = threading.Thread(target=self._compact,
+                                                       name="vector-compactor",
+                                                       daemon=True)
+                    self._compactor.start()
+                return
+        if running is not None:
+            running.join()
+        self._compact()
+
+    def _compact(self):
+        try:
+            with self._lock:
+                # The active (last, not yet full) segment is left alone
+                sealed = self._segments if self._segments and \
+                    self._segments[-1].rows >= self.segment_rows else self._segments[:-1]
+                snapshots = [(s, s.alive[:s.rows].copy()) for s in sealed if s.dead]
+                first_id = self._next_segment
+                self._next_segment += len(snapshots)
+            if not snapshots:
+                return
+
+            # Copy live rows outside the lock; queries and appends continue
+            rewritten = []
+            for offset, (segment, alive) in enumerate(snapshots):
+                keep = np.flatnonzero(alive)
+                fresh = _Segment(self.path, first_id + offset, self.dim)
+                lines = [segment.line(row) for row in keep.tolist()]
+                ids = [json.loads(line)[0] for line in lines]
+                with open(fresh.path, "wb") as f:
+                    for start in range(0, len(keep), 65536):
+                        f.write(np.ascontiguousarray(
+                            segment.vectors()[keep[start:start + 65536]]).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(fresh.meta_path, "wb") as f:
+                    f.write(b"".join(lines))
+                    f.flush()
+                    os.fsync(f.fileno())
+                if lines:
+                    fresh.extend([len(line) for line in lines])
+                rewritten.append((segment, keep, ids, fresh))
+
+            with self._lock:
+                replaced = {}
+                for segment, keep, ids, fresh in rewritten:
+                    for new_row, row in enumerate(keep.tolist()):
+                        if not segment.alive[row]:  # deleted while copying
+                            fresh.alive[new_row] = False
+                            fresh.dead += 1
+                        elif self._locations is not None:
+                            rows = self._locations[ids[new_row]]
+                            rows[rows.index((segment, row))] = (fresh, new_row)
+                    self._dead -= segment.dead - fresh.dead
+                    replaced[segment.id] = fresh
+                if self._segments[-1].id in replaced:
+                    self._close_writers()
+                # Fully deleted segments disappear
+                self._segments = [replaced.get(s.id, s) for s in self._segments
+                                  if s.id not in replaced or replaced[s.id].rows]
+                self._switch_generation()
+                self._write_manifest()
+                self._remove_stray_files()
+                logger.info(f"Compacted {len(rewritten)} segments of {self.path}")
+        except Exception as e:
+            logger.error(f"Vector store compaction failed: {e}")
+
+    def _switch_generation(self):
+        """
+        Start a new deletes log holding the surviving tombstones only.
+        """
+        self._generation += 1
+        with open(self._deletes_path(self._generation), "w", encoding="utf-8") as f:
+            for segment in self._segments:
+                dead = np.flatnonzero(~segment.alive[:segment.rows]).tolist()
+                if dead:
+                    f.write(json.dumps({"d": [[segment.id, row] for row in dead]},
+                                       separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if self._deletes_file is not None:
+            self._deletes_file.close()
+            self._deletes_file = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def search(self, query_vector: Sequence[float], top_k: int = 3) -> List[SearchHit]:
+        return self.search_many([query_vector], top_k)[0]
+
+    def search_many(self, query_vectors, top_k: int = 3) -> List[List[SearchHit]]:
+        queries = normalize(np.atleast_2d(np.asarray(query_vectors, dtype=np.float32)))
+        with self._lock:
+            segments = [(s, s.vectors(), s.alive[:s.rows].copy())
+                        for s in self._segments if s.rows > s.dead]
+        if not segments:
+            return [[] for _ in range(len(queries))]
+
+        # Top-k per segment, then top-k of the merged candidates
+        scores, rows, owners = [], [], []
+        for index, (_, vectors, alive) in enumerate(segments):
+            segment_scores = queries @ vectors.T
+            segment_scores[:, ~alive] = -np.inf
+            best = top_k_indices(segment_scores, top_k)
+            scores.append(np.take_along_axis(segment_scores, best, axis=1))
+            rows.append(best)
+            owners.append(np.full(best.shape, index))
+        scores = np.concatenate(scores, axis=1)
+        rows = np.concatenate(rows, axis=1)
+        owners = np.concatenate(owners, axis=1)
+
+        results = []
+        for q, best in enumerate(top_k_indices(scores, top_k)):
+            hits = []
+            for i in best.tolist():
+                if scores[q, i] == -np.inf:
+                    break
+                item_id, metadata = segments[owners[q, i]][0].entry(int(rows[q, i]))
+                hits.append((float(scores[q, i]), item_id, metadata))
+            results.append(hits)
+        return results
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "vectors": self._live,
+            "tombstones": self._dead,
+            "segments": len(self._segments),
+            "generation": self._generation,
+        }
+
+    def close(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            self._close_writers()
+            if self._deletes_file is not None:
+                self._deletes_file.close()
+                self._deletes_file = None
+            for segment in self._segments:
+                segment.close()
@@ -1,19 +1,73 @@
+from typing import List, Optional, Sequence
+
 from .vector_store import VectorStore
+from .embedding_cache import embed_batches
+from .hashing_embedder import HashingEmbedder
 
 
 class SemanticIndex:
     """
     Semantic memory for meanings, concepts, facts.
+
+    `store` is any index with the VectorStore API: the exact VectorStore
+    (default) or an approximate one from memory.ann_index. Batch calls
+    embed `batch_size` texts per embedder call (wrap the embedder in an
+    EmbeddingCache to skip texts seen before). Without an embedder the
+    built-in HashingEmbedder is used.
     """
 
-    def __init__(self, embedder):
-        self.embedder = embedder
-        self.store = VectorStore()
+    def __init__(self, embedder=None, store=None, batch_size: int = 64):
+        self.embedder = embedder if embedder is not None else HashingEmbedder()
+        self.store = store if store is not None else VectorStore()
+        self.batch_size = batch_size
 
-    def add_text(self, text: str, metadata: dict = None):
+    def add_text(self, text: str, metadata: dict = None, item_id: str = None):
         vector = self.embedder(text)
-        self.store.add(text, vector, metadata)
+        self.store.add(item_id or text, vector, metadata)
+
+    def add_texts(self, texts: Sequence[str],
+                  metadatas: Optional[Sequence[dict]] = None,
+                  item_ids: Optional[Sequence[str]] = None):
+        texts = list(texts)
+        item_ids = list(item_ids) if item_ids is not None else texts
+        metadatas = list(metadatas) if metadatas is not None else [None] * len(texts)
+        for start in range(0, len(texts), self.batch_size):
+            end = start + self.batch_size
+            vectors = embed_batches(self.embedder, texts[start:end], self.batch_size)
+            self.store.add_many(item_ids[start:end], vectors, metadatas[start:end])
+
+    def add_vector(self, item_id: str, vector, metadata: dict = None):
+        self.store.add(item_id, vector, metadata)
+
+    def remove(self, item_id: str):
+        self.store.remove(item_id)
 
     def query(self, text: str, top_k: int = 3):
         query_vector = self.embedder(text)
         return self.store.search(query_vector, top_k)
+
+    def query_many(self, texts: Sequence[str], top_k: int = 3) -> List[list]:
+        texts = list(texts)
+        if not texts:
+            return []
+        vectors = embed_batches(self.embedder, texts, self.batch_size)
+        return self.store.search_many(vectors, top_k)
+
+    def save(self, path: str):
+        if not hasattr(self.store, "save"):
+            raise TypeError(f"{type(self.store).__name__} cannot be saved")
+        self.store.save(path)
+
+    @classmethod
+    def load(cls, embedder, path: str, kind: str = "ivf") -> "SemanticIndex":
+        """
+        Reopen an index written by `save`; `kind` is one of the index
+        types with a `load` (ivf, hnsw).
+        """
+        from .ann_index import INDEX_TYPES
+        loadable = sorted(name for name, index_type in INDEX_TYPES.items()
+                          if hasattr(index_type, "load"))
+        if kind not in loadable:
+            raise ValueError(f"Cannot load a {kind!r} index (expected one of: "
+                             f"{', '.join(loadable)})")
+        return cls(embedder, INDEX_TYPES[kind].load(path))
@@ -1,28 +1,138 @@
-import math
+"""
+Vector Store
+------------
+In-memory vector store backed by a contiguous float32 matrix.
+
+- Vectors are L2-normalized once on insert, so cosine similarity is a
+  single matrix-vector product at query time
+- Top-k uses `argpartition` (O(N)) and only sorts the k winners
+- `search_many` scores a whole batch of queries in one matrix multiply
+- Storage grows by doubling, so inserts are amortized O(dim)
+
+Can be replaced later with FAISS / Milvus / Pinecone.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SearchHit = Tuple[float, str, Dict[str, Any]]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Row-wise L2 normalization (zero rows stay zero).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores per row, best first.
+    """
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    if k < n:
+        part = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        part = np.broadcast_to(np.arange(n), scores.shape[:-1] + (n,))
+    order = np.argsort(-np.take_along_axis(scores, part, axis=-1), axis=-1,
+                       kind="stable")
+    return np.take_along_axis(part, order, axis=-1)
 
 
 class VectorStore:
     """
     Simple in-memory vector store.
-    Can be replaced later with FAISS / Milvus / Pinecone.
     """
 
-    def __init__(self):
-        self.vectors = []  # [(id, vector, metadata)]
-
-    def add(self, item_id: str, vector: list[float], metadata: dict = None):
-        self.vectors.append((item_id, vector, metadata or {}))
-
-    def _cosine_similarity(self, v1, v2):
-        dot = sum(a * b for a, b in zip(v1, v2))
-        norm1 = math.sqrt(sum(a * a for a in v1))
-        norm2 = math.sqrt(sum(b * b for b in v2))
-        return dot / (norm1 * norm2 + 1e-8)
-
-    def search(self, query_vector: list[float], top_k: int = 3):
-        scored = []
-        for item_id, vector, metadata in self.vectors:
-            score = self._cosine_similarity(query_vector, vector)
-            scored.append((score, item_id, metadata))
-        scored.sort(reverse=True)
-        return scored[:top_k]
+    def __init__(self, dim: Optional[int] = None, capacity: int = 1024):
+        self.dim = dim
+        self._matrix: Optional[np.ndarray] = None
+        self._initial_capacity = capacity
+        self._size = 0
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        The normalized (N, dim) float32 matrix (a view, do not mutate).
+        """
+        if self._matrix is None:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return self._matrix[:self._size]
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(self, item_id: str, vector: Sequence[float], metadata: dict = None):
+        self.add_many([item_id], [vector], [metadata])
+
+    def add_many(self, item_ids: Sequence[str], vectors,
+                 metadatas: Optional[Sequence[dict]] = None):
+        vectors = normalize(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        if len(item_ids) != len(vectors):
+            raise ValueError("item_ids and vectors differ in length")
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dim {self.dim}, got {vectors.shape[1]}")
+
+        self._reserve(self._size + len(vectors))
+        self._matrix[self._size:self._size + len(vectors)] = vectors
+        self._size += len(vectors)
+        self.ids.extend(item_ids)
+        metadatas = metadatas or [None] * len(item_ids)
+        self.metadata.extend(m or {} for m in metadatas)
+
+    def remove(self, item_id: str):
+        keep = [i for i, existing in enumerate(self.ids) if existing != item_id]
+        if len(keep) == self._size:
+            return
+        self._matrix[:len(keep)] = self._matrix[keep]
+        self._size = len(keep)
+        self.ids = [self.ids[i] for i in keep]
+        self.metadata = [self.metadata[i] for i in keep]
+
+    def _reserve(self, size: int):
+        if self._matrix is not None and size <= len(self._matrix):
+            return
+        capacity = max(size, self._initial_capacity,
+                       2 * (len(self._matrix) if self._matrix is not None else 0))
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        if self._matrix is not None:
+            matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def search(self, query_vector: Sequence[float], top_k: int = 3) -> List[SearchHit]:
+        if not self._size:
+            return []
+        return self.search_many([query_vector], top_k)[0]
+
+    def search_many(self, query_vectors, top_k: int = 3) -> List[List[SearchHit]]:
+        """
+        Top-k hits for every query, scored in one matrix multiply.
+        """
+        queries = normalize(np.atleast_2d(np.asarray(query_vectors, dtype=np.float32)))
+        if not self._size:
+            return [[] for _ in range(len(queries))]
+
+        scores = queries @ self.matrix.T
+        best = top_k_indices(scores, top_k)
+        ids, metadata = self.ids, self.metadata
+        return [[(float(scores[q, i]), ids[i], metadata[i]) for i in row]
+                for q, row in enumerate(best)]
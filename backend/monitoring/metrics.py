@@ -37,3 +37,17 @@ def record_metric(name: str, value: float):
     Record a timing metric.
     """
     _metrics.record_time(name, value)
+
+
+def increment_metric(name: str, value: int = 1):
+    """
+    Increment a counter metric.
+    """
+    _metrics.increment(name, value)
+
+
+def metrics_snapshot():
+    """
+    Snapshot of every recorded counter and timing.
+    """
+    return _metrics.snapshot()
@@ -0,0 +1,141 @@
+"""
+LLM Provider Health Monitor
+---------------------------
+Background probing of every registered LLM provider.
+
+- Probes each provider every `interval` seconds (first round at start,
+  before user traffic arrives) via its async health check; for pooled
+  HTTP providers this also keeps keep-alive connections warm
+- Publishes per-provider latency / availability for /health
+- A provider is healthy only when its health check answers 2xx
+- After `down_after` consecutive failed probes a routed provider's
+  circuit breaker is tripped, so the router stops sending it traffic;
+  the next successful probe closes it again. The monitor only closes
+  breakers it tripped itself (and that real calls have not reopened
+  since): breakers opened by failed calls recover through the router's
+  half-open probe
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from integrations.llm import LLMRegistry
+from integrations.llm.router import LLMRouter
+from monitoring.metrics import increment_metric
+
+logger = logging.getLogger("ProviderHealthMonitor")
+
+
+class ProviderHealthMonitor:
+    """
+    Periodic async health prober for the active LLM provider chain.
+    """
+
+    def __init__(self, interval: float = 15.0, timeout: float = 5.0,
+                 down_after: int = 2):
+        self.interval = interval
+        self.timeout = timeout
+        self.down_after = down_after
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._tripped: Dict[str, float] = {}  # name -> breaker opened_at
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """
+        Start probing on the running event loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ------------------------------------------------------------------
+    # Probing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def targets() -> List[Tuple[str, Any, Any]]:
+        """
+        (name, provider, routed entry | None) for every provider behind
+        the active chain.
+        """
+        try:
+            provider = LLMRegistry.get()
+        except RuntimeError:
+            return []
+
+        node = provider
+        while node is not None and not isinstance(node, LLMRouter):
+            node = getattr(node, "inner", None)
+        if node is not None:
+            return [(e.name, e.provider, e) for e in node.providers]
+        return [(type(provider).__name__, provider, None)]
+
+    async def probe_all(self) -> Dict[str, Dict[str, Any]]:
+        targets = self.targets()
+        await asyncio.gather(*(self._probe(*t) for t in targets))
+        return self.snapshot()
+
+    async def _probe(self, name: str, provider, entry):
+        status = self._status.setdefault(name, {
+            "available": None, "latency_ms": None, "last_checked": None,
+            "consecutive_failures": 0, "last_error": None})
+
+        start = time.perf_counter()
+        error = None
+        try:
+            ok = await asyncio.wait_for(provider.ahealth_check(), self.timeout)
+        except asyncio.TimeoutError:
+            ok, error = False, "timeout"
+        except Exception as e:
+            ok, error = False, str(e) or type(e).__name__
+        if not ok and error is None:
+            error = "health check failed"
+
+        status["last_checked"] = round(time.time(), 3)
+        status["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+        if ok:
+            if status["available"] is False:
+                logger.info(f"LLM provider {name} is back up")
+            status.update(available=True, consecutive_failures=0, last_error=None)
+            opened_at = self._tripped.pop(name, None)
+            if entry is not None and opened_at is not None:
+                entry.breaker.untrip(opened_at)
+            return
+
+        status["consecutive_failures"] += 1
+        status["last_error"] = error
+        if status["consecutive_failures"] >= self.down_after:
+            if status["available"] is not False:
+                logger.warning(f"LLM provider {name} marked down: {error}")
+                increment_metric("llm_provider_down")
+            status["available"] = False
+            # Never take over a breaker that real failures opened
+            if entry is not None and (name in self._tripped
+                                      or entry.breaker.state == "closed"):
+                self._tripped[name] = entry.breaker.trip()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"Provider health probe failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dict(status) for name, status in self._status.items()}
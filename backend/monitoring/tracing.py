@@ -0,0 +1,201 @@
+"""
+Stage Tracing
+-------------
+Lightweight per-stage spans for the request pipeline.
+
+- Each span measures one stage (intent, dharma, workflow, ...) with a
+  monotonic clock
+- Durations feed fixed-bucket histograms keyed by (stage, workflow,
+  intent); workflow and intent are separate, optional labels
+- Spans are kept per trace_id (bounded) so a single request can be
+  inspected after the fact
+- When disabled, `span()` returns a shared no-op context manager
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+import bisect
+import threading
+import time
+
+from config.settings import TRACING_ENABLED, TRACING_MAX_TRACES
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500,
+              5000, 10000)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "stage", "trace_id", "workflow", "intent", "start")
+
+    def __init__(self, tracer, stage, trace_id, workflow, intent):
+        self.tracer = tracer
+        self.stage = stage
+        self.trace_id = trace_id
+        self.workflow = workflow
+        self.intent = intent
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.stage,
+                           time.perf_counter() - self.start,
+                           trace_id=self.trace_id,
+                           workflow=self.workflow,
+                           intent=self.intent,
+                           error=exc_type is not None)
+        return False
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram (milliseconds).
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def quantile(self, q: float) -> float:
+        """
+        q-th observation, linearly interpolated inside its bucket and
+        clamped to the observed max (never above max_ms).
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= target:
+                lower = BUCKETS_MS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+                upper = min(upper, self.max_ms)
+                lower = min(lower, upper)
+                value = lower + (upper - lower) * max(0.0, target - seen) / n
+                return round(value, 3)
+            seen += n
+        return round(self.max_ms, 3)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets_ms": {
+                str(bound): n for bound, n in zip(BUCKETS_MS + ("inf",),
+                                                  self.counts)
+            },
+        }
+
+
+class Tracer:
+    """
+    Collects stage spans, per-trace timelines and per-stage histograms.
+    """
+
+    def __init__(self, enabled: bool = True, max_traces: int = 1000):
+        self.enabled = enabled
+        self.max_traces = max_traces
+        self._histograms: Dict[tuple, Histogram] = {}
+        self._traces: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def span(self, stage: str, trace_id: Optional[str] = None,
+             workflow: Optional[str] = None,
+             intent: Optional[str] = None):
+        """
+        Context manager timing one pipeline stage.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, stage, trace_id, workflow, intent)
+
+    def record(self, stage: str, duration_sec: float,
+               trace_id: Optional[str] = None,
+               workflow: Optional[str] = None,
+               intent: Optional[str] = None,
+               error: bool = False):
+        if not self.enabled:
+            return
+
+        duration_ms = duration_sec * 1000
+        key = (stage, workflow or "*", intent or "*")
+
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(duration_ms)
+
+            if trace_id is None:
+                return
+
+            spans = self._traces.get(trace_id)
+            if spans is None:
+                spans = self._traces[trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            spans.append({
+                "stage": stage,
+                "workflow": workflow,
+                "intent": intent,
+                "duration_ms": round(duration_ms, 3),
+                "error": error,
+            })
+
+    def get_trace(self, trace_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            spans = self._traces.get(trace_id)
+            return list(spans) if spans is not None else None
+
+    def stage_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Histogram snapshots keyed "stage", "stage:workflow" and/or
+        "stage[intent=...]".
+        """
+        with self._lock:
+            items = list(self._histograms.items())
+        return {
+            self._label(stage, workflow, intent): h.snapshot()
+            for (stage, workflow, intent), h in sorted(items)
+        }
+
+    @staticmethod
+    def _label(stage: str, workflow: str, intent: str) -> str:
+        label = stage if workflow == "*" else f"{stage}:{workflow}"
+        return label if intent == "*" else f"{label}[intent={intent}]"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._traces.clear()
+
+
+tracer = Tracer(enabled=TRACING_ENABLED, max_traces=TRACING_MAX_TRACES)
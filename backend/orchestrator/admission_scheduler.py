@@ -0,0 +1,179 @@
+"""
+ChetnaOS — AdmissionScheduler
+-----------------------------
+Priority-driven admission control between /process and
+BrainRouterAdvanced.
+
+- Bounded worker pool: at most `max_workers` requests run at once
+- Priority queue: lower PriorityEngine score runs first (support=1 …
+  custom=6)
+- Aging: every `aging_sec` spent waiting is worth one priority level,
+  so low priorities still make progress under sustained load
+- Per-intent caps: an intent never holds more than its limit of slots
+  (e.g. a flood of "custom" chat cannot starve support tickets)
+
+Aging is linear for every waiter, so ordering by
+`enqueued_at + priority * aging_sec` is time-invariant and a plain heap
+stays valid.
+"""
+
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Callable, Awaitable
+import asyncio
+import heapq
+import itertools
+import time
+
+from monitoring.metrics import record_metric, increment_metric
+from monitoring.tracing import tracer
+
+
+class AdmissionRejected(RuntimeError):
+    """
+    Raised when the admission queue is full.
+    """
+
+
+class AdmissionScheduler:
+    """
+    Async priority admission scheduler with aging and per-intent caps.
+    """
+
+    def __init__(self,
+                 max_workers: int = 32,
+                 aging_sec: float = 2.0,
+                 intent_limits: Optional[Dict[str, int]] = None,
+                 max_queue: int = 1000):
+        self.max_workers = max_workers
+        self.aging_sec = aging_sec
+        self.intent_limits = dict(intent_limits or {})
+        self.max_queue = max_queue
+
+        # (rank, seq, intent, future)
+        self._heap = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._active_by_intent: Dict[str, int] = defaultdict(int)
+        self._queued_by_intent: Dict[str, int] = defaultdict(int)
+        self._queued = 0
+
+        self.admitted = 0
+        self.rejected = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self, intent: str, priority: int):
+        """
+        Hold one worker slot for the duration of the block.
+        """
+        await self._acquire(intent, priority)
+        try:
+            yield
+        finally:
+            self._release(intent)
+
+    async def run(self, intent: str, priority: int,
+                  work: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Wait for admission, then await `work()`.
+        """
+        async with self.slot(intent, priority):
+            return await work()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "active": self._active,
+            "queued": self._queued,
+            "active_by_intent": dict(self._active_by_intent),
+            "queued_by_intent": {k: v for k, v in self._queued_by_intent.items() if v},
+            "intent_limits": dict(self.intent_limits),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _has_capacity(self, intent: str) -> bool:
+        if self._active >= self.max_workers:
+            return False
+        limit = self.intent_limits.get(intent)
+        return limit is None or self._active_by_intent[intent] < limit
+
+    def _grant(self, intent: str):
+        self._active += 1
+        self._active_by_intent[intent] += 1
+        self.admitted += 1
+
+    async def _acquire(self, intent: str, priority: int):
+        enqueued_at = time.monotonic()
+
+        # Fast path — nobody waiting and a slot is free
+        if not self._queued and self._has_capacity(intent):
+            self._grant(intent)
+            self._observe_wait(intent, 0.0)
+            return
+
+        if self._queued >= self.max_queue:
+            self.rejected += 1
+            increment_metric("admission_rejected")
+            raise AdmissionRejected("Admission queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        rank = enqueued_at + priority * self.aging_sec
+        heapq.heappush(self._heap, (rank, next(self._seq), intent, future))
+        self._queued += 1
+        self._queued_by_intent[intent] += 1
+        # Slots may be free while older waiters sit behind an intent cap
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted just before cancellation — give it back
+                self._release(intent)
+            else:
+                future.cancel()
+                self._queued -= 1
+                self._queued_by_intent[intent] -= 1
+            raise
+
+        self._observe_wait(intent, time.monotonic() - enqueued_at)
+
+    def _release(self, intent: str):
+        self._active -= 1
+        self._active_by_intent[intent] -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """
+        Grant free slots to the best-ranked eligible waiters.
+        """
+        skipped = []
+        while self._heap and self._active < self.max_workers:
+            entry = heapq.heappop(self._heap)
+            _, _, intent, future = entry
+            if future.done():
+                continue  # cancelled while waiting
+            if not self._has_capacity(intent):
+                skipped.append(entry)  # intent at its cap — keep its place
+                continue
+
+            self._queued -= 1
+            self._queued_by_intent[intent] -= 1
+            self._grant(intent)
+            future.set_result(None)
+
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+
+    def _observe_wait(self, intent: str, wait_sec: float):
+        record_metric("admission_wait_time", wait_sec)
+        tracer.record("admission_wait", wait_sec, intent=intent)
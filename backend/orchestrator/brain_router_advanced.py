@@ -11,26 +11,35 @@ Author: ChetnaOS Core
 from core.decision_states import DecisionState
 from nature_control import TemporalGuard, SilenceEngine, RestCycle, DecayRules, Limits
 from adapters.speak_adapter import SpeakAdapter
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
+import asyncio
 import uuid
 import time
 import logging
 
 # --- Core imports ---
+from orchestrator.admission_scheduler import AdmissionRejected
 from orchestrator.intent_detector import IntentDetector
 from orchestrator.priority_engine import PriorityEngine
+from orchestrator.response_cache import ResponseCache
 
 # --- Reflection & Dharma ---
 from reflection.dharma_net import DharmaNet
 from reflection.reflection_engine import ReflectionEngine
+from reflection.reflection_sink import ReflectionSink
 
 # --- Workflows ---
-from workflows.custom_flow import CustomFlow
-from workflows.sales_flow import SalesFlow
-from workflows.lead_flow import LeadFlow
+from workflows.registry import WorkflowRegistry
 
 # --- Monitoring ---
-from monitoring.metrics import record_metric
+from monitoring.metrics import record_metric, increment_metric
+from monitoring.tracing import tracer
+
+from config.settings import (
+    RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_MAX_ENTRIES,
+    REFLECTION_QUEUE_SIZE, REFLECTION_BATCH_SIZE,
+    REFLECTION_FLUSH_INTERVAL_SEC, REFLECTION_FULL_POLICY, REFLECTION_LOG_PATH,
+)
 
 logger = logging.getLogger("BrainRouterAdvanced")
 logger.setLevel(logging.INFO)
@@ -46,7 +55,7 @@ class BrainRouterAdvanced:
     Input → Intent → Priority → Dharma → Workflow → Reflection → Output
     """
 
-    def __init__(self):
+    def __init__(self, response_cache: Optional[ResponseCache] = None):
         try:
             from core.founder_queue import FounderQueue
             self.founder_queue = FounderQueue()
@@ -68,18 +77,28 @@ class BrainRouterAdvanced:
         self.priority_engine = PriorityEngine()
         self.dharma_net = DharmaNet()
         self.reflection_engine = ReflectionEngine()
+        # Started lazily on first record (or explicitly from app startup)
+        self.reflection_sink = ReflectionSink(
+            self.reflection_engine,
+            max_queue=REFLECTION_QUEUE_SIZE,
+            batch_size=REFLECTION_BATCH_SIZE,
+            flush_interval=REFLECTION_FLUSH_INTERVAL_SEC,
+            policy=REFLECTION_FULL_POLICY,
+            log_path=REFLECTION_LOG_PATH
+        )
         self.temporal = TemporalGuard(cooldown_sec=1)
         self.silence = SilenceEngine(min_confidence=0.35)
         self.rest = RestCycle(interval_sec=300)
         self.decay = DecayRules(ttl_sec=3600, min_score=1)
         self.limits = Limits(max_autonomy_sec=10, max_tokens=1200)
 
-        # Workflow registry (extensible)
-        self.workflows = {
-            "sales": SalesFlow(),
-            "lead": LeadFlow(),
-            "custom": CustomFlow(),
-        }
+        # Workflow registry (lazy, per-tenant, hot-replaceable)
+        self.workflow_registry = WorkflowRegistry()
+
+        # Optional response cache for deterministic routes
+        if response_cache is None and RESPONSE_CACHE_ENABLED:
+            response_cache = ResponseCache(max_entries=RESPONSE_CACHE_MAX_ENTRIES)
+        self.response_cache = response_cache
 
         logger.info("🧠 BrainRouterAdvanced initialized")
 
@@ -101,32 +120,293 @@ class BrainRouterAdvanced:
             Structured AGI response
         """
         start_time = time.time()
+        context = self._begin(context)
+
+        intent, blocked = self._gate(user_input, context)
+        if blocked is not None:
+            return blocked
+
+        # 5️⃣ Workflow Selection
+        workflow = self._select_workflow(intent, context.get("client_id"))
+        logger.info(f"[{context['trace_id']}] Selected workflow: {workflow.__class__.__name__}")
+
+        cache_key, cached = self._cache_lookup(user_input, intent, workflow,
+                                               context)
+        if cached is not None:
+            return cached
+
+        # 6️⃣ Execute Workflow
+        with tracer.span("workflow", context["trace_id"], workflow.__class__.__name__):
+            output = workflow.execute(
+                user_input=user_input,
+                intent=intent,
+                context=context
+            )
+
+        result = self._complete(user_input, intent, workflow, output, context,
+                                start_time)
+        self._cache_store(cache_key, intent, result)
+        return result
+
+    async def aroute(self,
+                     user_input: str,
+                     context: Optional[Dict[str, Any]] = None,
+                     intent: Optional[str] = None,
+                     priority: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Async AGI routing entry.
+
+        Same flow as `route`, but the workflow (and therefore the LLM
+        round-trip) is awaited, so the event loop keeps serving other
+        requests while this one waits on the provider.
+
+        Args:
+            intent, priority: Already computed by the caller (e.g. for
+                              admission); detected here when omitted
+        """
+        start_time = time.time()
+        context = self._begin(context)
+        screened = self._screen(user_input, context, intent, priority)
+        return await self._arun(user_input, context, start_time, screened)
+
+    async def aroute_many(self,
+                          items: List[Tuple[str, Optional[Dict[str, Any]]]],
+                          max_concurrency: int = 8,
+                          admission=None
+                          ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Batch AGI routing entry.
+
+        Intent, priority and dharma run as one pass over the whole batch;
+        workflows then fan out concurrently (at most `max_concurrency` in
+        flight). Results are yielded in input order as soon as each one
+        and all of its predecessors are done.
+
+        Args:
+            items: [(user_input, context), ...]
+            max_concurrency: Upper bound on concurrent workflow executions
+            admission: Optional AdmissionScheduler; every item then holds
+                       one of its slots (by intent / priority) while it
+                       runs, like a single /process request
+        """
+        user_inputs = [user_input for user_input, _ in items]
+        contexts = [self._begin(context) for _, context in items]
+        screened = self._screen_many(user_inputs, contexts)
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(user_input, context, screen):
+            async with semaphore:
+                try:
+                    if admission is None:
+                        return await self._arun(user_input, context,
+                                                time.time(), screen)
+                    async with admission.slot(screen[0], screen[1]):
+                        return await self._arun(user_input, context,
+                                                time.time(), screen)
+                except AdmissionRejected:
+                    return {
+                        "status": "error",
+                        "reason": "Server busy. Please retry shortly.",
+                        "trace_id": context["trace_id"]
+                    }
+                except Exception as e:
+                    logger.exception(f"[{context['trace_id']}] Batch item failed")
+                    return {
+                        "status": "error",
+                        "reason": f"Error processing request: {str(e)}",
+                        "trace_id": context["trace_id"]
+                    }
+
+        tasks = [
+            asyncio.create_task(run(user_input, context, screen))
+            for user_input, context, screen in zip(user_inputs, contexts,
+                                                   screened)
+        ]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            # Consumer went away (e.g. client disconnect) — stop the rest
+            for task in tasks:
+                task.cancel()
+
+    async def astream_route(self,
+                            user_input: str,
+                            context: Optional[Dict[str, Any]] = None,
+                            intent: Optional[str] = None,
+                            priority: Optional[int] = None
+                            ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming AGI routing entry.
+
+        Yields {"event": "chunk", "text": str} while the workflow's LLM
+        generates, then exactly one {"event": "result", "result": dict}
+        carrying the same response `aroute` would have returned. Blocked /
+        pending requests yield only the result event. `intent` and
+        `priority` are reused as in `aroute`.
+        """
+        start_time = time.time()
+        context = self._begin(context)
+
+        intent, blocked = self._gate(
+            user_input, context,
+            self._screen(user_input, context, intent, priority))
+        if blocked is not None:
+            yield {"event": "result", "result": blocked}
+            return
+
+        # 5️⃣ Workflow Selection
+        workflow = await self._aselect_workflow(intent, context.get("client_id"))
+        logger.info(f"[{context['trace_id']}] Selected workflow: {workflow.__class__.__name__}")
+
+        cache_key, cached = self._cache_lookup(user_input, intent, workflow,
+                                               context)
+        if cached is not None:
+            yield {"event": "chunk", "text": cached["reply"]}
+            yield {"event": "result", "result": cached}
+            return
+
+        # 6️⃣ Execute Workflow (streaming when the workflow supports it)
+        output = None
+        with tracer.span("workflow", context["trace_id"], workflow.__class__.__name__):
+            if hasattr(workflow, "astream"):
+                async for item in workflow.astream(user_input=user_input,
+                                                   intent=intent,
+                                                   context=context):
+                    if item["type"] == "chunk":
+                        yield {"event": "chunk", "text": item["text"]}
+                    else:
+                        output = item["output"]
+            else:
+                output = await workflow.aexecute(user_input=user_input,
+                                                 intent=intent,
+                                                 context=context)
+
+        result = self._complete(user_input, intent, workflow, output, context,
+                                start_time)
+        self._cache_store(cache_key, intent, result)
+        yield {"event": "result", "result": result}
+
+    async def _arun(self, user_input: str, context: Dict[str, Any],
+                    start_time: float, screened=None) -> Dict[str, Any]:
+        intent, blocked = self._gate(user_input, context, screened)
+        if blocked is not None:
+            return blocked
+
+        # 5️⃣ Workflow Selection
+        workflow = await self._aselect_workflow(intent, context.get("client_id"))
+        logger.info(f"[{context['trace_id']}] Selected workflow: {workflow.__class__.__name__}")
+
+        cache_key, cached = self._cache_lookup(user_input, intent, workflow,
+                                               context)
+        if cached is not None:
+            return cached
+
+        # 6️⃣ Execute Workflow
+        with tracer.span("workflow", context["trace_id"], workflow.__class__.__name__):
+            output = await workflow.aexecute(
+                user_input=user_input,
+                intent=intent,
+                context=context
+            )
+
+        result = self._complete(user_input, intent, workflow, output, context,
+                                start_time)
+        self._cache_store(cache_key, intent, result)
+        return result
+
+    # ------------------------------------------------------------------
+    # Pipeline Stages (shared by route / aroute)
+    # ------------------------------------------------------------------
+
+    def _begin(self, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Attach a fresh trace_id to the runtime context.
+        """
         trace_id = str(uuid.uuid4())
 
         context = context or {}
         context["trace_id"] = trace_id
 
         logger.info(f"[{trace_id}] Incoming input received")
+        return context
+
+    def _screen(self, user_input: str, context: Dict[str, Any],
+                intent: Optional[str] = None,
+                priority: Optional[int] = None):
+        """
+        Intent, priority and dharma for a single input. A precomputed
+        intent / priority is reused instead of detected again.
+
+        Returns:
+            (intent, priority, dharma_result)
+        """
+        trace_id = context["trace_id"]
 
         # 1️⃣ Intent Detection
-        intent = self.intent_detector.detect(user_input)
+        if intent is None:
+            with tracer.span("intent", trace_id):
+                intent = self.intent_detector.detect(user_input,
+                                                     client_id=context.get("client_id"))
         logger.info(f"[{trace_id}] Detected intent: {intent}")
 
         # 2️⃣ Priority Scoring
-        priority = self.priority_engine.score(intent, context)
+        if priority is None:
+            with tracer.span("priority", trace_id):
+                priority = self.priority_engine.score(intent, context)
         logger.info(f"[{trace_id}] Priority score: {priority}")
 
         # 3️⃣ Dharma Validation
-        dharma_result = self.dharma_net.validate(
-            intent=intent,
-            priority=priority,
-            context=context
-        )
+        with tracer.span("dharma", trace_id):
+            dharma_result = self.dharma_net.validate(
+                intent=intent,
+                priority=priority,
+                context=context,
+                user_input=user_input
+            )
+        return intent, priority, dharma_result
+
+    def _screen_many(self, user_inputs: List[str],
+                     contexts: List[Dict[str, Any]]):
+        """
+        Batch form of `_screen` — one pass per stage over all inputs.
+        """
+        client_ids = [context.get("client_id") for context in contexts]
+        with tracer.span("intent_batch"):
+            intents = self.intent_detector.detect_many(
+                user_inputs,
+                client_ids if any(client_ids) else None
+            )
+        with tracer.span("priority_batch"):
+            priorities = self.priority_engine.score_many(intents, contexts)
+        with tracer.span("dharma_batch"):
+            dharma_results = self.dharma_net.validate_many(intents, priorities,
+                                                           contexts, user_inputs)
+        return list(zip(intents, priorities, dharma_results))
+
+    def _gate(self, user_input: str, context: Dict[str, Any], screened=None):
+        """
+        Run intent, priority, dharma and wisdom stages.
+
+        Args:
+            screened: Precomputed (intent, priority, dharma_result) from
+                      `_screen_many`; computed here when omitted.
+
+        Returns:
+            (intent, blocked) — `blocked` is a terminal response when the
+            request must not reach a workflow, otherwise None.
+        """
+        trace_id = context["trace_id"]
+
+        if screened is None:
+            screened = self._screen(user_input, context)
+        intent, priority, dharma_result = screened
 
         if not dharma_result["allowed"]:
             logger.warning(f"[{trace_id}] Dharma violation detected")
 
-            return {
+            return intent, {
                 "status": "blocked",
                 "reason": dharma_result["reason"],
                 "trace_id": trace_id,
@@ -137,16 +417,17 @@ class BrainRouterAdvanced:
         wisdom_output = {"verdict": decision, "reason": "Default bypass"}
 
         if self.wisdom_layer:
-            wisdom_output = self.wisdom_layer.evaluate(
-                intent=intent,
-                context=context,
-                priority=priority,
-                trace_id=trace_id
-            )
+            with tracer.span("wisdom", trace_id):
+                wisdom_output = self.wisdom_layer.evaluate(
+                    intent=intent,
+                    context=context,
+                    priority=priority,
+                    trace_id=trace_id
+                )
             decision = wisdom_output.get("verdict")
 
         if decision == DecisionState.REJECT.value:
-            return {
+            return intent, {
                 "status": "blocked",
                 "reason": wisdom_output.get("reason"),
                 "trace_id": trace_id
@@ -161,14 +442,14 @@ class BrainRouterAdvanced:
                 "wisdom": wisdom_output
             })
 
-            return {
+            return intent, {
                 "status": "pending_approval",
                 "reason": wisdom_output.get("reason"),
                 "trace_id": trace_id
             }
 
         if decision == DecisionState.DEFER.value:
-            return {
+            return intent, {
                 "status": "deferred",
                 "reason": wisdom_output.get("reason"),
                 "trace_id": trace_id
@@ -176,24 +457,26 @@ class BrainRouterAdvanced:
 
         # ALLOW / ALLOW_WITH_WARNING
         context["wisdom"] = wisdom_output
+        return intent, None
 
-        # 5️⃣ Workflow Selection
-        workflow = self._select_workflow(intent)
-        logger.info(f"[{trace_id}] Selected workflow: {workflow.__class__.__name__}")
+    def _complete(self, user_input: str, intent: str, workflow,
+                  output: Dict[str, Any], context: Dict[str, Any],
+                  start_time: float) -> Dict[str, Any]:
+        """
+        Reflect, record metrics and normalize the workflow output.
+        """
+        trace_id = context["trace_id"]
 
-        # 6️⃣ Execute Workflow
-        output = workflow.execute(
-            user_input=user_input,
-            intent=intent,
-            context=context
-        )
+        workflow_name = workflow.__class__.__name__
 
         # 7️⃣ Reflection Loop
-        self._reflect(user_input, intent, output, context)
+        with tracer.span("reflection", trace_id, workflow_name):
+            self._reflect(user_input, intent, output, context)
 
         # 8️⃣ Metrics
         latency = time.time() - start_time
         record_metric("brain_router_latency", latency)
+        tracer.record("total", latency, trace_id=trace_id, workflow=workflow_name)
 
         logger.info(f"[{trace_id}] Routing completed in {latency:.2f}s")
 
@@ -228,23 +511,63 @@ class BrainRouterAdvanced:
         }
 
     # Internal Helpers
-    def _select_workflow(self, intent: str):
+    def _select_workflow(self, intent: str, client_id: Optional[str] = None):
         """
-        Map intent to workflow.
+        Map intent to workflow (tenant workflow first, then built-in).
         Default → custom flow
         """
-        return self.workflows.get(intent, self.workflows["custom"])
+        return self.workflow_registry.get(intent, client_id)
+
+    async def _aselect_workflow(self, intent: str, client_id: Optional[str] = None):
+        """
+        `_select_workflow` for the async paths (loading runs off the loop).
+        """
+        return await self.workflow_registry.aget(intent, client_id)
+
+    def _cache_lookup(self, user_input: str, intent: str, workflow,
+                      context: Dict[str, Any]):
+        """
+        Returns:
+            (cache_key, cached_result) — key is None when the route is not
+            cacheable; cached_result is None on a miss.
+        """
+        cache = self.response_cache
+        if cache is None or not cache.cacheable(intent):
+            return None, None
+        context_keys = cache.context_keys(workflow)
+        if context_keys is None:
+            return None, None
+
+        with tracer.span("cache", context["trace_id"], workflow.__class__.__name__):
+            key = cache.make_key(user_input, intent, context.get("client_id"),
+                                 getattr(workflow, "version", "0"),
+                                 context, context_keys)
+            cached = cache.get(key)
+        if cached is None:
+            increment_metric("response_cache_miss")
+            return key, None
+
+        increment_metric("response_cache_hit")
+        trace_id = context["trace_id"]
+        logger.info(f"[{trace_id}] Served from response cache")
+        cached["trace_id"] = trace_id
+        cached["cached"] = True
+        return key, cached
+
+    def _cache_store(self, cache_key, intent: str, result: Dict[str, Any]):
+        if cache_key is not None:
+            self.response_cache.put(cache_key, intent, result)
 
     def _reflect(self, user_input: str, intent: str, output: Dict[str, Any],
                  context: Dict[str, Any]):
         """
-        Feed experience back into reflection engine.
+        Feed experience back into reflection engine (via the async sink).
         """
         try:
-            self.reflection_engine.record(user_input=user_input,
-                                          intent=intent,
-                                          output=output,
-                                          context=context)
+            record = self.reflection_sink.compact(user_input, intent, output,
+                                                  context)
+            if not self.reflection_sink.submit(record):
+                increment_metric("reflection_dropped")
         except Exception as e:
             logger.error(f"Reflection failed: {e}")
 
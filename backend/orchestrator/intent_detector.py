@@ -1,26 +1,171 @@
+from collections import OrderedDict
+import logging
+import re
+import threading
+from typing import Dict, List, Optional
+
+from clients.client_loader import ClientLoader
+from config.settings import CLIENT_CACHE_MAX_TENANTS
+
+logger = logging.getLogger("IntentDetector")
+
+# Word tokens — keywords only match whole words ("hi" never matches "this")
+_TOKEN_RE = re.compile(r"\w+")
+
+DEFAULT_INTENT_MAP = {
+    "sales": ["price", "cost", "buy", "purchase", "book", "investment"],
+    "goal": ["goal", "target", "automate", "achieve"],
+    "support": ["help", "issue", "problem", "error"],
+    "lead": ["lead", "contact", "prospect"],
+    "chat": ["hi", "hello", "namaste", "how", "what", "who"]
+}
+
+
+class KeywordMatcher:
+    """
+    Keyword → intent matcher compiled once from an intent map.
+
+    Keywords are tokenized into word tuples and indexed by hash, so a
+    lookup costs O(words in text) regardless of how many keywords exist.
+    When several intents match, the one listed first in the map wins.
+    """
+
+    def __init__(self, intent_map: Dict[str, List[str]],
+                 default: str = "custom"):
+        self.intents = list(intent_map)
+        self.default = default
+
+        # rank = position in intent_map (lower wins)
+        self._words: Dict[str, int] = {}
+        self._phrases: Dict[tuple, int] = {}
+        for rank, keywords in enumerate(intent_map.values()):
+            for keyword in keywords:
+                tokens = tuple(_TOKEN_RE.findall(keyword.lower()))
+                if len(tokens) == 1:
+                    self._words.setdefault(tokens[0], rank)
+                elif tokens:
+                    self._phrases.setdefault(tokens, rank)
+
+        self._phrase_lengths = sorted({len(p) for p in self._phrases})
+
+    def match(self, text: str) -> str:
+        tokens = _TOKEN_RE.findall(text.lower())
+        words = self._words
+
+        best = len(self.intents)
+        for token in words.keys() & set(tokens):
+            rank = words[token]
+            if rank < best:
+                best = rank
+
+        if self._phrases and best > 0:
+            phrases = self._phrases
+            for n in self._phrase_lengths:
+                for i in range(len(tokens) - n + 1):
+                    rank = phrases.get(tuple(tokens[i:i + n]))
+                    if rank is not None and rank < best:
+                        best = rank
+
+        return self.intents[best] if best < len(self.intents) else self.default
+
+
 class IntentDetector:
     """
     Detects user intent from incoming text.
+
+    Tenants can extend the keyword map through `intent_keywords` in
+    client_projects/<client_id>/config.json:
+
+        {"intent_keywords": {"sales": ["plot", "rate"], "visit": ["site visit"]}}
+
+    Tenant keywords are added to existing intents; new intents rank
+    after the built-in ones. Compiled tenant matchers are kept in an LRU
+    of `max_clients` entries; unknown or malformed client ids use the
+    default matcher and are never cached.
     """
 
-    def __init__(self):
-        self.intent_map = {
-            "sales": ["price", "cost", "buy", "purchase", "book", "investment"],
-            "goal": ["goal", "target", "automate", "achieve"],
-            "support": ["help", "issue", "problem", "error"],
-            "lead": ["lead", "contact", "prospect"],
-            "chat": ["hi", "hello", "namaste", "how", "what", "who"]
+    def __init__(self, intent_map: Optional[Dict[str, List[str]]] = None,
+                 max_clients: int = CLIENT_CACHE_MAX_TENANTS):
+        self.intent_map = intent_map or {
+            intent: list(keywords)
+            for intent, keywords in DEFAULT_INTENT_MAP.items()
         }
+        self.matcher = KeywordMatcher(self.intent_map)
+        self.max_clients = max_clients
+        self._client_matchers: "OrderedDict[str, KeywordMatcher]" = OrderedDict()
+        self._lock = threading.Lock()
 
-    def detect(self, text: str) -> str:
+    def detect(self, text: str, client_id: Optional[str] = None) -> str:
         if not text:
             return "chat"
 
-        text = text.lower()
+        return self._matcher_for(client_id).match(text)
+
+    def detect_many(self, texts: List[str],
+                    client_ids: Optional[List[Optional[str]]] = None) -> List[str]:
+        """
+        Batch form of `detect`, one intent per input (same order).
+        """
+        if client_ids is None:
+            match = self.matcher.match
+            return [match(text) if text else "chat" for text in texts]
+
+        return [self.detect(text, client_id)
+                for text, client_id in zip(texts, client_ids)]
+
+    def reload_client(self, client_id: Optional[str] = None):
+        """
+        Drop the compiled matcher for a tenant, or for every tenant when
+        client_id is None (rebuilt on next use).
+        """
+        with self._lock:
+            if client_id is None:
+                self._client_matchers.clear()
+            else:
+                self._client_matchers.pop(client_id, None)
+
+    # Internal Helpers
+    def _matcher_for(self, client_id: Optional[str]) -> KeywordMatcher:
+        if not ClientLoader.is_valid_client_id(client_id):
+            return self.matcher
+
+        with self._lock:
+            matcher = self._client_matchers.get(client_id)
+            if matcher is not None:
+                self._client_matchers.move_to_end(client_id)
+                return matcher
+
+        matcher = self._build_client_matcher(client_id)
+        with self._lock:
+            self._client_matchers[client_id] = matcher
+            while len(self._client_matchers) > self.max_clients:
+                self._client_matchers.popitem(last=False)
+        return matcher
+
+    def _build_client_matcher(self, client_id: str) -> KeywordMatcher:
+        overrides = self._load_client_keywords(client_id)
+        if not overrides:
+            return self.matcher
+
+        merged = {intent: list(keywords)
+                  for intent, keywords in self.intent_map.items()}
+        for intent, keywords in overrides.items():
+            merged.setdefault(intent, []).extend(keywords)
+        return KeywordMatcher(merged)
 
-        for intent, keywords in self.intent_map.items():
-            for word in keywords:
-                if word in text:
-                    return intent
+    def _load_client_keywords(self, client_id: str) -> Dict[str, List[str]]:
+        config = ClientLoader.load_optional_config(client_id)
+        overrides = config.get("intent_keywords") or {}
+        if not isinstance(overrides, dict):
+            logger.warning(f"Ignoring intent_keywords for {client_id}: not a mapping")
+            return {}
 
-        return "custom"
\ No newline at end of file
+        valid = {}
+        for intent, keywords in overrides.items():
+            if (isinstance(intent, str) and isinstance(keywords, list)
+                    and all(isinstance(k, str) for k in keywords)):
+                valid[intent] = keywords
+            else:
+                logger.warning(f"Ignoring intent_keywords[{intent!r}] for {client_id}: "
+                               f"expected a list of strings")
+        return valid
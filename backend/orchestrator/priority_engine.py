@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 class PriorityEngine:
@@ -25,6 +25,14 @@ class PriorityEngine:
         """
         return self.get_priority(intent)
 
+    def score_many(self, intents: List[str],
+                   contexts: List[Dict[str, Any]]) -> List[int]:
+        """
+        Batch form of `score`, one score per intent (same order).
+        """
+        priority_order = self.priority_order
+        return [priority_order.get(intent, 5) for intent in intents]
+
     def compare(self, intent_a: str, intent_b: str) -> str:
         """
         Returns higher priority intent.
@@ -0,0 +1,143 @@
+"""
+ChetnaOS — ResponseCache
+------------------------
+Optional LRU cache for deterministic BrainRouterAdvanced routes.
+
+Repeated greetings / price questions are answered from memory instead of
+running the workflow (and its LLM call) again.
+
+Rules:
+- Only intents with a TTL are cached (per-intent TTLs)
+- Only successful results are stored — blocked, pending and deferred
+  responses never reach the cache
+- Keys include client_id and workflow version, so tenants never share
+  answers and a workflow upgrade invalidates its old entries
+- Keys include a digest of every context field the workflow renders into
+  its prompt (customer_name, history, ...), so personalized replies are
+  never served to another customer. Workflows that don't declare their
+  prompt context (`cache_context_keys` or a `prompt_builder`) are not
+  cached at all
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+
+_TOKEN_RE = re.compile(r"\w+")
+
+DEFAULT_INTENT_TTLS = {
+    "chat": 300,
+    "sales": 600,
+}
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-intent TTLs and hit/miss counters.
+    """
+
+    def __init__(self,
+                 max_entries: int = 2048,
+                 intent_ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max_entries
+        self.intent_ttls = dict(DEFAULT_INTENT_TTLS if intent_ttls is None
+                                else intent_ttls)
+
+        # key -> (expires_at, result)
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def cacheable(self, intent: str) -> bool:
+        return self.intent_ttls.get(intent, 0) > 0
+
+    @staticmethod
+    def context_keys(workflow) -> Optional[Tuple[str, ...]]:
+        """
+        Context fields that shape `workflow`'s prompt, or None when unknown.
+        """
+        keys = getattr(workflow, "cache_context_keys", None)
+        if keys is None:
+            builder = getattr(workflow, "prompt_builder", None)
+            keys = getattr(builder, "context_keys", None)
+        return tuple(keys) if keys is not None else None
+
+    @staticmethod
+    def make_key(user_input: str, intent: str, client_id: Optional[str],
+                 workflow_version: str,
+                 context: Optional[Dict[str, Any]] = None,
+                 context_keys: Iterable[str] = ()) -> Tuple:
+        """
+        Case, punctuation and whitespace differences map to one key.
+        """
+        normalized = " ".join(_TOKEN_RE.findall(user_input.lower()))
+        context = context or {}
+        fields = {name: context[name] for name in context_keys
+                  if context.get(name) not in (None, "", [], {})}
+        digest = hashlib.blake2b(
+            json.dumps(fields, sort_keys=True, default=str).encode(),
+            digest_size=16).hexdigest() if fields else ""
+        return (normalized, intent, client_id or "", workflow_version, digest)
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, result = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return copy.deepcopy(result)
+
+    def put(self, key: Tuple, intent: str, result: Dict[str, Any]):
+        ttl = self.intent_ttls.get(intent, 0)
+        if ttl <= 0 or result.get("status") != "success":
+            return
+
+        entry = (time.monotonic() + ttl, copy.deepcopy(result))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "intent_ttls": dict(self.intent_ttls),
+        }
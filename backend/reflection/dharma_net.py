@@ -1,33 +1,72 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from reflection.policy_engine import PolicyEngine
 
 
 class DharmaNet:
     """
     Validates actions against ethical/dharma rules.
+
+    Rules are compiled by PolicyEngine (global + per-tenant) and
+    evaluated against the raw user input in a single pass.
     """
 
-    def __init__(self):
-        self.blocked_keywords = ["harm", "malicious", "illegal"]
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None):
+        self.policy_engine = PolicyEngine(rules)
 
     def validate(
         self,
         intent: str,
         priority: int,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        user_input: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Check if the action is allowed based on dharma rules.
+
+        Returns:
+        {
+            "allowed": bool,
+            "reason": str | None,   # first blocking rule
+            "matched": [{"id", "action", "reason"}, ...]
+        }
         """
-        user_input = context.get("user_input", "").lower()
+        if user_input is None:
+            user_input = context.get("user_input", "")
+
+        matched = self.policy_engine.evaluate(user_input, intent,
+                                              client_id=context.get("client_id"))
 
-        for keyword in self.blocked_keywords:
-            if keyword in user_input:
+        for rule in matched:
+            if rule.action == "block":
                 return {
                     "allowed": False,
-                    "reason": f"Blocked due to policy violation: {keyword}"
+                    "reason": f"Blocked due to policy violation: {rule.reason}",
+                    "matched": [r.to_dict() for r in matched]
                 }
 
         return {
             "allowed": True,
-            "reason": None
+            "reason": None,
+            "matched": [r.to_dict() for r in matched]
         }
+
+    def validate_many(
+        self,
+        intents: List[str],
+        priorities: List[int],
+        contexts: List[Dict[str, Any]],
+        user_inputs: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Batch form of `validate`, one result per input (same order).
+        """
+        if user_inputs is None:
+            user_inputs = [None] * len(intents)
+
+        return [
+            self.validate(intent=intent, priority=priority, context=context,
+                          user_input=user_input)
+            for intent, priority, context, user_input
+            in zip(intents, priorities, contexts, user_inputs)
+        ]
@@ -0,0 +1,291 @@
+"""
+Dharma Policy Engine
+--------------------
+Compiles dharma rules into one matcher and evaluates raw user input.
+
+Rule shape (built-in or client_projects/<client_id>/config.json
+under "dharma_rules"):
+
+    {
+        "id": "no-weapons",
+        "keywords": ["gun", "weapon sale"],    # word-prefix / phrase match
+        "match": "prefix",                     # "prefix" (default) | "word"
+        "regex": "[0-9]{4} ?[0-9]{4} ?[0-9]{4}",  # optional, case-insensitive
+        "intents": ["sales"],                  # optional, default: all
+        "action": "block",                     # "block" | "warn"
+        "reason": "Weapons are not allowed"
+    }
+
+Matching:
+- Keywords are tokenized once and indexed by hash; a lookup costs
+  O(words in input) regardless of rule count
+- By default every keyword word matches as a word prefix, so "harm"
+  also catches "harmful" and "illegal" catches "illegally" (phrase
+  words too: "weapon sale" matches "weapons sales"); rules with
+  "match": "word" only match whole words
+- Regexes are OR-ed into a single gate; individual patterns only run
+  when the gate fires
+- Every matched rule is returned, not just the first
+- Compiled rule sets are cached per client (LRU, malformed client ids
+  fall back to the global rules and are never cached)
+"""
+
+from collections import OrderedDict
+from itertools import product
+from typing import Dict, Any, List, Optional, Set
+import logging
+import re
+import threading
+
+from clients.client_loader import ClientLoader
+from config.settings import CLIENT_CACHE_MAX_TENANTS
+
+logger = logging.getLogger("PolicyEngine")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+DEFAULT_RULES = [
+    {"id": "dharma:harm", "keywords": ["harm"], "reason": "harm"},
+    {"id": "dharma:malicious", "keywords": ["malicious"], "reason": "malicious"},
+    {"id": "dharma:illegal", "keywords": ["illegal"], "reason": "illegal"},
+]
+
+
+def _is_str_list(value: Any) -> bool:
+    return isinstance(value, (list, tuple)) and all(isinstance(v, str) for v in value)
+
+
+class PolicyRule:
+    """
+    A single dharma rule.
+    """
+
+    __slots__ = ("rule_id", "keywords", "regex", "intents", "action",
+                 "reason", "match")
+
+    def __init__(self,
+                 rule_id: str,
+                 keywords: Optional[List[str]] = None,
+                 regex: Optional[str] = None,
+                 intents: Optional[List[str]] = None,
+                 action: str = "block",
+                 reason: Optional[str] = None,
+                 match: str = "prefix"):
+        if keywords is not None and not _is_str_list(keywords):
+            raise ValueError(f"Rule {rule_id}: keywords must be a list of strings")
+        if intents is not None and not _is_str_list(intents):
+            raise ValueError(f"Rule {rule_id}: intents must be a list of strings")
+        if regex is not None and not isinstance(regex, str):
+            raise ValueError(f"Rule {rule_id}: regex must be a string")
+        if not keywords and not regex:
+            raise ValueError(f"Rule {rule_id} needs keywords or regex")
+        if action not in ("block", "warn"):
+            raise ValueError(f"Rule {rule_id} has unknown action: {action}")
+        if match not in ("prefix", "word"):
+            raise ValueError(f"Rule {rule_id} has unknown match mode: {match}")
+        if regex:
+            re.compile(regex)  # surface bad patterns at load time
+
+        self.rule_id = rule_id
+        self.keywords = list(keywords or [])
+        self.regex = regex
+        self.intents = frozenset(intents) if intents else None
+        self.action = action
+        self.reason = reason or rule_id
+        self.match = match
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PolicyRule":
+        return cls(rule_id=data["id"],
+                   keywords=data.get("keywords"),
+                   regex=data.get("regex"),
+                   intents=data.get("intents"),
+                   action=data.get("action", "block"),
+                   reason=data.get("reason"),
+                   match=data.get("match", "prefix"))
+
+    def applies_to(self, intent: str) -> bool:
+        return self.intents is None or intent in self.intents
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.rule_id, "action": self.action,
+                "reason": self.reason}
+
+
+class _KeywordIndex:
+    """
+    Word / phrase → rule indices, matched whole-word or by word prefix.
+    """
+
+    def __init__(self, prefix: bool):
+        self.prefix = prefix
+        self.words: Dict[str, List[int]] = {}
+        self.phrases: Dict[tuple, List[int]] = {}
+        self.phrase_lengths: List[int] = []
+        self.vocab: Set[str] = set()        # every keyword word
+        self.word_lengths: List[int] = []   # distinct keyword word lengths
+
+    def add(self, keyword: str, idx: int):
+        tokens = tuple(_TOKEN_RE.findall(keyword.lower()))
+        if len(tokens) == 1:
+            self.words.setdefault(tokens[0], []).append(idx)
+        elif tokens:
+            self.phrases.setdefault(tokens, []).append(idx)
+        self.vocab.update(tokens)
+
+    def freeze(self):
+        self.phrase_lengths = sorted({len(p) for p in self.phrases})
+        self.word_lengths = sorted({len(w) for w in self.vocab})
+
+    def lookup(self, tokens: List[str], hits: Set[int]):
+        if not self.vocab:
+            return
+
+        # token -> keyword words it matches (itself, or its keyword prefixes)
+        if self.prefix:
+            vocab, lengths = self.vocab, self.word_lengths
+            stems = {}
+            for token in set(tokens):
+                matched = [token[:n] for n in lengths
+                           if n <= len(token) and token[:n] in vocab]
+                if matched:
+                    stems[token] = matched
+        else:
+            stems = {token: [token] for token in self.vocab & set(tokens)}
+
+        words = self.words
+        for matched in stems.values():
+            for word in matched:
+                ids = words.get(word)
+                if ids:
+                    hits.update(ids)
+
+        if self.phrases and stems:
+            phrases = self.phrases
+            for n in self.phrase_lengths:
+                for i in range(len(tokens) - n + 1):
+                    options = [stems.get(t) for t in tokens[i:i + n]]
+                    if not all(options):
+                        continue
+                    for phrase in product(*options):
+                        ids = phrases.get(phrase)
+                        if ids:
+                            hits.update(ids)
+
+
+class CompiledPolicy:
+    """
+    An immutable, compiled set of rules.
+    """
+
+    def __init__(self, rules: List[PolicyRule]):
+        self.rules = list(rules)
+
+        self._indexes = {"prefix": _KeywordIndex(prefix=True),
+                         "word": _KeywordIndex(prefix=False)}
+        regex_rules = []
+
+        for idx, rule in enumerate(self.rules):
+            for keyword in rule.keywords:
+                self._indexes[rule.match].add(keyword, idx)
+            if rule.regex:
+                regex_rules.append((idx, re.compile(rule.regex, re.IGNORECASE)))
+
+        for index in self._indexes.values():
+            index.freeze()
+        self._regexes = regex_rules
+        self._regex_gate = None
+        if regex_rules:
+            try:
+                self._regex_gate = re.compile(
+                    "|".join(f"(?:{rx.pattern})" for _, rx in regex_rules),
+                    re.IGNORECASE)
+            except re.error:
+                # e.g. numbered backreferences — fall back to per-rule scan
+                self._regex_gate = None
+
+    def evaluate(self, text: str, intent: Optional[str] = None) -> List[PolicyRule]:
+        """
+        Every rule matching `text` that applies to `intent`, in rule order.
+        """
+        if not text:
+            return []
+
+        tokens = _TOKEN_RE.findall(text.lower())
+        hits: Set[int] = set()
+        for index in self._indexes.values():
+            index.lookup(tokens, hits)
+
+        if self._regexes and (self._regex_gate is None
+                              or self._regex_gate.search(text)):
+            for idx, rx in self._regexes:
+                if rx.search(text):
+                    hits.add(idx)
+
+        rules = self.rules
+        return [rules[i] for i in sorted(hits)
+                if intent is None or rules[i].applies_to(intent)]
+
+
+class PolicyEngine:
+    """
+    Global rules + per-tenant rule sets, compiled and cached per client.
+    """
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None,
+                 max_clients: int = CLIENT_CACHE_MAX_TENANTS):
+        self.global_rules = [PolicyRule.from_dict(r)
+                             for r in (DEFAULT_RULES if rules is None else rules)]
+        self.global_policy = CompiledPolicy(self.global_rules)
+        self.max_clients = max_clients
+        self._client_policies: "OrderedDict[str, CompiledPolicy]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def evaluate(self, text: str, intent: Optional[str] = None,
+                 client_id: Optional[str] = None) -> List[PolicyRule]:
+        return self.policy_for(client_id).evaluate(text, intent)
+
+    def policy_for(self, client_id: Optional[str]) -> CompiledPolicy:
+        if not ClientLoader.is_valid_client_id(client_id):
+            return self.global_policy
+
+        with self._lock:
+            policy = self._client_policies.get(client_id)
+            if policy is not None:
+                self._client_policies.move_to_end(client_id)
+                return policy
+
+        policy = self._compile_client(client_id)
+        with self._lock:
+            self._client_policies[client_id] = policy
+            while len(self._client_policies) > self.max_clients:
+                self._client_policies.popitem(last=False)
+        return policy
+
+    def reload_client(self, client_id: Optional[str] = None):
+        """
+        Drop the compiled rule set for a tenant, or for every tenant when
+        client_id is None (rebuilt on next use).
+        """
+        with self._lock:
+            if client_id is None:
+                self._client_policies.clear()
+            else:
+                self._client_policies.pop(client_id, None)
+
+    def _compile_client(self, client_id: str) -> CompiledPolicy:
+        config = ClientLoader.load_optional_config(client_id)
+        rules = config.get("dharma_rules") or []
+        if not isinstance(rules, list):
+            logger.warning(f"Ignoring dharma_rules for {client_id}: not a list")
+            rules = []
+        tenant_rules = []
+        for data in rules:
+            try:
+                tenant_rules.append(PolicyRule.from_dict(data))
+            except (KeyError, ValueError, TypeError, AttributeError, re.error) as e:
+                logger.warning(f"Skipping dharma rule for {client_id}: {e}")
+
+        if not tenant_rules:
+            return self.global_policy
+        return CompiledPolicy(self.global_rules + tenant_rules)
@@ -1,17 +1,39 @@
-from typing import Dict, Any
+from collections import deque
+from typing import Dict, Any, List
 import logging
+import time
 
 
 logger = logging.getLogger("ReflectionEngine")
 
 
+def compact_record(user_input: str, intent: str, output: Any,
+                   context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Small, JSON-safe summary of one routed request — the single shape
+    stored in ReflectionEngine.history and in the reflection log.
+    """
+    output = output if isinstance(output, dict) else {}
+    return {
+        "ts": round(time.time(), 3),
+        "trace_id": context.get("trace_id"),
+        "client_id": context.get("client_id"),
+        "intent": intent,
+        "workflow": output.get("workflow"),
+        "status": output.get("status"),
+        "input": (user_input or "")[:200],
+    }
+
+
 class ReflectionEngine:
     """
     Records and reflects on agent experiences.
+    Keeps only the most recent `max_history` entries, all in the
+    `compact_record` shape.
     """
 
-    def __init__(self):
-        self.history = []
+    def __init__(self, max_history: int = 1000):
+        self.history = deque(maxlen=max_history)
 
     def record(
         self,
@@ -23,14 +45,15 @@ class ReflectionEngine:
         """
         Record an experience for future reflection.
         """
-        entry = {
-            "user_input": user_input,
-            "intent": intent,
-            "output": output,
-            "trace_id": context.get("trace_id")
-        }
-        self.history.append(entry)
-        logger.info(f"Recorded experience: {intent}")
+        self.history.append(compact_record(user_input, intent, output, context))
+        logger.debug(f"Recorded experience: {intent}")
+
+    def record_batch(self, entries: List[Dict[str, Any]]):
+        """
+        Record `compact_record` entries drained by ReflectionSink.
+        """
+        self.history.extend(entries)
+        logger.debug(f"Recorded {len(entries)} experiences")
 
     def reflect(self, action: str, outcome: dict) -> dict:
         return {
@@ -0,0 +1,214 @@
+"""
+Reflection Sink
+---------------
+Moves reflection recording off the request hot path.
+
+- Requests push a compact record into a fixed-size queue (O(1))
+- A background worker drains the queue in batches, appends them to a
+  JSONL log and hands them to ReflectionEngine
+- When the queue is full the configured policy applies:
+    "drop"  → discard immediately and count it
+    "block" → wait up to `block_timeout` for space, then drop and count.
+              On an event-loop thread the wait is an asyncio task, so
+              the loop itself never blocks
+"""
+
+from typing import Dict, Any, List, Optional, Set
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from monitoring.metrics import increment_metric
+from reflection.reflection_engine import compact_record
+
+logger = logging.getLogger("ReflectionSink")
+
+_STOP = object()
+
+
+class ReflectionSink:
+    """
+    Bounded asynchronous sink for reflection records.
+    """
+
+    def __init__(self,
+                 engine=None,
+                 max_queue: int = 10_000,
+                 batch_size: int = 256,
+                 flush_interval: float = 1.0,
+                 policy: str = "drop",
+                 block_timeout: float = 0.05,
+                 log_path: Optional[str] = None):
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown reflection queue policy: {policy}")
+
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.log_path = log_path
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._waiters: Set[asyncio.Task] = set()
+
+        self.submitted = 0
+        self.dropped = 0
+        self.persisted = 0
+        self.batches = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    def start(self):
+        with self._start_lock:
+            if self.running:
+                return
+            self._worker = threading.Thread(target=self._run,
+                                            name="reflection-sink",
+                                            daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Flush everything queued so far, then stop the worker.
+        """
+        if not self.running:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Reflection queue full at shutdown, records lost")
+            return
+        self._worker.join(timeout)
+        self._worker = None
+
+    # ------------------------------------------------------------------
+    # Hot path
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def compact(user_input: str, intent: str, output: Any,
+                context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Small, JSON-safe summary of one routed request.
+        """
+        return compact_record(user_input, intent, output, context)
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Enqueue a record. Returns False if it was dropped.
+
+        Never blocks an event loop: under the "block" policy a full queue
+        is waited on by a background asyncio task when called from a
+        loop thread (that record counts as submitted unless the wait
+        times out, in which case it is dropped and counted there).
+        """
+        if not self.running:
+            self.start()
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            if self.policy != "block":
+                self.dropped += 1
+                return False
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                task = loop.create_task(self._aput(record))
+                self._waiters.add(task)
+                task.add_done_callback(self._waiters.discard)
+                return True
+            try:
+                self._queue.put(record, timeout=self.block_timeout)
+            except queue.Full:
+                self.dropped += 1
+                return False
+
+        self.submitted += 1
+        return True
+
+    async def _aput(self, record: Dict[str, Any]):
+        deadline = time.monotonic() + self.block_timeout
+        poll = min(0.005, self.block_timeout)
+        while True:
+            try:
+                self._queue.put_nowait(record)
+                self.submitted += 1
+                return
+            except queue.Full:
+                if time.monotonic() >= deadline:
+                    self.dropped += 1
+                    increment_metric("reflection_dropped")
+                    return
+            await asyncio.sleep(poll)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "policy": self.policy,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "persisted": self.persisted,
+            "batches": self.batches,
+        }
+
+    # ------------------------------------------------------------------
+    # Background worker
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            batch: List[Dict[str, Any]] = []
+            stop = False
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+                while len(batch) < self.batch_size and not stop:
+                    item = self._queue.get_nowait()
+                    if item is _STOP:
+                        stop = True
+                    else:
+                        batch.append(item)
+            except queue.Empty:
+                pass
+
+            if batch:
+                self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: List[Dict[str, Any]]):
+        try:
+            if self.log_path:
+                os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write("".join(
+                        json.dumps(r, ensure_ascii=False,
+                                   separators=(",", ":"), default=str) + "\n"
+                        for r in batch))
+            if self.engine is not None:
+                self.engine.record_batch(batch)
+            self.persisted += len(batch)
+            self.batches += 1
+        except Exception as e:
+            logger.error(f"Reflection batch failed ({len(batch)} records): {e}")
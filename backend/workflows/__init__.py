@@ -1,9 +1,11 @@
 from .custom_flow import CustomFlow
 from .lead_flow import LeadFlow
 from .sales_flow import SalesFlow
+from .registry import WorkflowRegistry
 
 __all__ = [
     "CustomFlow",
     "LeadFlow",
     "SalesFlow",
+    "WorkflowRegistry",
 ]
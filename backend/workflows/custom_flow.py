@@ -1,9 +1,16 @@
-from integrations.llm import LLMRegistry
-from typing import Dict, Any
+from integrations.llm import LLMRegistry, request_hints
+from integrations.llm.ledger import BudgetExceeded
+from typing import Dict, Any, AsyncIterator
 
 
 class CustomFlow:
 
+    # Bump when prompt/behaviour changes (invalidates cached responses)
+    version = "1"
+
+    # The prompt is built from user_input alone (no context fields)
+    cache_context_keys = ()
+
     def __init__(self, name="custom"):
         self.name = name
         self.steps = []
@@ -20,8 +27,51 @@ class CustomFlow:
         # Try to get LLM, fallback to simple response if unavailable
         try:
             llm = LLMRegistry.get()  # single source of truth
+            response = llm.generate(self._build_prompt(user_input),
+                                    **request_hints(user_input, context))
+        except Exception as e:
+            response = self._fallback_response(user_input, e)
+
+        return self._build_result(response, context)
+
+    async def aexecute(self, user_input: str, intent: str, context: dict):
+        """
+        Awaitable `execute` — used by BrainRouterAdvanced.aroute.
+        """
+        try:
+            llm = LLMRegistry.get()
+            response = await llm.agenerate(self._build_prompt(user_input),
+                                           **request_hints(user_input, context))
+        except Exception as e:
+            response = self._fallback_response(user_input, e)
+
+        return self._build_result(response, context)
+
+    async def astream(self, user_input: str, intent: str,
+                      context: dict) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming `execute`.
 
-            prompt = f"""
+        Yields {"type": "chunk", "text": str} as the LLM produces text,
+        then exactly one {"type": "result", "output": <execute result>}.
+        """
+        parts = []
+        try:
+            llm = LLMRegistry.get()
+            async for chunk in llm.astream(self._build_prompt(user_input),
+                                           **request_hints(user_input, context)):
+                parts.append(chunk)
+                yield {"type": "chunk", "text": chunk}
+            response = {"text": "".join(parts)}
+        except Exception as e:
+            response = self._fallback_response(user_input, e)
+            if not parts:
+                yield {"type": "chunk", "text": response["text"]}
+
+        yield {"type": "result", "output": self._build_result(response, context)}
+
+    def _build_prompt(self, user_input: str) -> str:
+        return f"""
         You are ChetnaOS, an intelligent cognitive assistant.
 
         Your task:
@@ -36,20 +86,28 @@ class CustomFlow:
         Respond directly to the user:
         """
 
-            response = llm.generate(prompt)
-        except RuntimeError as e:
+    def _fallback_response(self, user_input: str, error: Exception) -> Dict[str, Any]:
+        if isinstance(error, BudgetExceeded):
+            # Daily LLM budget used up (BudgetExceeded is a RuntimeError too)
+            return {
+                "text": "I've reached my usage limit for today. Please try again later.",
+                "message": "I've reached my usage limit for today. Please try again later."
+            }
+
+        if isinstance(error, RuntimeError):
             # LLM not registered, use fallback response
-            response = {
+            return {
                 "text": f"I understand: {user_input}. How can I help you further?",
                 "message": f"I understand: {user_input}. How can I help you further?"
             }
-        except Exception as e:
-            # Any other error, use safe fallback
-            response = {
-                "text": "I'm here to help. Could you please rephrase your request?",
-                "message": "I'm here to help. Could you please rephrase your request?"
-            }
 
+        # Any other error, use safe fallback
+        return {
+            "text": "I'm here to help. Could you please rephrase your request?",
+            "message": "I'm here to help. Could you please rephrase your request?"
+        }
+
+    def _build_result(self, response: Any, context: dict) -> Dict[str, Any]:
         # 🔒 NORMALIZE + SANITIZE LLM OUTPUT (CRITICAL FIX)
         content = None
 
@@ -79,4 +137,4 @@ class CustomFlow:
                 "reply": content   # Alias for easy extraction
             },
             "trace_id": context.get("trace_id")
-        }
\ No newline at end of file
+        }
@@ -1,5 +1,8 @@
-from typing import Dict, Any
-from integrations.llm import LLMRegistry
+from typing import Dict, Any, Tuple
+from config.settings import PROMPT_TOKEN_BUDGETS, PROMPT_LEGACY_SAMPLE_EVERY
+from integrations.llm import LLMRegistry, request_hints
+from monitoring.metrics import increment_metric
+from workflows.prompt_builder import PromptBuilder, PromptField
 
 
 class LeadFlow:
@@ -8,11 +11,29 @@ class LeadFlow:
     Executes ONLY if BrainRouter allows.
     """
 
-    def execute(self, user_input: str, intent: str,
-                context: Dict[str, Any]) -> Dict[str, Any]:
-        llm = LLMRegistry.get()
+    # Bump when prompt/behaviour changes (invalidates cached responses)
+    version = "2"
 
-        prompt = f"""
+    prompt_builder = PromptBuilder(
+        template="""
+        You are a lead qualification agent.
+
+        User Input:
+        {user_input}
+        {context}{history}
+        """,
+        fields=[
+            PromptField("customer_name", priority=1),
+            PromptField("source", priority=2, label="Lead source"),
+            PromptField("budget", priority=2),
+            PromptField("location", priority=3),
+            PromptField("timeline", priority=3),
+            PromptField("language", priority=4),
+            PromptField("notes", priority=6, max_chars=300),
+        ],
+        budget_tokens=PROMPT_TOKEN_BUDGETS["lead"],
+        legacy_sample_every=PROMPT_LEGACY_SAMPLE_EVERY,
+        legacy_template="""
         You are a lead qualification agent.
 
         User Input:
@@ -20,13 +41,38 @@ class LeadFlow:
 
         Context:
         {context}
+        """)
+
+    def execute(self, user_input: str, intent: str,
+                context: Dict[str, Any]) -> Dict[str, Any]:
+        llm = LLMRegistry.get()
+        prompt, report = self._build_prompt(user_input, context)
+        response = llm.generate(prompt, **request_hints(user_input, context))
+        return self._build_result(response, context, report)
+
+    async def aexecute(self, user_input: str, intent: str,
+                       context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Awaitable `execute` — used by BrainRouterAdvanced.aroute.
         """
+        llm = LLMRegistry.get()
+        prompt, report = self._build_prompt(user_input, context)
+        response = await llm.agenerate(prompt, **request_hints(user_input, context))
+        return self._build_result(response, context, report)
 
-        response = llm.generate(prompt)
+    def _build_prompt(self, user_input: str,
+                      context: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        prompt, report = self.prompt_builder.build(user_input, context)
+        increment_metric("prompt_tokens_saved", report.get("tokens_saved_estimate", 0))
+        return prompt, report
 
+    def _build_result(self, response: Dict[str, Any],
+                      context: Dict[str, Any],
+                      report: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "workflow": "lead",
             "status": "completed",
             "output": response,
+            "prompt": report,
             "trace_id": context.get("wisdom", {}).get("trace_id")
         }
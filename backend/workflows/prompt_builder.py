@@ -0,0 +1,166 @@
+"""
+Prompt Builder
+--------------
+Token-budgeted prompt assembly for workflows.
+
+- Templates are compiled once: dedented, split into literal text and
+  slots ({user_input}, {context}, {history}), literal token counts cached
+- Only whitelisted context fields are rendered (never trace ids, wisdom
+  output or arbitrary client payloads)
+- A per-workflow token budget is enforced by dropping the lowest-priority
+  pieces first: context fields by their priority, history oldest message
+  first. The user's input is never dropped.
+- Every build returns a report with the prompt's tokens. Every
+  `legacy_sample_every`-th build also renders the legacy "whole context
+  dict" prompt and reports the tokens saved against it, plus
+  `tokens_saved_estimate` (saved × sampling interval) for counters
+"""
+
+from string import Formatter
+from typing import Dict, Any, List, Optional, Tuple
+import itertools
+import textwrap
+
+from integrations.llm.tokenizer import count_tokens
+
+SLOTS = ("user_input", "context", "history")
+
+
+class PromptField:
+    """
+    A whitelisted context field. Lower priority number = kept longer.
+    """
+
+    __slots__ = ("name", "priority", "label", "max_chars")
+
+    def __init__(self, name: str, priority: int = 5,
+                 label: Optional[str] = None, max_chars: int = 500):
+        self.name = name
+        self.priority = priority
+        self.label = label or name.replace("_", " ").capitalize()
+        self.max_chars = max_chars
+
+
+class PromptTemplate:
+    """
+    A template compiled into (literal, slot) parts.
+    """
+
+    def __init__(self, template: str):
+        self.source = textwrap.dedent(template).strip() + "\n"
+        self.parts: List[Tuple[str, Optional[str]]] = []
+        for literal, slot, _, _ in Formatter().parse(self.source):
+            if slot is not None and slot not in SLOTS:
+                raise ValueError(f"Unknown prompt slot: {{{slot}}}")
+            self.parts.append((literal, slot))
+        self.literal_tokens = count_tokens("".join(p[0] for p in self.parts))
+
+    def render(self, values: Dict[str, str]) -> str:
+        return "".join(literal + (values.get(slot, "") if slot else "")
+                       for literal, slot in self.parts)
+
+
+class PromptBuilder:
+    """
+    Builds one workflow's prompt within its token budget.
+    """
+
+    def __init__(self,
+                 template: str,
+                 fields: List[PromptField],
+                 budget_tokens: int = 1024,
+                 history_priority: int = 8,
+                 history_limit: int = 20,
+                 legacy_template: Optional[str] = None,
+                 legacy_sample_every: int = 16):
+        self.template = PromptTemplate(template)
+        self.fields = sorted(fields, key=lambda f: f.priority)
+        # Context keys that can change the rendered prompt (response cache key)
+        slots = {slot for _, slot in self.template.parts}
+        self.context_keys = tuple(f.name for f in self.fields if "context" in slots) + \
+            (("history",) if "history" in slots else ())
+        self.budget_tokens = budget_tokens
+        self.history_priority = history_priority
+        self.history_limit = history_limit
+        self.legacy_template = legacy_template
+        self.legacy_sample_every = legacy_sample_every
+        self._builds = itertools.count()
+
+    def build(self, user_input: str,
+              context: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        (prompt, report)
+        """
+        context = context or {}
+        user_tokens = count_tokens(user_input)
+
+        # (priority, age, tokens, kind, key, text) — age orders history
+        pieces = []
+        for field in self.fields:
+            value = context.get(field.name)
+            if value in (None, "", [], {}):
+                continue
+            line = f"{field.label}: {str(value)[:field.max_chars]}\n"
+            pieces.append((field.priority, 0, count_tokens(line), "context",
+                           field.name, line))
+
+        history = context.get("history") or []
+        if isinstance(history, list):
+            recent = history[-self.history_limit:]
+            for age, message in enumerate(reversed(recent)):
+                line = self._history_line(message)
+                if line:
+                    pieces.append((self.history_priority, age, count_tokens(line),
+                                   "history", len(recent) - 1 - age, line))
+
+        # Drop lowest priority (then oldest) until within budget
+        total = self.template.literal_tokens + user_tokens + sum(p[2] for p in pieces)
+        dropped = []
+        for piece in sorted(pieces, key=lambda p: (-p[0], -p[1])):
+            if total <= self.budget_tokens:
+                break
+            pieces.remove(piece)
+            total -= piece[2]
+            dropped.append(piece[4] if piece[3] == "context" else f"history[{piece[4]}]")
+
+        context_lines = [p[5] for p in pieces if p[3] == "context"]
+        history_lines = sorted((p for p in pieces if p[3] == "history"),
+                               key=lambda p: p[4])
+        prompt = self.template.render({
+            "user_input": user_input,
+            "context": ("\nContext:\n" + "".join(context_lines)) if context_lines else "",
+            "history": ("\nConversation:\n" + "".join(p[5] for p in history_lines))
+            if history_lines else "",
+        })
+
+        report = {
+            "tokens": total,
+            "budget": self.budget_tokens,
+            "dropped": dropped,
+            "over_budget": total > self.budget_tokens,
+        }
+        if self._sample_legacy():
+            legacy = count_tokens(self.legacy_template.format(user_input=user_input,
+                                                              context=context))
+            report["legacy_tokens"] = legacy
+            report["tokens_saved"] = max(0, legacy - total)
+            report["tokens_saved_estimate"] = report["tokens_saved"] * self.legacy_sample_every
+        return prompt, report
+
+    def _sample_legacy(self) -> bool:
+        """
+        True on every `legacy_sample_every`-th build (the legacy prompt
+        formats the whole context dict, so it is not rendered per request).
+        """
+        if self.legacy_template is None or self.legacy_sample_every <= 0:
+            return False
+        return next(self._builds) % self.legacy_sample_every == 0
+
+    @staticmethod
+    def _history_line(message: Any) -> str:
+        if isinstance(message, dict):
+            content = message.get("content") or message.get("text")
+            if not content:
+                return ""
+            return f"{message.get('role', 'user')}: {content}\n"
+        return f"{message}\n" if message else ""
@@ -0,0 +1,268 @@
+"""
+Workflow Registry
+-----------------
+Lazy, per-tenant workflow lookup for BrainRouterAdvanced.
+
+- Built-in workflows are referenced as "module:Class" and only imported
+  and instantiated on first use
+- Tenant workflows live in client_projects/<client_id>/custom_workflows/
+  as <intent>.py modules exposing either a `Workflow` class or a
+  `create_workflow()` factory; they are discovered on a tenant's first
+  request and cached per tenant
+- Hot replacement: edited / added / removed tenant modules are picked up
+  (at most every `check_interval` seconds) without restarting workers.
+  In-flight requests keep the instance they already hold.
+- `aget` serves already-loaded workflows inline and runs directory scans
+  and module imports in a worker thread, so the event loop never blocks
+  on them (or on the registry lock)
+- At most `max_tenants` tenants are kept (LRU by rescan / load)
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
+import asyncio
+import functools
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+
+from clients.client_loader import ClientLoader
+from config.settings import CLIENT_PROJECTS_DIR, CLIENT_CACHE_MAX_TENANTS
+
+logger = logging.getLogger("WorkflowRegistry")
+
+BUILTIN_WORKFLOWS = {
+    "sales": "workflows.sales_flow:SalesFlow",
+    "lead": "workflows.lead_flow:LeadFlow",
+    "custom": "workflows.custom_flow:CustomFlow",
+}
+
+DEFAULT_WORKFLOW = "custom"
+
+
+def _ensure_async(workflow):
+    """
+    Give sync-only workflows an `aexecute` that runs in a worker thread.
+    """
+    if not hasattr(workflow, "aexecute"):
+        workflow.aexecute = functools.partial(asyncio.to_thread,
+                                              workflow.execute)
+    return workflow
+
+
+class _TenantWorkflows:
+    """
+    Discovered modules and loaded instances for one tenant.
+    """
+
+    def __init__(self, client_id: str):
+        self.client_id = client_id
+        self.directory = CLIENT_PROJECTS_DIR / client_id / "custom_workflows"
+        self.paths: Dict[str, Tuple[Any, int]] = {}   # intent -> (path, mtime_ns)
+        self.loaded: Dict[str, Tuple[int, Any]] = {}  # intent -> (mtime_ns, instance)
+        self.last_scan = 0.0
+
+    def scan(self):
+        self.last_scan = time.monotonic()
+        paths = {}
+        if self.directory.is_dir():
+            for path in self.directory.glob("*.py"):
+                if path.stem.startswith("_"):
+                    continue
+                try:
+                    paths[path.stem] = (path, path.stat().st_mtime_ns)
+                except OSError:
+                    continue
+        self.paths = paths
+        # Forget instances whose module disappeared
+        for intent in list(self.loaded):
+            if intent not in self.paths:
+                del self.loaded[intent]
+
+
+class WorkflowRegistry:
+    """
+    Resolves (intent, client_id) → workflow instance.
+    """
+
+    def __init__(self,
+                 builtins: Optional[Dict[str, str]] = None,
+                 check_interval: float = 2.0,
+                 max_tenants: int = CLIENT_CACHE_MAX_TENANTS):
+        self.builtins = dict(BUILTIN_WORKFLOWS if builtins is None else builtins)
+        self.check_interval = check_interval
+        self.max_tenants = max_tenants
+
+        # (client_id | None, intent) -> instance, for built-ins and
+        # programmatically registered factories
+        self._instances: Dict[Tuple[Optional[str], str], Any] = {}
+        self._factories: Dict[Tuple[Optional[str], str], Callable[[], Any]] = {}
+        self._tenants: "OrderedDict[str, _TenantWorkflows]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, intent: str, client_id: Optional[str] = None):
+        """
+        Tenant workflow for `intent` if one exists, else the built-in one,
+        else the default (custom) workflow.
+        """
+        if client_id:
+            workflow = self._tenant_workflow(client_id, intent)
+            if workflow is not None:
+                return workflow
+
+        if intent not in self.builtins and (None, intent) not in self._factories:
+            intent = DEFAULT_WORKFLOW
+        return self._builtin_workflow(intent)
+
+    async def aget(self, intent: str, client_id: Optional[str] = None):
+        """
+        Awaitable `get`: loaded, up-to-date workflows are returned inline;
+        scans and imports run in a worker thread.
+        """
+        workflow = self._peek(intent, client_id)
+        if workflow is None:
+            workflow = await asyncio.to_thread(self.get, intent, client_id)
+        return workflow
+
+    def register(self, intent: str, factory: Callable[[], Any],
+                 client_id: Optional[str] = None):
+        """
+        Programmatic registration (replaces any existing entry).
+        """
+        with self._lock:
+            self._factories[(client_id, intent)] = factory
+            self._instances.pop((client_id, intent), None)
+
+    def reload(self, client_id: Optional[str] = None):
+        """
+        Drop cached instances so the next request re-imports them.
+        With no client_id every tenant is reloaded.
+        """
+        with self._lock:
+            if client_id is None:
+                self._tenants.clear()
+            else:
+                self._tenants.pop(client_id, None)
+
+    def loaded(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "instances": sorted(f"{client_id or '*'}/{intent}"
+                                    for client_id, intent in self._instances),
+                "tenant_modules": {
+                    client_id: sorted(tenant.loaded)
+                    for client_id, tenant in self._tenants.items()
+                },
+            }
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _peek(self, intent: str, client_id: Optional[str] = None):
+        """
+        The workflow `get` would return, if that needs no scan, import or
+        lock; None otherwise.
+        """
+        if client_id:
+            if (client_id, intent) in self._factories:
+                return self._instances.get((client_id, intent))
+            if ClientLoader.is_valid_client_id(client_id):
+                tenant = self._tenants.get(client_id)
+                if tenant is None or \
+                        time.monotonic() - tenant.last_scan > self.check_interval:
+                    return None
+                found = tenant.paths.get(intent)
+                if found is not None:
+                    entry = tenant.loaded.get(intent)
+                    if entry is None or entry[0] != found[1]:
+                        return None
+                    return entry[1]
+
+        if intent not in self.builtins and (None, intent) not in self._factories:
+            intent = DEFAULT_WORKFLOW
+        return self._instances.get((None, intent))
+
+    def _builtin_workflow(self, intent: str, client_id: Optional[str] = None):
+        key = (client_id, intent)
+        workflow = self._instances.get(key)
+        if workflow is not None:
+            return workflow
+
+        with self._lock:
+            workflow = self._instances.get(key)
+            if workflow is None:
+                factory = self._factories.get(key)
+                if factory is not None:
+                    workflow = factory()
+                else:
+                    module_name, class_name = self.builtins[intent].split(":")
+                    module = importlib.import_module(module_name)
+                    workflow = getattr(module, class_name)()
+                workflow = _ensure_async(workflow)
+                self._instances[key] = workflow
+                logger.info(f"Loaded workflow: {client_id or '*'}/{intent}")
+        return workflow
+
+    def _tenant_workflow(self, client_id: str, intent: str):
+        if (client_id, intent) in self._factories:
+            return self._builtin_workflow(intent, client_id)
+        if not ClientLoader.is_valid_client_id(client_id):
+            return None
+
+        with self._lock:
+            tenant = self._tenants.get(client_id)
+            if tenant is None:
+                tenant = self._tenants[client_id] = _TenantWorkflows(client_id)
+                tenant.scan()
+                while len(self._tenants) > self.max_tenants:
+                    self._tenants.popitem(last=False)
+            elif time.monotonic() - tenant.last_scan > self.check_interval:
+                tenant.scan()
+            self._tenants.move_to_end(client_id)
+
+            found = tenant.paths.get(intent)
+            if found is None:
+                return None
+            path, mtime_ns = found
+
+            entry = tenant.loaded.get(intent)
+            if entry is not None and entry[0] == mtime_ns:
+                return entry[1]
+
+            try:
+                workflow = self._import_tenant_module(client_id, intent, path,
+                                                      mtime_ns)
+            except Exception as e:
+                logger.error(f"Failed to load workflow {client_id}/{intent}: {e}")
+                # Keep serving the previous version if there is one
+                return entry[1] if entry is not None else None
+
+            tenant.loaded[intent] = (mtime_ns, workflow)
+            logger.info(f"Loaded workflow: {client_id}/{intent}"
+                        f"{' (replaced)' if entry is not None else ''}")
+            return workflow
+
+    @staticmethod
+    def _import_tenant_module(client_id: str, intent: str, path, mtime_ns: int):
+        module_name = f"chetna_client_workflows.{client_id}.{intent}"
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        if hasattr(module, "create_workflow"):
+            workflow = module.create_workflow()
+        elif hasattr(module, "Workflow"):
+            workflow = module.Workflow()
+        else:
+            raise ImportError(f"{path} defines neither Workflow nor create_workflow()")
+
+        # Hot-replaced code must never be served from stale response cache
+        workflow.version = f"{getattr(workflow, 'version', '0')}@{mtime_ns}"
+        return _ensure_async(workflow)
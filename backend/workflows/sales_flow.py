@@ -1,5 +1,8 @@
-from typing import Dict, Any
-from integrations.llm import LLMRegistry
+from typing import Dict, Any, AsyncIterator, Tuple
+from config.settings import PROMPT_TOKEN_BUDGETS, PROMPT_LEGACY_SAMPLE_EVERY
+from integrations.llm import LLMRegistry, request_hints
+from monitoring.metrics import increment_metric
+from workflows.prompt_builder import PromptBuilder, PromptField
 
 
 class SalesFlow:
@@ -7,11 +10,29 @@ class SalesFlow:
     Sales-specific workflow.
     """
 
-    def execute(self, user_input: str, intent: str,
-                context: Dict[str, Any]) -> Dict[str, Any]:
-        llm = LLMRegistry.get()
+    # Bump when prompt/behaviour changes (invalidates cached responses)
+    version = "2"
+
+    prompt_builder = PromptBuilder(
+        template="""
+        You are a sales assistant.
 
-        prompt = f"""
+        User Input:
+        {user_input}
+        {context}{history}
+        """,
+        fields=[
+            PromptField("customer_name", priority=1),
+            PromptField("product", priority=1),
+            PromptField("budget", priority=2),
+            PromptField("location", priority=2),
+            PromptField("language", priority=3),
+            PromptField("stage", priority=4, label="Sales stage"),
+            PromptField("notes", priority=6, max_chars=300),
+        ],
+        budget_tokens=PROMPT_TOKEN_BUDGETS["sales"],
+        legacy_sample_every=PROMPT_LEGACY_SAMPLE_EVERY,
+        legacy_template="""
         You are a sales assistant.
 
         User Input:
@@ -19,13 +40,57 @@ class SalesFlow:
 
         Context:
         {context}
+        """)
+
+    def execute(self, user_input: str, intent: str,
+                context: Dict[str, Any]) -> Dict[str, Any]:
+        llm = LLMRegistry.get()
+        prompt, report = self._build_prompt(user_input, context)
+        response = llm.generate(prompt, **request_hints(user_input, context))
+        return self._build_result(response, context, report)
+
+    async def aexecute(self, user_input: str, intent: str,
+                       context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Awaitable `execute` — used by BrainRouterAdvanced.aroute.
+        """
+        llm = LLMRegistry.get()
+        prompt, report = self._build_prompt(user_input, context)
+        response = await llm.agenerate(prompt, **request_hints(user_input, context))
+        return self._build_result(response, context, report)
+
+    async def astream(self, user_input: str, intent: str,
+                      context: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming `execute`.
+
+        Yields {"type": "chunk", "text": str} as the LLM produces text,
+        then exactly one {"type": "result", "output": <execute result>}.
         """
+        llm = LLMRegistry.get()
+        prompt, report = self._build_prompt(user_input, context)
+        parts = []
+        async for chunk in llm.astream(prompt, **request_hints(user_input, context)):
+            parts.append(chunk)
+            yield {"type": "chunk", "text": chunk}
+
+        response = {"text": "".join(parts)}
+        yield {"type": "result",
+               "output": self._build_result(response, context, report)}
 
-        response = llm.generate(prompt)
+    def _build_prompt(self, user_input: str,
+                      context: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        prompt, report = self.prompt_builder.build(user_input, context)
+        increment_metric("prompt_tokens_saved", report.get("tokens_saved_estimate", 0))
+        return prompt, report
 
+    def _build_result(self, response: Dict[str, Any],
+                      context: Dict[str, Any],
+                      report: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "workflow": "sales",
             "status": "completed",
             "output": response,
+            "prompt": report,
             "trace_id": context.get("wisdom", {}).get("trace_id")
         }
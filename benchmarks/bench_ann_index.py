@@ -0,0 +1,105 @@
+"""
+Benchmark — approximate vs exact semantic search (recall vs latency).
+
+Builds the exact VectorStore and the ANN indexes over the same clustered
+corpus, then for every setting reports recall@k against the exact top-k
+and the mean per-query latency:
+
+- IVFIndex for each `nprobe` in --nprobe
+- HNSWIndex for each `ef` in --ef (skipped if hnswlib is not installed)
+
+Usage:
+    python benchmarks/bench_ann_index.py [--size 200000] [--dim 128]
+                                         [--nlist 512] [--nprobe 1,2,4,8,16,32]
+                                         [--ef 16,32,64,128]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from memory.vector_store import VectorStore  # noqa: E402
+from memory.ann_index import IVFIndex, HNSWIndex, hnswlib  # noqa: E402
+
+
+def corpus(size, dim, seed=0):
+    """
+    Gaussian clusters around random topics (embeddings are never uniform).
+    """
+    rng = np.random.default_rng(seed)
+    topics = 0.2 * rng.standard_normal((max(16, size // 500), dim), dtype=np.float32)
+    labels = rng.integers(0, len(topics), size)
+    vectors = topics[labels] + 0.2 * rng.standard_normal((size, dim), dtype=np.float32)
+    queries = topics[rng.integers(0, len(topics), 500)]
+    queries += 0.2 * rng.standard_normal(queries.shape, dtype=np.float32)
+    return vectors, queries
+
+
+def build(index, vectors, chunk=50_000):
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), chunk):
+        block = vectors[offset:offset + chunk]
+        index.add_many([str(i) for i in range(offset, offset + len(block))], block)
+    return time.perf_counter() - start
+
+
+def measure(index, queries, truth, top_k):
+    index.search(queries[0], top_k)  # warm-up
+    start = time.perf_counter()
+    found = [index.search(query, top_k) for query in queries]
+    latency = (time.perf_counter() - start) / len(queries)
+    recall = np.mean([len({h[1] for h in hits} & expected) / len(expected)
+                      for hits, expected in zip(found, truth)])
+    return recall, latency
+
+
+def report(name, recall, latency, exact_latency):
+    print(f"{name:<22} recall@k {recall:6.3f}   {latency * 1000:8.3f} ms/q   "
+          f"{exact_latency / latency:6.1f}× exact")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=512)
+    parser.add_argument("--nprobe", default="1,2,4,8,16,32")
+    parser.add_argument("--ef", default="16,32,64,128")
+    args = parser.parse_args()
+
+    vectors, queries = corpus(args.size, args.dim)
+    queries = queries[:args.queries]
+
+    exact = VectorStore(dim=args.dim, capacity=args.size)
+    print(f"exact build   {build(exact, vectors):7.2f} s")
+    truth = [{h[1] for h in hits} for hits in exact.search_many(queries, args.top_k)]
+    _, exact_latency = measure(exact, queries, truth, args.top_k)
+    report("exact", 1.0, exact_latency, exact_latency)
+
+    ivf = IVFIndex(dim=args.dim, nlist=args.nlist)
+    print(f"ivf build     {build(ivf, vectors):7.2f} s  (nlist={args.nlist})")
+    for nprobe in (int(n) for n in args.nprobe.split(",")):
+        ivf.nprobe = nprobe
+        report(f"ivf nprobe={nprobe}", *measure(ivf, queries, truth, args.top_k),
+               exact_latency)
+
+    if hnswlib is None:
+        print("hnsw          skipped (pip install hnswlib)")
+        return
+    hnsw = HNSWIndex(dim=args.dim, capacity=args.size)
+    print(f"hnsw build    {build(hnsw, vectors):7.2f} s")
+    for ef in (int(e) for e in args.ef.split(",")):
+        hnsw.ef = ef
+        report(f"hnsw ef={ef}", *measure(hnsw, queries, truth, args.top_k),
+               exact_latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark — concurrent /process throughput, sync route vs async aroute.
+
+Runs N concurrent requests through BrainRouterAdvanced against a slow
+stand-in LLM provider (fixed per-call latency, no network):
+
+- sync:          `route` called from the event loop (old /process behaviour)
+- aroute/thread: `aroute` with a provider that only implements `generate`
+                 (default `agenerate` offloads to a worker thread)
+- aroute/native: `aroute` with a provider that implements `agenerate`
+
+Usage:
+    python benchmarks/bench_async_route.py [--requests 50] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from integrations.llm import BaseLLMProvider, LLMRegistry  # noqa: E402
+from orchestrator.brain_router_advanced import BrainRouterAdvanced  # noqa: E402
+
+
+class SlowProvider(BaseLLMProvider):
+    """Stand-in provider with a fixed blocking latency."""
+
+    def __init__(self, latency: float):
+        super().__init__({})
+        self.latency = latency
+
+    def generate(self, prompt, context=None, **kwargs):
+        time.sleep(self.latency)
+        return {"text": "ok", "tokens_used": 1, "model": "slow", "latency_ms": 0}
+
+    def health_check(self) -> bool:
+        return True
+
+
+class SlowAsyncProvider(SlowProvider):
+    """Stand-in provider with a native async path."""
+
+    async def agenerate(self, prompt, context=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return {"text": "ok", "tokens_used": 1, "model": "slow", "latency_ms": 0}
+
+
+INPUTS = ["price of plots?", "hello there", "I need help", "new lead contact"]
+
+
+async def run_sync(router, n):
+    for i in range(n):
+        router.route(INPUTS[i % len(INPUTS)], {})
+
+
+async def run_async(router, n):
+    await asyncio.gather(*(router.aroute(INPUTS[i % len(INPUTS)], {})
+                           for i in range(n)))
+
+
+def measure(label, coro_factory, n):
+    start = time.perf_counter()
+    asyncio.run(coro_factory())
+    elapsed = time.perf_counter() - start
+    print(f"{label:<16} {n:>5} req  {elapsed:8.2f}s  {n / elapsed:8.1f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    router = BrainRouterAdvanced()
+    n = args.requests
+
+    LLMRegistry.register(SlowProvider(args.latency))
+    measure("sync", lambda: run_sync(router, n), n)
+    measure("aroute/thread", lambda: run_async(router, n), n)
+
+    LLMRegistry.register(SlowAsyncProvider(args.latency))
+    measure("aroute/native", lambda: run_async(router, n), n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark — CostGuard ledger hot-path cost and cross-worker enforcement.
+
+1. Per-call overhead of reserve + commit (leased, in-memory) compared
+   with a direct SQLite transaction per call.
+2. N worker processes hammer one ledger file with a small daily cap;
+   the total committed usage must never exceed the cap.
+
+Usage:
+    python benchmarks/bench_cost_ledger.py [--calls 100000] [--workers 4]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from integrations.llm.ledger import TokenLedger, BudgetExceeded  # noqa: E402
+
+
+def bench_hot_path(path, calls):
+    ledger = TokenLedger(path, daily_token_limit=10**12, daily_cost_limit=10**9)
+    start = time.perf_counter()
+    for _ in range(calls):
+        reservation = ledger.reserve("bench", 300, 0.0002)
+        ledger.commit(reservation, 280, 0.00018)
+    elapsed = time.perf_counter() - start
+    print(f"leased reserve+commit   {elapsed / calls * 1e6:8.2f} µs/call")
+
+    # Lease of one call: every reservation goes to the shared file
+    direct = TokenLedger(path + ".direct", daily_token_limit=10**12,
+                         daily_cost_limit=10**9, lease_tokens=1)
+    n = min(calls, 5000)
+    start = time.perf_counter()
+    for _ in range(n):
+        reservation = direct.reserve("bench", 300, 0.0002)
+        direct.commit(reservation, 300, 0.0002)
+    elapsed = time.perf_counter() - start
+    print(f"per-call SQLite lease   {elapsed / n * 1e6:8.2f} µs/call")
+    ledger.close()
+    direct.close()
+
+
+def _worker(path, limit, results):
+    ledger = TokenLedger(path, daily_token_limit=limit, daily_cost_limit=10**9,
+                         lease_tokens=500, flush_interval=0.0)
+    used = 0
+    while True:
+        try:
+            reservation = ledger.reserve("worker", 100, 0.0)
+        except BudgetExceeded:
+            break
+        ledger.commit(reservation, 100, 0.0)
+        used += 100
+    ledger.close()
+    results.put(used)
+
+
+def bench_workers(path, workers, limit):
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_worker, args=(path, limit, results))
+             for _ in range(workers)]
+    for p in procs:
+        p.start()
+    used = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    snapshot = TokenLedger(path).snapshot()
+    print(f"{workers} workers, cap {limit} tokens: used {sum(used)} "
+          f"(per worker {used}), ledger says {snapshot['tokens_used_today']}")
+    assert sum(used) <= limit
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_hot_path(os.path.join(tmp, "hot.sqlite3"), args.calls)
+        bench_workers(os.path.join(tmp, "shared.sqlite3"), args.workers, args.limit)
+
+
+if __name__ == "__main__":
+    main()
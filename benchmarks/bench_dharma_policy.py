@@ -0,0 +1,77 @@
+"""
+Benchmark — DharmaNet policy evaluation at 10k rules.
+
+Compares the compiled PolicyEngine against the legacy per-keyword
+substring loop. The rule set is mostly keyword/phrase rules plus a
+slice of regex rules, some scoped to intents.
+
+Usage:
+    python benchmarks/bench_dharma_policy.py [--rules 10000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from reflection.dharma_net import DharmaNet  # noqa: E402
+
+TEXTS = [
+    "Namaste, what is the price of the 2 acre plot near the highway?",
+    "please share the brochure and site visit timings for this weekend",
+    "this message mentions forbidden term 4242 somewhere in the middle",
+]
+
+
+def build_rules(n, regex_share=0.02):
+    n_regex = int(n * regex_share)
+    rules = []
+    for i in range(n - n_regex):
+        keywords = [f"term{i}"] if i % 3 else [f"forbidden term {i}"]
+        rule = {"id": f"kw-{i}", "keywords": keywords}
+        if i % 5 == 0:
+            rule["intents"] = ["sales"]
+        rules.append(rule)
+    for i in range(n_regex):
+        rules.append({"id": f"rx-{i}", "regex": f"code-{i}-[0-9]+",
+                      "action": "warn"})
+    return rules
+
+
+def legacy_validate(keywords, text):
+    text = text.lower()
+    for keyword in keywords:
+        if keyword in text:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rules", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rules = build_rules(args.rules)
+    legacy_keywords = [kw for r in rules for kw in r.get("keywords", [])]
+
+    compile_time = timeit.timeit(lambda: DharmaNet(rules), number=1)
+    dharma = DharmaNet(rules)
+
+    n = 500
+    legacy = timeit.timeit(
+        lambda: [legacy_validate(legacy_keywords, t) for t in TEXTS], number=n)
+    compiled = timeit.timeit(
+        lambda: [dharma.validate("sales", 3, {}, t) for t in TEXTS], number=n)
+
+    calls = n * len(TEXTS)
+    print(f"rules:            {len(rules)}")
+    print(f"compile:          {compile_time * 1e3:8.1f} ms (once per rule set)")
+    print(f"legacy loop:      {legacy / calls * 1e6:8.1f} us/call")
+    print(f"compiled policy:  {compiled / calls * 1e6:8.1f} us/call")
+    print(f"matched example:  {dharma.validate('sales', 3, {}, TEXTS[2])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark — built-in HashingEmbedder throughput and similarity sanity.
+
+1. Texts/second embedding short chat messages one at a time vs in
+   batches (`embed_many`) of several sizes.
+2. Cosine similarity of a few paraphrase / unrelated pairs, to help pick
+   a semantic-cache threshold.
+
+Usage:
+    python benchmarks/bench_hashing_embedder.py [--texts 50000] [--dim 256]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from memory.hashing_embedder import HashingEmbedder  # noqa: E402
+
+WORDS = ("order refund price plan premium password reset account invoice "
+         "delivery late cancel upgrade support thanks please help when where "
+         "how much my the is a can I you").split()
+
+PAIRS = [
+    ("What is the price of the premium plan?", "how much does the premium plan cost"),
+    ("I want to reset my password", "how do I reset my password?"),
+    ("Where is my order?", "my order has not arrived yet"),
+    ("Where is my order?", "What is the price of the premium plan?"),
+    ("Cancel my subscription please", "I love the new dashboard"),
+]
+
+
+def messages(count, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14)))
+            for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=256)
+    args = parser.parse_args()
+
+    embedder = HashingEmbedder(dim=args.dim)
+    texts = messages(args.texts)
+
+    single = texts[:min(len(texts), 5000)]
+    start = time.perf_counter()
+    for text in single:
+        embedder(text)
+    print(f"one at a time   {len(single) / (time.perf_counter() - start):10,.0f} texts/s")
+
+    for batch in (32, 256, 4096):
+        start = time.perf_counter()
+        for offset in range(0, len(texts), batch):
+            embedder.embed_many(texts[offset:offset + batch])
+        rate = len(texts) / (time.perf_counter() - start)
+        print(f"batch {batch:<6}    {rate:10,.0f} texts/s")
+
+    print()
+    for a, b in PAIRS:
+        vectors = embedder.embed_many([a, b])
+        print(f"{float(vectors[0] @ vectors[1]):5.2f}  {a!r} ~ {b!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Micro-benchmark — IntentDetector per-call cost vs keyword-list size.
+
+Compares the compiled KeywordMatcher against the legacy nested
+`word in text` scan as each intent's keyword list grows.
+
+Usage:
+    python benchmarks/bench_intent_detector.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from orchestrator.intent_detector import DEFAULT_INTENT_MAP, IntentDetector  # noqa: E402
+
+TEXTS = [
+    "Namaste, what is the price of the 2 acre plot near the highway?",
+    "I have a problem with my invoice, please help",
+    "random message that matches nothing at all in the keyword lists",
+]
+
+
+def legacy_detect(intent_map, text):
+    text = text.lower()
+    for intent, keywords in intent_map.items():
+        for word in keywords:
+            if word in text:
+                return intent
+    return "custom"
+
+
+def grown_map(per_intent):
+    return {
+        intent: keywords + [f"{intent}kw{i}" for i in range(per_intent)]
+        for intent, keywords in DEFAULT_INTENT_MAP.items()
+    }
+
+
+def main():
+    print(f"{'keywords':>9} {'legacy us/call':>15} {'compiled us/call':>17}")
+    for per_intent in (0, 100, 1_000, 5_000):
+        intent_map = grown_map(per_intent)
+        detector = IntentDetector(intent_map)
+        total = sum(len(v) for v in intent_map.values())
+
+        n = 2_000
+        legacy = timeit.timeit(
+            lambda: [legacy_detect(intent_map, t) for t in TEXTS], number=n)
+        compiled = timeit.timeit(
+            lambda: [detector.detect(t) for t in TEXTS], number=n)
+
+        calls = n * len(TEXTS)
+        print(f"{total:>9} {legacy / calls * 1e6:>15.2f} "
+              f"{compiled / calls * 1e6:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
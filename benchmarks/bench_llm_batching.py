@@ -0,0 +1,82 @@
+"""
+Benchmark — micro-batching throughput vs added latency.
+
+N concurrent callers send `agenerate` calls to a stand-in inference
+server that processes at most `--slots` requests at once, with a fixed
+cost per request plus a small cost per prompt (like a GPU server's
+decode slots). Compares direct calls with MicroBatcher at several
+windows / batch sizes.
+
+Usage:
+    python benchmarks/bench_llm_batching.py [--calls 400] [--clients 64]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from integrations.llm.http_pool import HTTPPool  # noqa: E402
+from integrations.llm.micro_batcher import MicroBatcher  # noqa: E402
+from integrations.llm.openai_compat import OpenAICompatibleProvider  # noqa: E402
+from standin_llm_server import start_in_thread  # noqa: E402
+
+
+async def run(provider, calls, clients):
+    queue = asyncio.Queue()
+    for i in range(calls):
+        queue.put_nowait(f"prompt {i}")
+    latencies = []
+
+    async def client():
+        while not queue.empty():
+            prompt = queue.get_nowait()
+            start = time.perf_counter()
+            response = await provider.agenerate(prompt)
+            latencies.append(time.perf_counter() - start)
+            assert response["text"].endswith(prompt), response
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (calls / elapsed, latencies[len(latencies) // 2] * 1000,
+            latencies[int(len(latencies) * 0.99)] * 1000)
+
+
+async def main(args):
+    server = start_in_thread(latency=args.latency, concurrency=args.slots,
+                             per_prompt_latency=args.per_prompt_latency)
+    base = OpenAICompatibleProvider({"base_url": server.url, "model": "standin-1",
+                                     "batch_completions": True})
+
+    print(f"{args.calls} calls, {args.clients} clients, server: {args.slots} slots, "
+          f"{args.latency * 1000:.0f} ms/request + "
+          f"{args.per_prompt_latency * 1000:.1f} ms/prompt\n")
+    print(f"{'mode':<26} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'upstream':>9}")
+
+    configs = [("direct", None)] + [
+        (f"batch window={w}ms max={b}", (w, b))
+        for w, b in ((2, 8), (5, 16), (10, 32), (20, 64))]
+    for label, config in configs:
+        provider = base if config is None else MicroBatcher(base, *config)
+        server.reset_stats()
+        throughput, p50, p99 = await run(provider, args.calls, args.clients)
+        print(f"{label:<26} {throughput:8.1f} {p50:8.1f} {p99:8.1f} "
+              f"{server.stats()['requests']:9d}")
+
+    await HTTPPool.aclose_all()
+    server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--per-prompt-latency", type=float, default=0.0005)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,103 @@
+"""
+Benchmark — per-call connection overhead, fresh client vs shared pool.
+
+Runs N calls against the stand-in OpenAI-compatible server:
+
+- fresh/sync:    new httpx.Client per call (connect + teardown every time)
+- pooled/sync:   GroqProvider-style `generate` through HTTPPool
+- fresh/async:   new httpx.AsyncClient per call, N concurrent
+- pooled/async:  `agenerate` through HTTPPool, N concurrent
+
+Reports wall time, per-call latency and how many TCP connections the
+server accepted.
+
+Usage:
+    python benchmarks/bench_llm_pool.py [--calls 200] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import httpx  # noqa: E402
+
+from integrations.llm.http_pool import HTTPPool  # noqa: E402
+from integrations.llm.openai_compat import OpenAICompatibleProvider  # noqa: E402
+from standin_llm_server import start_in_thread  # noqa: E402
+
+PAYLOAD = {"model": "standin-1",
+           "messages": [{"role": "user", "content": "hello"}]}
+
+
+def report(label, server, calls, elapsed):
+    stats = server.stats()
+    print(f"{label:<14} {elapsed * 1000:8.1f} ms total  "
+          f"{elapsed / calls * 1e6:8.1f} µs/call  "
+          f"connections={stats['connections']}")
+    server.reset_stats()
+
+
+def bench_sync(server, provider, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        with httpx.Client(base_url=server.url) as client:
+            client.post("/chat/completions", json=PAYLOAD).raise_for_status()
+    report("fresh/sync", server, calls, time.perf_counter() - start)
+
+    provider.generate("warmup")
+    server.reset_stats()
+    start = time.perf_counter()
+    for _ in range(calls):
+        provider.generate("hello")
+    report("pooled/sync", server, calls, time.perf_counter() - start)
+
+
+async def bench_async(server, provider, calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fresh():
+        async with semaphore:
+            async with httpx.AsyncClient(base_url=server.url) as client:
+                (await client.post("/chat/completions", json=PAYLOAD)).raise_for_status()
+
+    async def pooled():
+        async with semaphore:
+            await provider.agenerate("hello")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(fresh() for _ in range(calls)))
+    report("fresh/async", server, calls, time.perf_counter() - start)
+
+    await provider.agenerate("warmup")
+    server.reset_stats()
+    start = time.perf_counter()
+    await asyncio.gather(*(pooled() for _ in range(calls)))
+    report("pooled/async", server, calls, time.perf_counter() - start)
+    await HTTPPool.aclose_all()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="stand-in server latency per request (s)")
+    args = parser.parse_args()
+
+    server = start_in_thread(latency=args.latency)
+    provider = OpenAICompatibleProvider({"base_url": server.url,
+                                         "model": "standin-1"})
+    print(f"{args.calls} calls, concurrency {args.concurrency}, "
+          f"server latency {args.latency * 1000:.0f} ms\n")
+
+    bench_sync(server, provider, args.calls)
+    asyncio.run(bench_async(server, provider, args.calls, args.concurrency))
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
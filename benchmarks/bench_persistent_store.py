@@ -0,0 +1,102 @@
+"""
+Benchmark — PersistentVectorStore restart cost.
+
+1. Builds a store of --size vectors on disk and closes it.
+2. In a fresh process: time to reopen, heap growth (RSS) after reopen,
+   first-query and steady-state query latency.
+3. The same for an in-memory VectorStore rebuilt from the raw vectors
+   (the best case of "load everything at boot", before any re-embedding).
+
+Usage:
+    python benchmarks/bench_persistent_store.py [--size 1000000] [--dim 128]
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from memory.persistent_store import PersistentVectorStore  # noqa: E402
+from memory.vector_store import VectorStore  # noqa: E402
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def build(path, size, dim):
+    rng = np.random.default_rng(0)
+    store = PersistentVectorStore(path, dim=dim)
+    start = time.perf_counter()
+    for offset in range(0, size, 100_000):
+        block = rng.standard_normal((min(100_000, size - offset), dim), dtype=np.float32)
+        store.add_many([f"doc-{i}" for i in range(offset, offset + len(block))], block)
+    store.close()
+    print(f"build      {time.perf_counter() - start:7.2f} s  ({size:,} × {dim})")
+    np.save(os.path.join(path, "..", "raw.npy"), np.concatenate(
+        [np.memmap(os.path.join(path, name), dtype=np.float32, mode="r").reshape(-1, dim)
+         for name in sorted(os.listdir(path)) if name.endswith(".f32")]))
+
+
+def restart(kind, path, dim):
+    """
+    Runs in a child process so RSS starts from a clean interpreter.
+    """
+    query = np.random.default_rng(1).standard_normal(dim, dtype=np.float32)
+    base = rss_mb()
+    start = time.perf_counter()
+    if kind == "persistent":
+        store = PersistentVectorStore(path)
+    else:
+        raw = np.load(os.path.join(path, "..", "raw.npy"))
+        store = VectorStore(dim=dim, capacity=len(raw))
+        store.add_many([f"doc-{i}" for i in range(len(raw))], raw)
+        del raw
+    opened = time.perf_counter() - start
+    heap = rss_mb() - base
+
+    start = time.perf_counter()
+    store.search(query, 10)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(10):
+        store.search(query, 10)
+    steady = (time.perf_counter() - start) / 10
+    print(f"{kind:<10} open {opened:6.2f} s   RSS after open +{heap:7.1f} MB   "
+          f"first query {first * 1000:8.1f} ms   then {steady * 1000:6.1f} ms/q")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--child", choices=("persistent", "memory"))
+    parser.add_argument("--path")
+    args = parser.parse_args()
+
+    if args.child:
+        restart(args.child, args.path, args.dim)
+        return
+
+    root = tempfile.mkdtemp(prefix="bench-vectors-")
+    path = os.path.join(root, "store")
+    try:
+        build(path, args.size, args.dim)
+        for kind in ("persistent", "memory"):
+            subprocess.run([sys.executable, __file__, "--child", kind,
+                            "--path", path, "--dim", str(args.dim)], check=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark — full BrainRouterAdvanced pipeline on a replayed LLM.
+
+Records a small cassette against the stand-in server (or uses
+--cassette), then replays it through `aroute` under each latency model
+and reports throughput and p50 / p99 / max request latency. No network
+or API key needed.
+
+Usage:
+    python benchmarks/bench_replay_pipeline.py [--requests 500] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from integrations.llm import LLMRegistry  # noqa: E402
+from integrations.llm.http_pool import HTTPPool  # noqa: E402
+from integrations.llm.openai_compat import OpenAICompatibleProvider  # noqa: E402
+from integrations.llm.replay import ReplayProvider  # noqa: E402
+from orchestrator.brain_router_advanced import BrainRouterAdvanced  # noqa: E402
+from standin_llm_server import start_in_thread  # noqa: E402
+
+INPUTS = [
+    "I want to buy a plot, what is the price?",
+    "plot ka rate kya hai",
+    "my order has not arrived, need support",
+    "tell me about your company",
+    "I am interested, please call me back",
+]
+
+
+async def record(path):
+    server = start_in_thread(latency=0.08)
+    recorder = ReplayProvider(path, mode="record",
+                              inner=OpenAICompatibleProvider({"base_url": server.url}))
+    LLMRegistry.register(recorder)
+    router = BrainRouterAdvanced()
+    for text in INPUTS:
+        await router.aroute(text, {"client_id": "bench"})
+    recorder.close()
+    await HTTPPool.aclose_all()
+    server.stop()
+    print(f"recorded {recorder.recorded} calls → {path}")
+
+
+async def replay(path, label, requests, concurrency, **latency):
+    LLMRegistry.register(ReplayProvider(path, mode="replay", **latency))
+    router = BrainRouterAdvanced()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await router.aroute(INPUTS[i % len(INPUTS)], {"client_id": "bench"})
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    router.reflection_sink.stop()
+
+    latencies.sort()
+    print(f"{label:<14} {requests / elapsed:8.1f} req/s   "
+          f"p50 {latencies[len(latencies) // 2] * 1000:7.1f} ms   "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f} ms   "
+          f"max {latencies[-1] * 1000:7.1f} ms")
+
+
+async def main(args):
+    path = args.cassette
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "cassette.jsonl.gz")
+        await record(path)
+
+    await replay(path, "recorded", args.requests, args.concurrency,
+                 latency="recorded")
+    await replay(path, "fixed 100ms", args.requests, args.concurrency,
+                 latency="fixed", fixed_ms=100)
+    await replay(path, "lognormal+tail", args.requests, args.concurrency,
+                 latency="distribution", median_ms=100, spike_prob=0.02,
+                 spike_factor=10)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--cassette", default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,92 @@
+"""
+Benchmark — VectorStore exact search at growing corpus sizes.
+
+1. Single-query `search` latency (matrix-vector product + argpartition)
+   at 10k / 100k / 1M vectors.
+2. Batched `search_many` throughput (one matrix multiply per batch).
+3. At the smallest size, the legacy per-item Python cosine loop for
+   comparison (larger sizes would take minutes).
+
+1M × 128 float32 vectors take ~512 MB.
+
+Usage:
+    python benchmarks/bench_vector_store.py [--sizes 10000,100000,1000000]
+                                            [--dim 128] [--queries 50]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from memory.vector_store import VectorStore  # noqa: E402
+
+
+def legacy_search(items, query, top_k):
+    scored = []
+    for item_id, vector in items:
+        dot = sum(a * b for a, b in zip(query, vector))
+        norm = math.sqrt(sum(a * a for a in query)) * math.sqrt(sum(b * b for b in vector))
+        scored.append((dot / (norm + 1e-8), item_id))
+    scored.sort(reverse=True)
+    return scored[:top_k]
+
+
+def bench_size(n, dim, queries, batch, top_k, legacy):
+    rng = np.random.default_rng(n)
+    store = VectorStore(dim=dim, capacity=n)
+    start = time.perf_counter()
+    chunk = 100_000
+    for offset in range(0, n, chunk):
+        block = rng.standard_normal((min(chunk, n - offset), dim), dtype=np.float32)
+        store.add_many([str(i) for i in range(offset, offset + len(block))], block)
+    build = time.perf_counter() - start
+
+    probes = rng.standard_normal((queries, dim), dtype=np.float32)
+    store.search(probes[0], top_k)  # warm-up
+    start = time.perf_counter()
+    for query in probes:
+        store.search(query, top_k)
+    single = (time.perf_counter() - start) / queries
+
+    batches = rng.standard_normal((batch, dim), dtype=np.float32)
+    start = time.perf_counter()
+    store.search_many(batches, top_k)
+    many = (time.perf_counter() - start) / batch
+
+    print(f"{n:>9,}  build {build:7.2f} s   search {single * 1000:8.2f} ms/q   "
+          f"search_many({batch}) {many * 1000:8.2f} ms/q")
+
+    if legacy:
+        items = [(store.ids[i], store.matrix[i].tolist()) for i in range(n)]
+        query = probes[0].tolist()
+        start = time.perf_counter()
+        legacy_search(items, query, top_k)
+        elapsed = time.perf_counter() - start
+        print(f"{'':>9}  legacy Python loop {elapsed * 1000:10.2f} ms/q   "
+              f"({elapsed / single:,.0f}× slower)")
+    del store
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    for n in sizes:
+        bench_size(n, args.dim, args.queries, args.batch, args.top_k,
+                   legacy=(n == min(sizes)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Stand-in OpenAI-compatible LLM server for local benchmarks.
+
+A small asyncio HTTP/1.1 server (keep-alive, no dependencies) that
+answers the subset of the OpenAI API used by ChetnaOS providers:
+
+- GET  /v1/models
+- POST /v1/chat/completions   (optionally "stream": true → SSE chunks)
+- POST /v1/completions        ("prompt" may be a list → one choice each)
+
+Every response is delayed by `latency` seconds per request plus
+`per_prompt_latency` per prompt in it, at most `concurrency` requests
+are processed at once (like the decode slots of an inference server;
+0 = unlimited), and the server counts accepted TCP connections, requests,
+prompts and the peak number of requests in flight, so benchmarks can
+show how much connection reuse / batching saves and tests can check
+client-side concurrency caps.
+
+Usage:
+    python benchmarks/standin_llm_server.py [--port 8900] [--latency 0.05]
+                                            [--concurrency 4]
+
+From another script:
+    server = start_in_thread(latency=0.05)
+    ... use server.url ("http://127.0.0.1:<port>/v1") ...
+    print(server.stats()); server.stop()
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+
+
+class StandinLLMServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, model: str = "standin-1",
+                 concurrency: int = 0, per_prompt_latency: float = 0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.per_prompt_latency = per_prompt_latency
+        self.concurrency = concurrency
+        self.model = model
+        self._slots = None
+        self.connections = 0
+        self.requests = 0
+        self.prompts = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def stats(self):
+        return {"connections": self.connections, "requests": self.requests,
+                "prompts": self.prompts, "peak_in_flight": self.peak_in_flight}
+
+    def reset_stats(self):
+        self.connections = self.requests = self.prompts = self.peak_in_flight = 0
+
+    async def start(self):
+        if self.concurrency:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        self._server = await asyncio.start_server(self._handle, self.host,
+                                                  self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = b""
+                length = int(headers.get("content-length", 0))
+                if length:
+                    body = await reader.readexactly(length)
+
+                self.requests += 1
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                try:
+                    if self._slots is not None:
+                        async with self._slots:
+                            await self._dispatch(method, path, body, writer)
+                    else:
+                        await self._dispatch(method, path, body, writer)
+                finally:
+                    self.in_flight -= 1
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass  # server shutting down: finish quietly
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body, writer):
+        if method == "GET" and path.endswith("/models"):
+            return self._send_json(writer, {"object": "list", "data": [
+                {"id": self.model, "object": "model"}]})
+
+        if method != "POST":
+            return self._send_json(writer, {"error": "not found"}, status=404)
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return self._send_json(writer, {"error": "bad json"}, status=400)
+
+        prompts = payload.get("prompt", "")
+        count = len(prompts) if isinstance(prompts, list) else 1
+        delay = self.latency + self.per_prompt_latency * count
+        if delay:
+            await asyncio.sleep(delay)
+
+        if path.endswith("/chat/completions"):
+            messages = payload.get("messages") or [{}]
+            text = self._reply(messages[-1].get("content", ""))
+            self.prompts += 1
+            if payload.get("stream"):
+                return await self._send_stream(writer, text)
+            return self._send_json(writer, {
+                "object": "chat.completion",
+                "model": payload.get("model", self.model),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": self._usage(messages[-1].get("content", ""), text),
+            })
+
+        if path.endswith("/completions"):
+            if isinstance(prompts, str):
+                prompts = [prompts]
+            self.prompts += len(prompts)
+            choices = [{"index": i, "text": self._reply(p), "finish_reason": "stop"}
+                       for i, p in enumerate(prompts)]
+            return self._send_json(writer, {
+                "object": "text_completion",
+                "model": payload.get("model", self.model),
+                "choices": choices,
+                "usage": {"total_tokens": sum(
+                    self._usage(p, c["text"])["total_tokens"]
+                    for p, c in zip(prompts, choices))},
+            })
+
+        return self._send_json(writer, {"error": "not found"}, status=404)
+
+    @staticmethod
+    def _reply(prompt: str) -> str:
+        return f"stand-in reply to: {prompt[-80:]}"
+
+    @staticmethod
+    def _usage(prompt: str, text: str):
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(text) // 4)
+        return {"prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens}
+
+    @staticmethod
+    def _send_json(writer, data, status: int = 200):
+        body = json.dumps(data).encode()
+        writer.write(
+            f"HTTP/1.1 {status} OK\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: keep-alive\r\n\r\n".encode() + body)
+
+    async def _send_stream(self, writer, text: str):
+        writer.write(b"HTTP/1.1 200 OK\r\n"
+                     b"Content-Type: text/event-stream\r\n"
+                     b"Transfer-Encoding: chunked\r\n"
+                     b"Connection: keep-alive\r\n\r\n")
+
+        def chunk(data: bytes):
+            writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+        for word in text.split(" "):
+            event = {"object": "chat.completion.chunk", "model": self.model,
+                     "choices": [{"index": 0, "delta": {"content": word + " "}}]}
+            chunk(f"data: {json.dumps(event)}\n\n".encode())
+            await writer.drain()
+        chunk(b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def start_in_thread(host: str = "127.0.0.1", port: int = 0,
+                    latency: float = 0.0, **kwargs) -> StandinLLMServer:
+    """
+    Run a stand-in server on a daemon thread; returns once it is listening.
+    """
+    server = StandinLLMServer(host, port, latency, **kwargs)
+    ready = threading.Event()
+    loop = asyncio.new_event_loop()
+
+    async def main():
+        await server.start()
+        ready.set()
+        try:
+            await server._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        # Drop open keep-alive connections before the loop goes away
+        handlers = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    def run():
+        try:
+            loop.run_until_complete(main())
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=run, name="standin-llm", daemon=True)
+    thread.start()
+    if not ready.wait(5):
+        raise RuntimeError("stand-in server did not start")
+
+    def stop():
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(server._server.close)
+        thread.join(5)
+
+    server.stop = stop
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--per-prompt-latency", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StandinLLMServer(args.host, args.port, args.latency,
+                              concurrency=args.concurrency,
+                              per_prompt_latency=args.per_prompt_latency)
+    print(f"Stand-in LLM server on http://{args.host}:{args.port}/v1 "
+          f"(latency {args.latency * 1000:.0f} ms)")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Shared pytest setup.
+
+- Puts backend/ (application code) and benchmarks/ (stand-in servers)
+  on sys.path, the same way app.py and the benchmarks run
+- `standin_server` / `make_standin_server`: stand-in OpenAI-compatible
+  LLM server (benchmarks/standin_llm_server.py) on a background thread
+- `fake_llm`: scripted in-process LLM registered as the active provider;
+  `brain_router`: a BrainRouterAdvanced using it (reflection disabled)
+- Shared HTTP pools are closed after every test
+"""
+
+import asyncio
+import os
+import re
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT, "backend"), os.path.join(ROOT, "benchmarks")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from integrations.llm import BaseLLMProvider, LLMRegistry  # noqa: E402
+from integrations.llm.http_pool import HTTPPool  # noqa: E402
+from standin_llm_server import start_in_thread  # noqa: E402
+
+
+class ScriptedLLM(BaseLLMProvider):
+    """
+    Answers "answer <n>" for prompts mentioning "item <n>", after
+    `delays.get(n, 0)` seconds; tracks peak concurrent calls.
+    """
+
+    def __init__(self):
+        super().__init__({})
+        self.delays = {}
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @staticmethod
+    def item(prompt: str) -> int:
+        match = re.search(r"item (\d+)", prompt)
+        return int(match.group(1)) if match else -1
+
+    def generate(self, prompt, context=None, **kwargs):
+        self.calls += 1
+        return {"text": f"answer {self.item(prompt)}", "tokens_used": 1}
+
+    async def agenerate(self, prompt, context=None, **kwargs):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(self.item(prompt), 0))
+            return self.generate(prompt, context, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+    async def astream(self, prompt, context=None, **kwargs):
+        for word in self.generate(prompt)["text"].split(" "):
+            await asyncio.sleep(0)
+            yield word + " "
+
+    def health_check(self):
+        return True
+
+
+@pytest.fixture
+def make_standin_server():
+    """
+    Factory: make_standin_server(latency=..., concurrency=...) → server.
+    """
+    servers = []
+
+    def make(**kwargs):
+        server = start_in_thread(**kwargs)
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def standin_server(make_standin_server):
+    return make_standin_server()
+
+
+@pytest.fixture(autouse=True)
+def _close_http_pools():
+    yield
+    asyncio.run(HTTPPool.aclose_all())
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = ScriptedLLM()
+    monkeypatch.setattr(LLMRegistry, "_active_provider", llm)
+    return llm
+
+
+@pytest.fixture
+def brain_router(fake_llm, monkeypatch):
+    from orchestrator.brain_router_advanced import BrainRouterAdvanced
+
+    router = BrainRouterAdvanced()
+    monkeypatch.setattr(router.reflection_sink, "submit", lambda record: True)
+    return router
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+import httpx
+
+from integrations.llm.http_pool import (
+    HTTP2_AVAILABLE, HTTPPool, _client_kwargs, pool_config,
+)
+from integrations.llm.local_llm import LocalLLMProvider
+
+
+def test_providers_for_one_endpoint_share_a_pool(standin_server):
+    first = LocalLLMProvider({"base_url": standin_server.url})
+    second = LocalLLMProvider({"base_url": standin_server.url})
+
+    async def run():
+        assert HTTPPool.get_async(first.base_url, first.config) is \
+            HTTPPool.get_async(second.base_url, second.config)
+        for _ in range(3):
+            await first.agenerate("hello")
+            await second.agenerate("hello")
+
+    asyncio.run(run())
+    stats = standin_server.stats()
+    assert stats["requests"] == 6
+    assert stats["connections"] == 1  # keep-alive connection reused by both
+
+
+def test_sync_pool_is_shared_and_kept_alive(standin_server):
+    first = LocalLLMProvider({"base_url": standin_server.url})
+    second = LocalLLMProvider({"base_url": standin_server.url})
+
+    first.generate("hello")
+    second.generate("hello")
+
+    assert HTTPPool.stats()["sync_pools"] == 1
+    assert standin_server.stats()["connections"] == 1
+
+
+def test_each_event_loop_gets_its_own_pool(standin_server):
+    async def client():
+        return HTTPPool.get_async(standin_server.url)
+
+    first = asyncio.run(client())
+    second = asyncio.run(client())
+
+    assert first is not second
+    # The first loop is closed: its pool was dropped, not kept forever
+    assert HTTPPool.stats()["async_pools"] == 1
+
+
+def test_aclose_all_closes_pools_of_other_running_loops(standin_server):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        async def fetch():
+            client = HTTPPool.get_async(standin_server.url)
+            await client.get("/models")
+            return client
+
+        other = asyncio.run_coroutine_threadsafe(fetch(), loop).result(5)
+
+        async def shutdown():
+            mine = HTTPPool.get_async(standin_server.url)
+            await mine.get("/models")
+            assert HTTPPool.stats()["event_loops"] == 2
+            await HTTPPool.aclose_all()
+            return mine
+
+        mine = asyncio.run(shutdown())
+        assert mine.is_closed
+        assert other.is_closed
+        assert HTTPPool.stats()["async_pools"] == 0
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+def test_http2_only_when_h2_is_installed(standin_server):
+    assert _client_kwargs(standin_server.url, pool_config())["http2"] is HTTP2_AVAILABLE
+    assert _client_kwargs(standin_server.url,
+                          pool_config({"http2": False}))["http2"] is False
+
+
+def test_http2_pool_falls_back_to_http11(standin_server):
+    # The stand-in server speaks HTTP/1.1 only; an HTTP/2-enabled pool
+    # must still work against it (no prior-knowledge h2 on cleartext)
+    async def run():
+        client = HTTPPool.get_async(standin_server.url, {"http2": True})
+        return await client.get("/models")
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    assert response.http_version == "HTTP/1.1"
+    assert isinstance(response, httpx.Response)
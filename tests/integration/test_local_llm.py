@@ -0,0 +1,89 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from integrations.llm import LLMProviderError
+from integrations.llm.local_llm import LocalLLMProvider
+
+
+def test_generate(standin_server):
+    provider = LocalLLMProvider({"base_url": standin_server.url})
+
+    result = provider.generate("hello")
+
+    assert result["text"] == "stand-in reply to: hello"
+    assert result["tokens_used"] > 0
+    assert result["model"] == "local"
+    assert standin_server.stats()["requests"] == 1
+
+
+def test_agenerate(standin_server):
+    provider = LocalLLMProvider({"base_url": standin_server.url})
+
+    result = asyncio.run(provider.agenerate("hello",
+                                            [{"role": "system", "content": "be brief"}]))
+
+    assert result["text"] == "stand-in reply to: hello"
+    assert result["latency_ms"] >= 0
+
+
+def test_astream(standin_server):
+    provider = LocalLLMProvider({"base_url": standin_server.url})
+
+    async def run():
+        return [chunk async for chunk in provider.astream("hello")]
+
+    chunks = asyncio.run(run())
+
+    assert len(chunks) > 1
+    assert "".join(chunks).strip() == "stand-in reply to: hello"
+
+
+def test_batch_completions_send_one_request(standin_server):
+    provider = LocalLLMProvider({"base_url": standin_server.url,
+                                 "batch_completions": True})
+
+    results = asyncio.run(provider.agenerate_batch(["a", "b", "c"]))
+
+    assert [r["text"] for r in results] == [f"stand-in reply to: {p}" for p in "abc"]
+    assert standin_server.stats()["requests"] == 1
+    assert standin_server.stats()["prompts"] == 3
+
+
+def test_timeout_raises_provider_error(make_standin_server):
+    server = make_standin_server(latency=0.5)
+    provider = LocalLLMProvider({"base_url": server.url, "timeout": 0.1})
+
+    with pytest.raises(LLMProviderError, match="LocalLLMProvider"):
+        provider.generate("hello")
+    with pytest.raises(LLMProviderError, match="LocalLLMProvider"):
+        asyncio.run(provider.agenerate("hello"))
+
+
+def test_max_concurrency_caps_async_calls(make_standin_server):
+    server = make_standin_server(latency=0.1)
+    provider = LocalLLMProvider({"base_url": server.url, "max_concurrency": 2})
+
+    async def run():
+        return await asyncio.gather(*(provider.agenerate(f"q{i}") for i in range(6)))
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 6
+    assert server.stats()["peak_in_flight"] == 2
+    assert elapsed >= 0.3  # three waves of two
+
+
+def test_max_concurrency_caps_sync_calls(make_standin_server):
+    server = make_standin_server(latency=0.1)
+    provider = LocalLLMProvider({"base_url": server.url, "max_concurrency": 2})
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(provider.generate, [f"q{i}" for i in range(6)]))
+
+    assert len(results) == 6
+    assert server.stats()["peak_in_flight"] == 2
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as app_module
+
+
+@pytest.fixture
+def client(brain_router, monkeypatch):
+    monkeypatch.setattr(app_module, "brain_router", brain_router)
+    return TestClient(app_module.app)
+
+
+def test_batch_streams_ndjson_in_input_order(client, fake_llm):
+    fake_llm.delays = {0: 0.1, 1: 0.05, 3: 0.0}
+    items = [{"input": "tell me about item 0"}, {"input": "tell me about item 1"},
+             {"input": "   "}, {"input": "tell me about item 3"}]
+
+    response = client.post("/process/batch", json={"items": items, "max_concurrency": 4})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2, 3]
+    assert [line["message"] for line in lines] == [
+        "answer 0", "answer 1", "Input text is required", "answer 3"]
+    assert [line["success"] for line in lines] == [True, True, False, True]
+
+
+def test_batch_rejects_oversized_requests(client, monkeypatch):
+    monkeypatch.setattr(app_module, "BATCH_MAX_ITEMS", 2)
+    response = client.post("/process/batch", json={"items": [{"input": "hi"}] * 3})
+    assert response.status_code == 413
+
+
+def sse_events(body):
+    events = []
+    for frame in body.split("\n\n"):
+        if not frame:
+            continue
+        event_line, data_line = frame.split("\n")
+        assert event_line.startswith("event: ") and data_line.startswith("data: ")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+def test_stream_sends_chunks_then_one_result(client):
+    response = client.post("/process", json={"input": "tell me about item 7", "stream": True})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.endswith("\n\n")
+    events = sse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[-1] == "result" and names.count("result") == 1
+    assert len(names) > 2  # streamed word by word
+    chunks = "".join(data["text"] for name, data in events if name == "chunk")
+    result = events[-1][1]
+    assert result["success"] is True
+    assert chunks.strip() == result["message"] == "answer 7"
+
+
+def test_stream_reports_errors_as_a_result_event(client):
+    response = client.post("/process", json={"input": "  ", "stream": True})
+
+    events = sse_events(response.text)
+    assert [name for name, _ in events] == ["result"]
+    assert events[0][1]["message"] == "Input text is required"
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from orchestrator.admission_scheduler import AdmissionRejected, AdmissionScheduler
+
+
+async def hold(scheduler, intent="custom", priority=6):
+    """
+    Take a slot and keep it until the returned event is set.
+    """
+    release = asyncio.Event()
+    held = asyncio.Event()
+
+    async def holder():
+        async with scheduler.slot(intent, priority):
+            held.set()
+            await release.wait()
+
+    task = asyncio.create_task(holder())
+    await held.wait()
+    return release, task
+
+
+def waiter(scheduler, order, name, priority, intent="custom"):
+    async def run():
+        async with scheduler.slot(intent, priority):
+            order.append(name)
+            await asyncio.sleep(0)
+    return asyncio.create_task(run())
+
+
+def test_lower_priority_score_runs_first():
+    async def run():
+        scheduler = AdmissionScheduler(max_workers=1, aging_sec=10)
+        release, holder = await hold(scheduler)
+        order = []
+        tasks = [waiter(scheduler, order, name, priority)
+                 for name, priority in (("custom", 6), ("sales", 3), ("support", 1))]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"] == 3
+
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        return order, scheduler.stats()
+
+    order, stats = asyncio.run(run())
+    assert order == ["support", "sales", "custom"]
+    assert stats["active"] == 0 and stats["queued"] == 0 and stats["admitted"] == 4
+
+
+def test_aging_lets_old_low_priority_waiters_through():
+    async def run():
+        scheduler = AdmissionScheduler(max_workers=1, aging_sec=0.01)
+        release, holder = await hold(scheduler)
+        order = []
+        tasks = [waiter(scheduler, order, "old-custom", 6)]
+        await asyncio.sleep(0.08)  # worth 8 levels; the gap is only 5
+        tasks.append(waiter(scheduler, order, "new-support", 1))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        return order
+
+    assert asyncio.run(run()) == ["old-custom", "new-support"]
+
+
+def test_intent_cap_does_not_block_other_intents():
+    async def run():
+        scheduler = AdmissionScheduler(max_workers=2, intent_limits={"custom": 1})
+        release, holder = await hold(scheduler, "custom")
+        order = []
+        capped = waiter(scheduler, order, "custom", 6, intent="custom")
+        other = waiter(scheduler, order, "support", 1, intent="support")
+        await other
+        assert order == ["support"]
+        assert scheduler.stats()["queued_by_intent"] == {"custom": 1}
+
+        release.set()
+        await asyncio.gather(holder, capped)
+        return order
+
+    assert asyncio.run(run()) == ["support", "custom"]
+
+
+def test_full_queue_rejects():
+    async def run():
+        scheduler = AdmissionScheduler(max_workers=1, max_queue=1)
+        release, holder = await hold(scheduler)
+        queued = waiter(scheduler, [], "queued", 1)
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected):
+            await scheduler.run("chat", 1, asyncio.sleep)
+
+        release.set()
+        await asyncio.gather(holder, queued)
+        return scheduler.stats()
+
+    stats = asyncio.run(run())
+    assert stats["rejected"] == 1 and stats["admitted"] == 2
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def run():
+        scheduler = AdmissionScheduler(max_workers=1)
+        release, holder = await hold(scheduler)
+        order = []
+        cancelled = waiter(scheduler, order, "cancelled", 1)
+        kept = waiter(scheduler, order, "kept", 6)
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"] == 1
+
+        release.set()
+        await asyncio.gather(holder, kept)
+        return order, scheduler.stats()
+
+    order, stats = asyncio.run(run())
+    assert order == ["kept"]
+    assert stats["active"] == 0 and stats["queued"] == 0
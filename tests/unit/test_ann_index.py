@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from memory.ann_index import IVFIndex, build_index
+from memory.semantic_index import SemanticIndex
+from memory.vector_store import VectorStore
+
+DIM = 32
+
+
+def clustered(n, seed=0, clusters=20):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, DIM))
+    return (centers[rng.integers(clusters, size=n)]
+            + 0.3 * rng.normal(size=(n, DIM))).astype(np.float32)
+
+
+def recall(index, exact, queries, k=10):
+    found = 0
+    for approx_hits, exact_hits in zip(index.search_many(queries, k),
+                                       exact.search_many(queries, k)):
+        found += len({h[1] for h in approx_hits} & {h[1] for h in exact_hits})
+    return found / (k * len(queries))
+
+
+def build(data, **params):
+    index = IVFIndex(nlist=16, nprobe=4, train_size=500, **params)
+    exact = VectorStore()
+    ids = [f"id{i}" for i in range(len(data))]
+    metadata = [{"n": i} for i in range(len(data))]
+    index.add_many(ids, data, metadata)
+    exact.add_many(ids, data, metadata)
+    return index, exact
+
+
+def test_ivf_recall_against_exact_search():
+    data = clustered(2000)
+    index, exact = build(data)
+    queries = clustered(50, seed=1)
+
+    assert index.trained
+    assert recall(index, exact, queries) >= 0.9
+    index.nprobe = index.nlist  # probing every bucket is exact
+    assert recall(index, exact, queries) == 1.0
+
+
+def test_ivf_is_exact_before_training():
+    data = clustered(100)
+    index, exact = build(data)
+    assert not index.trained
+    assert recall(index, exact, clustered(10, seed=1)) == 1.0
+
+
+def test_ivf_remove():
+    data = clustered(1000)
+    index, _ = build(data)
+    index.remove("id3")
+    assert len(index) == 999
+    assert all(hit[1] != "id3" for hit in index.search(data[3], top_k=20))
+
+
+def test_ivf_save_and_load_round_trip(tmp_path):
+    data = clustered(1000)
+    index, _ = build(data)
+    index.remove("id0")
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+
+    loaded = IVFIndex.load(path)
+    queries = clustered(20, seed=2)
+    assert loaded.trained and len(loaded) == 999
+    assert loaded.search_many(queries, 5) == index.search_many(queries, 5)
+
+    loaded.add("late", data[0], {"late": True})
+    assert loaded.search(data[0])[0][1:] == ("late", {"late": True})
+
+
+def test_semantic_index_save_and_load(tmp_path):
+    semantic = SemanticIndex(store=build_index("ivf", nlist=4, train_size=8))
+    texts = [f"plot number {i} near the lake" for i in range(20)]
+    semantic.add_texts(texts, [{"n": i} for i in range(20)])
+    path = str(tmp_path / "semantic.npz")
+    semantic.save(path)
+
+    loaded = SemanticIndex.load(semantic.embedder, path, kind="ivf")
+    assert loaded.query(texts[7], top_k=1)[0][1:] == (texts[7], {"n": 7})
+
+
+def test_semantic_index_rejects_unsaveable_and_unknown_kinds(tmp_path):
+    with pytest.raises(TypeError):
+        SemanticIndex().save(str(tmp_path / "exact.npz"))
+    for kind in ("exact", "persistent", "nope"):
+        with pytest.raises(ValueError):
+            SemanticIndex.load(None, str(tmp_path / "x"), kind=kind)
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+
+def test_aroute_returns_the_workflow_reply(brain_router):
+    result = asyncio.run(brain_router.aroute("tell me about item 3", {}))
+
+    assert result["status"] == "success"
+    assert result["reply"] == "answer 3"
+    assert result["output"]["workflow"] == "CustomFlow"
+    assert result["trace_id"]
+
+
+def test_aroute_calls_overlap_on_the_event_loop(brain_router, fake_llm):
+    fake_llm.delays = {i: 0.1 for i in range(5)}
+
+    async def run():
+        return await asyncio.gather(*(brain_router.aroute(f"tell me about item {i}", {})
+                                      for i in range(5)))
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+
+    assert [r["reply"] for r in results] == [f"answer {i}" for i in range(5)]
+    assert fake_llm.peak_in_flight == 5
+    assert time.perf_counter() - start < 0.4
+
+
+def test_aroute_reuses_a_precomputed_intent_and_priority(brain_router, monkeypatch):
+    def detect(*args, **kwargs):
+        raise AssertionError("intent detected twice")
+
+    monkeypatch.setattr(brain_router.intent_detector, "detect", detect)
+    monkeypatch.setattr(brain_router.priority_engine, "score", detect)
+
+    result = asyncio.run(brain_router.aroute("tell me about item 1", {},
+                                             intent="custom", priority=1))
+    assert result["output"]["intent"] == "custom"
+
+
+def test_dharma_blocks_before_the_llm(brain_router, fake_llm):
+    result = asyncio.run(brain_router.aroute("how to do illegal things with item 1", {}))
+
+    assert result["status"] == "blocked"
+    assert fake_llm.calls == 0
+
+
+def route_all(brain_router, items, **kwargs):
+    async def run():
+        return [result async for result in brain_router.aroute_many(items, **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_aroute_many_yields_in_input_order(brain_router, fake_llm):
+    # Later items finish first
+    fake_llm.delays = {i: 0.05 * (4 - i) for i in range(5)}
+    items = [(f"tell me about item {i}", {}) for i in range(5)]
+
+    results = route_all(brain_router, items, max_concurrency=5)
+
+    assert [r["reply"] for r in results] == [f"answer {i}" for i in range(5)]
+    assert len({r["trace_id"] for r in results}) == 5
+
+
+def test_aroute_many_caps_concurrency(brain_router, fake_llm):
+    fake_llm.delays = {i: 0.02 for i in range(8)}
+    items = [(f"tell me about item {i}", {}) for i in range(8)]
+
+    route_all(brain_router, items, max_concurrency=3)
+
+    assert fake_llm.peak_in_flight == 3
+
+
+def test_aroute_many_isolates_failing_items(brain_router, monkeypatch):
+    run = brain_router._arun
+
+    async def flaky(user_input, context, start_time, screened=None):
+        if "item 1" in user_input:
+            raise RuntimeError("boom")
+        return await run(user_input, context, start_time, screened)
+
+    monkeypatch.setattr(brain_router, "_arun", flaky)
+    items = [(f"tell me about item {i}", {}) for i in range(3)]
+
+    results = route_all(brain_router, items)
+
+    assert [r["status"] for r in results] == ["success", "error", "success"]
+    assert "boom" in results[1]["reason"]
@@ -0,0 +1,104 @@
+import numpy as np
+
+from memory.embedding_cache import EmbeddingCache, embed_batches
+
+
+class CountingEmbedder:
+    """
+    Deterministic 4-dim vectors; records every batch it is asked for.
+    """
+
+    name = "counting-v1"
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_many(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[len(t), t.count("a"), t.count("b"), 1.0] for t in texts],
+                        dtype=np.float32)
+
+    def __call__(self, text):
+        return self.embed_many([text])[0]
+
+
+def test_repeats_are_served_from_memory():
+    embedder = CountingEmbedder()
+    cache = EmbeddingCache(embedder)
+
+    first = cache.embed_many(["ab", "b", "ab"])
+    second = cache.embed_many(["b", "ab"])
+
+    assert embedder.batches == [["ab", "b"]]  # misses are deduplicated
+    assert np.array_equal(first[[1, 0]], second)
+    assert np.array_equal(cache("ab"), embedder.embed_many(["ab"])[0])
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (3, 3, 2)
+
+
+def test_misses_are_embedded_in_batches():
+    embedder = CountingEmbedder()
+    cache = EmbeddingCache(embedder, batch_size=2)
+    cache.embed_many([f"t{i}" for i in range(5)])
+
+    assert [len(batch) for batch in embedder.batches] == [2, 2, 1]
+    assert cache.stats()["batches"] == 3
+
+
+def test_memory_tier_is_an_lru():
+    embedder = CountingEmbedder()
+    cache = EmbeddingCache(embedder, max_entries=2)
+    cache.embed_many(["a", "b"])
+    cache("a")
+    cache("c")  # evicts b
+
+    cache.embed_many(["a", "b"])
+    assert embedder.batches[-1] == ["b"]
+
+
+def test_disk_hits_survive_restarts_and_are_promoted(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    cache = EmbeddingCache(CountingEmbedder(), disk_path=path)
+    expected = cache.embed_many(["ab", "aab"])
+    cache.close()
+
+    embedder = CountingEmbedder()
+    reopened = EmbeddingCache(embedder, disk_path=path)
+    vectors = reopened.embed_many(["ab", "aab", "new"])
+    assert np.array_equal(vectors[:2], expected)
+    assert np.array_equal(reopened.embed_many(["ab", "aab"]), expected)
+
+    assert embedder.batches == [["new"]]
+    stats = reopened.stats()
+    assert (stats["disk_hits"], stats["hits"], stats["misses"]) == (2, 2, 1)
+    assert stats["entries"] == 3  # disk hits now live in memory
+    reopened.close()
+
+
+def test_namespaces_keep_models_apart(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    first = EmbeddingCache(CountingEmbedder(), disk_path=path)
+    first.embed_many(["ab"])
+    first.close()
+
+    class OtherModel(CountingEmbedder):
+        name = "counting-v2"
+
+    embedder = OtherModel()
+    other = EmbeddingCache(embedder, disk_path=path)
+    other.embed_many(["ab"])
+    other.close()
+    assert embedder.batches == [["ab"]]
+
+
+def test_embed_batches_without_embed_many():
+    calls = []
+
+    def embedder(text):
+        calls.append(text)
+        return [float(len(text))]
+
+    vectors = embed_batches(embedder, ["a", "bb", "ccc"], batch_size=2)
+    assert vectors.tolist() == [[1.0], [2.0], [3.0]]
+    assert calls == ["a", "bb", "ccc"]
+    assert embed_batches(embedder, []).shape == (0, 0)
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from memory.hashing_embedder import HashingEmbedder
+
+TEXTS = ["plot ka rate kya hai", "price of plots?", "site visit tomorrow", "नमस्ते"]
+
+
+def test_same_text_same_vector():
+    embedder = HashingEmbedder()
+    batch = embedder.embed_many(TEXTS)
+
+    assert batch.shape == (len(TEXTS), 256) and batch.dtype == np.float32
+    assert np.array_equal(batch, HashingEmbedder().embed_many(TEXTS))
+    # Batching never changes a text's vector
+    for text, row in zip(TEXTS, batch):
+        assert np.allclose(embedder(text), row)
+    assert np.allclose(np.linalg.norm(batch, axis=1), 1.0)
+
+
+def test_vectors_do_not_depend_on_the_python_hash_seed():
+    script = ("import sys; sys.path.insert(0, 'backend');"
+              "from memory.hashing_embedder import HashingEmbedder;"
+              f"sys.stdout.buffer.write(HashingEmbedder().embed_many({TEXTS!r}).tobytes())")
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    outputs = [subprocess.run([sys.executable, "-c", script], cwd=root, check=True,
+                              capture_output=True,
+                              env={**os.environ, "PYTHONHASHSEED": seed}).stdout
+               for seed in ("1", "2")]
+
+    assert outputs[0] == outputs[1] == HashingEmbedder().embed_many(TEXTS).tobytes()
+
+
+def test_seed_and_dim_change_the_space():
+    base = HashingEmbedder()(TEXTS[0])
+    assert not np.allclose(HashingEmbedder(seed=1)(TEXTS[0]), base)
+    assert HashingEmbedder(dim=64)(TEXTS[0]).shape == (64,)
+    assert HashingEmbedder(seed=1).name != HashingEmbedder().name
+
+
+def test_similar_texts_score_higher():
+    embedder = HashingEmbedder()
+    plots, plot, visit = embedder.embed_many(["price of plots", "plot price", "site visit"])
+    assert plots @ plot > plots @ visit
+
+
+def test_case_and_empty_input():
+    embedder = HashingEmbedder()
+    assert np.array_equal(embedder("Plot Price"), embedder("plot price"))
+    assert not embedder("").any()
+    assert embedder.embed_many([]).shape == (0, 256)
+
+
+def test_fit_is_deterministic_and_renames_the_space():
+    first = HashingEmbedder().fit(TEXTS)
+    second = HashingEmbedder().fit(TEXTS)
+
+    assert first.name == second.name != HashingEmbedder().name
+    assert np.array_equal(first.embed_many(TEXTS), second.embed_many(TEXTS))
+    assert HashingEmbedder().fit(TEXTS[:2]).name != first.name
@@ -0,0 +1,51 @@
+from clients.client_loader import ClientLoader
+from orchestrator.intent_detector import IntentDetector, KeywordMatcher
+
+
+def test_words_match_whole_tokens_and_first_intent_wins():
+    matcher = KeywordMatcher({"sales": ["price"], "chat": ["hi", "price"]})
+    assert matcher.match("What's the PRICE?") == "sales"
+    assert matcher.match("hi there") == "chat"
+    assert matcher.match("this is it") == "custom"
+
+
+def test_phrases_match_consecutive_words():
+    matcher = KeywordMatcher({"chat": ["hello"], "visit": ["site visit"]})
+    assert matcher.match("book a site visit") == "visit"
+    assert matcher.match("visit the site") == "custom"
+
+
+def test_tenant_keywords_extend_the_default_map(monkeypatch):
+    monkeypatch.setattr(ClientLoader, "load_optional_config", lambda client_id: {
+        "intent_keywords": {"sales": ["plot"], "visit": ["site visit"]}})
+    detector = IntentDetector()
+
+    assert detector.detect("any plot left?", client_id="acme") == "sales"
+    assert detector.detect("plan a site visit", client_id="acme") == "visit"
+    assert detector.detect("any plot left?") == "custom"
+
+
+def test_malformed_tenant_keywords_are_ignored(monkeypatch):
+    monkeypatch.setattr(ClientLoader, "load_optional_config", lambda client_id: {
+        "intent_keywords": {"sales": "plot", "lead": ["broker", 3],
+                            "visit": ["site visit"]}})
+    detector = IntentDetector()
+
+    assert detector.detect("plot", client_id="acme") == "custom"
+    assert detector.detect("broker", client_id="acme") == "custom"
+    assert detector.detect("a site visit", client_id="acme") == "visit"
+
+
+def test_tenant_keywords_that_are_not_a_mapping_are_ignored(monkeypatch):
+    monkeypatch.setattr(ClientLoader, "load_optional_config",
+                        lambda client_id: {"intent_keywords": [["sales", "plot"]]})
+    detector = IntentDetector()
+
+    assert detector.detect("price", client_id="acme") == "sales"
+    assert detector._matcher_for("acme") is detector.matcher
+
+
+def test_detect_many_keeps_order():
+    detector = IntentDetector()
+    assert detector.detect_many(["hello", "", "price please", "zzz"]) == [
+        "chat", "chat", "sales", "custom"]
@@ -0,0 +1,65 @@
+import asyncio
+
+import httpx
+import pytest
+
+from integrations.llm.cost_gaurd import CostGuard
+from integrations.llm.http_pool import HTTPPool
+from integrations.llm.ledger import BudgetExceeded, TokenLedger
+from integrations.llm.local_llm import LocalLLMProvider
+from integrations.llm.tokenizer import count_tokens
+
+
+def test_async_reserve_and_commit_share_the_daily_cap(tmp_path):
+    path = str(tmp_path / "ledger.db")
+    first = TokenLedger(path, daily_token_limit=1_000, lease_tokens=400,
+                        flush_interval=0)
+    second = TokenLedger(path, daily_token_limit=1_000, lease_tokens=400,
+                         flush_interval=0)
+
+    async def run():
+        reservation = await first.areserve("a", 300, 0.0)
+        await first.acommit(reservation, 250, 0.0)
+        reservation = await second.areserve("b", 500, 0.0)
+        await second.acommit(reservation, 500, 0.0)
+        with pytest.raises(BudgetExceeded):
+            await second.areserve("b", 500, 0.0)
+
+    try:
+        asyncio.run(run())
+        snapshot = first.snapshot()
+        assert snapshot["tokens_used_today"] == 750
+        assert snapshot["calls_today"] == 2
+    finally:
+        first.close()
+        second.close()
+    # Unused leases were handed back on close
+    reopened = TokenLedger(path)
+    assert reopened.snapshot()["tokens_committed_to_workers"] == 750
+    reopened.close()
+
+
+def test_response_without_usage_is_billed_prompt_plus_completion(tmp_path, monkeypatch):
+    body = {"choices": [{"message": {"content": "four completion tokens here"}}]}
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+    sync_client = httpx.Client(transport=transport, base_url="http://llm.test/v1")
+    async_client = httpx.AsyncClient(transport=transport, base_url="http://llm.test/v1")
+    monkeypatch.setattr(HTTPPool, "get_sync", lambda *args: sync_client)
+    monkeypatch.setattr(HTTPPool, "get_async", lambda *args: async_client)
+
+    ledger = TokenLedger(str(tmp_path / "ledger.db"), flush_interval=0)
+    provider = LocalLLMProvider({"base_url": "http://llm.test/v1"})
+    provider.cost_guard = CostGuard("local", 0.0, ledger)
+    context = [{"role": "system", "content": "be brief"}]
+    expected = count_tokens("be brief" + "what is the price?") + \
+        count_tokens(body["choices"][0]["message"]["content"])
+
+    try:
+        assert provider.generate("what is the price?", context)["tokens_used"] == expected
+        result = asyncio.run(provider.agenerate("what is the price?", context))
+        assert result["tokens_used"] == expected
+        assert ledger.snapshot()["tokens_used_today"] == 2 * expected
+    finally:
+        sync_client.close()
+        asyncio.run(async_client.aclose())
+        ledger.close()
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+
+from integrations.llm import BaseLLMProvider
+from integrations.llm.ledger import BudgetExceeded
+from integrations.llm.router import CircuitBreaker, LLMRouter
+from integrations.llm.tokenizer import count_tokens
+
+
+class FakeProvider(BaseLLMProvider):
+    def __init__(self, name, fail=False, over_budget=False):
+        super().__init__({})
+        self.name = name
+        self.fail = fail
+        self.over_budget = over_budget
+
+    def generate(self, prompt, context=None, **kwargs):
+        if self.over_budget:
+            raise BudgetExceeded("Daily token budget exceeded")
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        return {"text": self.name, "tokens_used": 1}
+
+    async def agenerate(self, prompt, context=None, **kwargs):
+        return self.generate(prompt, context, **kwargs)
+
+    def health_check(self):
+        return not self.fail
+
+
+def test_peek_has_no_side_effects():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    assert breaker.peek()
+    assert breaker.peek()
+    assert breaker.state == "open"
+
+    assert breaker.available()       # claims the probe slot
+    assert breaker.state == "half_open"
+    assert not breaker.peek()
+    assert not breaker.available()
+
+
+def test_ranking_does_not_consume_probe_slots():
+    router = LLMRouter(policy="ordered", failure_threshold=1, reset_timeout=0.01)
+    flaky = FakeProvider("flaky", fail=True)
+    router.add("flaky", flaky)
+    router.add("backup", FakeProvider("backup"))
+
+    assert router.generate("hi")["provider"] == "backup"
+    assert router.get("flaky").breaker.state == "open"
+    time.sleep(0.02)
+
+    for _ in range(10):
+        router.candidates()
+    assert router.get("flaky").breaker.state == "open"
+
+    flaky.fail = False
+    assert asyncio.run(router.agenerate("hi"))["provider"] == "flaky"
+    assert router.get("flaky").breaker.state == "closed"
+
+
+def test_cancelled_probe_releases_its_slot():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    breaker.opened_at -= 61
+
+    assert breaker.available()
+    assert not breaker.peek()
+    breaker.release()
+    assert breaker.peek()
+
+
+def test_budget_exhaustion_does_not_trip_breakers():
+    router = LLMRouter(policy="ordered", failure_threshold=1)
+    router.add("primary", FakeProvider("primary", over_budget=True))
+    router.add("backup", FakeProvider("backup"))
+
+    with pytest.raises(BudgetExceeded):
+        router.generate("hi")
+    with pytest.raises(BudgetExceeded):
+        asyncio.run(router.agenerate("hi"))
+
+    assert router.get("primary").breaker.state == "closed"
+    assert router.get("primary").stats()["errors"] == 0
+    assert router.get("backup").stats()["calls"] == 0
+
+
+def test_streamed_tokens_are_counted_with_the_tokenizer():
+    router = LLMRouter(policy="ordered")
+    router.add("primary", FakeProvider("a streamed reply, counted once"))
+
+    async def run():
+        return [chunk async for chunk in router.astream("hi there")]
+
+    assert "".join(asyncio.run(run())) == "a streamed reply, counted once"
+    assert router.get("primary").stats()["tokens"] == \
+        count_tokens("hi there") + count_tokens("a streamed reply, counted once")
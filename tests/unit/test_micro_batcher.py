@@ -0,0 +1,142 @@
+import asyncio
+
+from integrations.llm import BaseLLMProvider, LLMProviderError
+from integrations.llm.micro_batcher import MicroBatcher
+
+
+class BatchLLM(BaseLLMProvider):
+    """
+    `agenerate_batch` answers each prompt, or fails it when the prompt
+    starts with "fail"; `respond` overrides the whole batch.
+    """
+
+    def __init__(self):
+        super().__init__({})
+        self.batches = []
+        self.respond = None
+
+    def generate(self, prompt, context=None, **kwargs):
+        return {"text": f"single {prompt}"}
+
+    async def agenerate(self, prompt, context=None, **kwargs):
+        return {"text": f"single {prompt}"}
+
+    async def agenerate_batch(self, prompts, **kwargs):
+        self.batches.append((list(prompts), kwargs))
+        await asyncio.sleep(0)
+        if self.respond is not None:
+            return await self.respond(prompts)
+        return [ValueError(f"bad {p}") if p.startswith("fail")
+                else {"text": f"reply {p}", **kwargs} for p in prompts]
+
+    def health_check(self):
+        return True
+
+
+def gather(batcher, prompts, **kwargs):
+    async def run():
+        return await asyncio.gather(*(batcher.agenerate(p, **kwargs) for p in prompts),
+                                    return_exceptions=True)
+    return asyncio.run(run())
+
+
+def test_results_are_demuxed_to_each_caller():
+    llm = BatchLLM()
+    batcher = MicroBatcher(llm, window_ms=5, max_batch=16)
+
+    results = gather(batcher, ["a", "fail-b", "c"])
+
+    assert results[0] == {"text": "reply a"} and results[2] == {"text": "reply c"}
+    assert isinstance(results[1], ValueError) and str(results[1]) == "bad fail-b"
+    assert llm.batches == [(["a", "fail-b", "c"], {})]
+
+
+def test_batches_split_by_size_and_params():
+    llm = BatchLLM()
+    batcher = MicroBatcher(llm, window_ms=5, max_batch=2)
+
+    async def run():
+        return await asyncio.gather(batcher.agenerate("a"), batcher.agenerate("b"),
+                                    batcher.agenerate("c"),
+                                    batcher.agenerate("d", temperature=0.1))
+
+    results = asyncio.run(run())
+    assert [r["text"] for r in results] == ["reply a", "reply b", "reply c", "reply d"]
+    assert results[3]["temperature"] == 0.1
+    assert sorted(prompts for prompts, _ in llm.batches) == [["a", "b"], ["c"], ["d"]]
+    assert batcher.stats()["batches"] == 3
+
+
+def test_calls_with_context_pass_through():
+    llm = BatchLLM()
+    batcher = MicroBatcher(llm)
+    history = [{"role": "user", "content": "earlier"}]
+
+    result = asyncio.run(batcher.agenerate("a", history))
+
+    assert result == {"text": "single a"}
+    assert llm.batches == [] and batcher.stats()["passthrough"] == 1
+
+
+def test_a_failed_batch_fails_every_caller():
+    llm = BatchLLM()
+
+    async def fail(prompts):
+        raise LLMProviderError("upstream down")
+
+    llm.respond = fail
+    results = gather(MicroBatcher(llm, window_ms=5), ["a", "b"])
+
+    assert [str(r) for r in results] == ["upstream down"] * 2
+
+
+def test_a_short_result_list_fails_every_caller():
+    llm = BatchLLM()
+
+    async def short(prompts):
+        return [{"text": "only one"}]
+
+    llm.respond = short
+    results = gather(MicroBatcher(llm, window_ms=5), ["a", "b"])
+
+    assert all(isinstance(r, LLMProviderError) for r in results)
+    assert "1 results for 2 prompts" in str(results[0])
+
+
+def test_a_cancelled_batch_cancels_its_callers():
+    llm = BatchLLM()
+    started = None
+
+    async def hang(prompts):
+        started.set()
+        await asyncio.Event().wait()
+
+    llm.respond = hang
+    batcher = MicroBatcher(llm, window_ms=1)
+
+    async def run():
+        nonlocal started
+        started = asyncio.Event()
+        calls = [asyncio.create_task(batcher.agenerate(p)) for p in "ab"]
+        await started.wait()
+        for task in list(batcher._inflight):
+            task.cancel()
+        return await asyncio.wait_for(asyncio.gather(*calls, return_exceptions=True), 1)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+
+def test_a_caller_cancelled_before_dispatch_is_left_out():
+    llm = BatchLLM()
+    batcher = MicroBatcher(llm, window_ms=20)
+
+    async def run():
+        calls = [asyncio.create_task(batcher.agenerate(p)) for p in "abc"]
+        await asyncio.sleep(0)
+        calls[1].cancel()
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert llm.batches == [(["a", "c"], {})]
@@ -0,0 +1,149 @@
+import os
+
+import numpy as np
+
+from memory.persistent_store import PersistentVectorStore, _Segment
+
+DIM = 8
+
+
+def vectors(n, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+
+
+def fill(store, n, seed=0, prefix="id"):
+    data = vectors(n, seed)
+    store.add_many([f"{prefix}{i}" for i in range(n)], data,
+                   [{"n": i} for i in range(n)])
+    return data
+
+
+def live_ids(store):
+    hits = store.search(vectors(1, seed=99)[0], top_k=10_000)
+    return {item_id for _, item_id, _ in hits}
+
+
+def test_add_reopen_search(tmp_path):
+    store = PersistentVectorStore(str(tmp_path), segment_rows=4)
+    data = fill(store, 10)
+    store.close()
+
+    reopened = PersistentVectorStore(str(tmp_path), segment_rows=4)
+    assert len(reopened) == 10
+    assert reopened.stats()["segments"] == 3
+    score, item_id, metadata = reopened.search(data[7])[0]
+    assert (item_id, metadata) == ("id7", {"n": 7})
+    assert score > 0.999
+    reopened.close()
+
+
+def test_remove_survives_reopen(tmp_path):
+    store = PersistentVectorStore(str(tmp_path), segment_rows=4, compact_ratio=1.0)
+    data = fill(store, 6)
+    store.remove("id2")
+    store.close()
+
+    reopened = PersistentVectorStore(str(tmp_path), segment_rows=4, compact_ratio=1.0)
+    assert len(reopened) == 5
+    assert reopened.search(data[2])[0][1] != "id2"
+    # The id index is rebuilt lazily after a restart
+    reopened.remove("id3")
+    assert len(reopened) == 4
+    assert live_ids(reopened) == {f"id{i}" for i in (0, 1, 4, 5)}
+    reopened.close()
+
+
+def test_remove_during_compaction_is_kept(tmp_path):
+    store = PersistentVectorStore(str(tmp_path), segment_rows=4, compact_ratio=1.0)
+    fill(store, 10)
+    store.remove("id0")
+
+    # A remove (and an add) lands while the compactor copies segment 0
+    segment = store._segments[0]
+    copy_line = segment.line
+    raced = []
+
+    def line(row):
+        if not raced:
+            raced.append(True)
+            store.remove("id1")
+            store.add("late", vectors(1, seed=5)[0])
+        return copy_line(row)
+
+    segment.line = line
+    store.compact()
+
+    expected = {f"id{i}" for i in range(2, 10)} | {"late"}
+    assert raced
+    assert live_ids(store) == expected
+    assert len(store) == len(expected)
+    assert store.stats()["generation"] == 1
+    store.close()
+
+    reopened = PersistentVectorStore(str(tmp_path), segment_rows=4)
+    assert live_ids(reopened) == expected
+    assert reopened.stats()["tombstones"] == 1  # id1, caught mid-copy
+    reopened.close()
+
+
+def test_background_compaction_triggered_by_removes(tmp_path):
+    store = PersistentVectorStore(str(tmp_path), segment_rows=4, compact_ratio=0.3)
+    fill(store, 12)
+    for i in range(6):
+        store.remove(f"id{i}")
+    store.close()  # waits for the compactor
+
+    reopened = PersistentVectorStore(str(tmp_path), segment_rows=4)
+    assert live_ids(reopened) == {f"id{i}" for i in range(6, 12)}
+    assert reopened.stats()["generation"] >= 1
+    reopened.close()
+
+
+def test_torn_tails_are_truncated_on_open(tmp_path):
+    store = PersistentVectorStore(str(tmp_path), segment_rows=100, compact_ratio=1.0)
+    fill(store, 3)
+    store.remove("id0")
+    segment_path, meta_path = store._segments[0].path, store._segments[0].meta_path
+    deletes_path = store._deletes_path(0)
+    store.close()
+    sizes = {path: os.path.getsize(path) for path in (segment_path, meta_path, deletes_path)}
+
+    # Crash mid-add: a whole vector without metadata, plus half a vector;
+    # a metadata line without its newline; half a tombstone line
+    with open(segment_path, "ab") as f:
+        f.write(vectors(1, seed=7).tobytes() + b"\x00" * 5)
+    with open(meta_path, "ab") as f:
+        f.write(b'["torn",{')
+    with open(deletes_path, "ab") as f:
+        f.write(b'{"d":[[0,')
+
+    reopened = PersistentVectorStore(str(tmp_path), segment_rows=100, compact_ratio=1.0)
+    assert len(reopened) == 2
+    assert {path: os.path.getsize(path) for path in sizes} == sizes
+    assert live_ids(reopened) == {"id1", "id2"}
+
+    reopened.add("after", vectors(1, seed=8)[0], {"ok": True})
+    reopened.close()
+    again = PersistentVectorStore(str(tmp_path), segment_rows=100)
+    assert live_ids(again) == {"id1", "id2", "after"}
+    again.close()
+
+
+def test_stray_files_are_removed_on_open(tmp_path):
+    store = PersistentVectorStore(str(tmp_path), segment_rows=4)
+    fill(store, 4)
+    store.close()
+
+    stray = _Segment(str(tmp_path), 42, DIM)
+    for path in (stray.path, stray.meta_path):
+        open(path, "wb").close()
+    for name in ("deletes-000007.jsonl", "manifest.json.tmp", "notes.txt"):
+        open(os.path.join(tmp_path, name), "w").close()
+
+    reopened = PersistentVectorStore(str(tmp_path), segment_rows=4)
+    names = set(os.listdir(tmp_path))
+    assert not {os.path.basename(stray.path), os.path.basename(stray.meta_path),
+                "deletes-000007.jsonl", "manifest.json.tmp"} & names
+    assert {"manifest.json", "notes.txt", "seg-000000.f32", "seg-000000.jsonl"} <= names
+    assert len(reopened) == 4
+    reopened.close()
@@ -0,0 +1,79 @@
+import pytest
+
+from clients.client_loader import ClientLoader
+from reflection.policy_engine import PolicyEngine, PolicyRule
+
+RULES = [
+    {"id": "weapons", "keywords": ["gun", "weapon sale"]},
+    {"id": "spam", "keywords": ["spam"], "match": "word", "action": "warn"},
+    {"id": "card", "regex": "[0-9]{4} ?[0-9]{4} ?[0-9]{4}", "intents": ["sales"]},
+]
+
+
+def rule_ids(engine, text, intent=None, client_id=None):
+    return [rule.rule_id for rule in engine.evaluate(text, intent, client_id)]
+
+
+def test_prefix_and_phrase_matching():
+    engine = PolicyEngine(RULES)
+    assert rule_ids(engine, "Where can I buy GUNS?") == ["weapons"]
+    assert rule_ids(engine, "any weapons sales here") == ["weapons"]
+    assert rule_ids(engine, "a weapon for sale") == []
+    assert rule_ids(engine, "nice day") == []
+
+
+def test_word_matching_needs_the_whole_word():
+    engine = PolicyEngine(RULES)
+    assert rule_ids(engine, "this is spam") == ["spam"]
+    assert rule_ids(engine, "spammy offers") == []
+
+
+def test_regex_rules_respect_intents():
+    engine = PolicyEngine(RULES)
+    assert rule_ids(engine, "card 1234 5678 9012", intent="sales") == ["card"]
+    assert rule_ids(engine, "card 1234 5678 9012", intent="support") == []
+
+
+@pytest.mark.parametrize("data", [
+    {"id": "bad", "keywords": "gun"},
+    {"id": "bad", "keywords": ["gun", 3]},
+    {"id": "bad", "keywords": ["gun"], "intents": "sales"},
+    {"id": "bad", "regex": 5},
+])
+def test_malformed_rules_are_rejected(data):
+    with pytest.raises(ValueError):
+        PolicyRule.from_dict(data)
+
+
+def test_bad_tenant_rules_are_skipped(monkeypatch):
+    config = {"dharma_rules": [
+        "not a dict",
+        {"id": "str-keywords", "keywords": "gun"},
+        {"keywords": ["no id"]},
+        {"id": "tenant", "keywords": ["refund"]},
+    ]}
+    monkeypatch.setattr(ClientLoader, "load_optional_config", lambda client_id: config)
+    engine = PolicyEngine(RULES)
+
+    assert rule_ids(engine, "i want a refund", client_id="acme") == ["tenant"]
+    assert rule_ids(engine, "good nice day", client_id="acme") == []
+
+
+def test_tenant_rules_that_are_not_a_list_are_ignored(monkeypatch):
+    monkeypatch.setattr(ClientLoader, "load_optional_config",
+                        lambda client_id: {"dharma_rules": {"id": "x"}})
+    engine = PolicyEngine(RULES)
+    assert engine.policy_for("acme") is engine.global_policy
+
+
+def test_client_policies_are_an_lru(monkeypatch):
+    monkeypatch.setattr(ClientLoader, "load_optional_config",
+                        lambda client_id: {"dharma_rules": [
+                            {"id": client_id, "keywords": [client_id]}]})
+    engine = PolicyEngine(RULES, max_clients=2)
+    for client_id in ("a1", "b2", "c3"):
+        engine.policy_for(client_id)
+
+    assert list(engine._client_policies) == ["b2", "c3"]
+    assert rule_ids(engine, "a1 b2", client_id="b2") == ["b2"]
+    assert engine.policy_for("../etc") is engine.global_policy
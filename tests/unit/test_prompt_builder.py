@@ -0,0 +1,26 @@
+from workflows.prompt_builder import PromptBuilder, PromptField
+
+
+def make_builder(**kwargs):
+    return PromptBuilder(template="{user_input}\n{context}",
+                         fields=[PromptField("product")],
+                         legacy_template="{user_input}\nContext: {context}",
+                         **kwargs)
+
+
+def test_legacy_prompt_is_only_rendered_on_sampled_builds():
+    builder = make_builder(legacy_sample_every=4)
+    context = {"product": "solar panel", "trace_id": "x" * 200}
+
+    reports = [builder.build("hello", context)[1] for _ in range(8)]
+
+    sampled = [i for i, report in enumerate(reports) if "tokens_saved" in report]
+    assert sampled == [0, 4]
+    assert reports[0]["tokens_saved"] > 0
+    assert reports[0]["tokens_saved_estimate"] == reports[0]["tokens_saved"] * 4
+
+
+def test_legacy_sampling_can_be_disabled():
+    builder = make_builder(legacy_sample_every=0)
+    _, report = builder.build("hello", {"product": "solar panel"})
+    assert "legacy_tokens" not in report
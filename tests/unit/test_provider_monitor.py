@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+
+from integrations.llm import BaseLLMProvider, LLMRegistry
+from integrations.llm.http_pool import HTTPPool
+from integrations.llm.local_llm import LocalLLMProvider
+from integrations.llm.router import LLMRouter
+from monitoring.provider_monitor import ProviderHealthMonitor
+
+
+class ProbedProvider(BaseLLMProvider):
+    def __init__(self):
+        super().__init__({})
+        self.fail = False
+
+    def generate(self, prompt, context=None, **kwargs):
+        return {"text": "ok", "tokens_used": 1}
+
+    def health_check(self):
+        return not self.fail
+
+    async def ahealth_check(self):
+        return not self.fail
+
+
+def make_router(monkeypatch):
+    router = LLMRouter(policy="ordered", failure_threshold=1, reset_timeout=60)
+    provider = ProbedProvider()
+    router.add("primary", provider)
+    monkeypatch.setattr(LLMRegistry, "_active_provider", router)
+    return router.get("primary").breaker, provider
+
+
+def test_monitor_only_closes_breakers_it_tripped(monkeypatch):
+    breaker, provider = make_router(monkeypatch)
+    monitor = ProviderHealthMonitor(down_after=1)
+
+    # Opened by a failed call: a healthy probe must leave it open
+    breaker.record_failure()
+    asyncio.run(monitor.probe_all())
+    assert breaker.state == "open"
+
+    # Opened by the monitor: its next healthy probe closes it again
+    breaker.record_success()
+    provider.fail = True
+    asyncio.run(monitor.probe_all())
+    assert breaker.state == "open"
+    provider.fail = False
+    asyncio.run(monitor.probe_all())
+    assert breaker.state == "closed"
+
+
+def test_monitor_does_not_close_a_breaker_reopened_by_traffic(monkeypatch):
+    breaker, provider = make_router(monkeypatch)
+    monitor = ProviderHealthMonitor(down_after=1)
+
+    provider.fail = True
+    asyncio.run(monitor.probe_all())
+    breaker.record_failure()  # a real call failed after the monitor tripped it
+    provider.fail = False
+    asyncio.run(monitor.probe_all())
+    assert breaker.state == "open"
+
+
+def test_health_check_requires_2xx(monkeypatch):
+    provider = LocalLLMProvider({"base_url": "http://llm.test/v1"})
+
+    for status, healthy in ((200, True), (401, False), (404, False), (503, False)):
+        transport = httpx.MockTransport(lambda request: httpx.Response(status))
+        sync_client = httpx.Client(transport=transport, base_url=provider.base_url)
+        async_client = httpx.AsyncClient(transport=transport, base_url=provider.base_url)
+        monkeypatch.setattr(HTTPPool, "get_sync", lambda *args: sync_client)
+        monkeypatch.setattr(HTTPPool, "get_async", lambda *args: async_client)
+
+        assert provider.health_check() is healthy
+        assert asyncio.run(provider.ahealth_check()) is healthy
+        sync_client.close()
+        asyncio.run(async_client.aclose())
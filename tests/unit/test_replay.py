@@ -0,0 +1,85 @@
+import asyncio
+
+from integrations.llm import BaseLLMProvider
+from integrations.llm.replay import ReplayProvider
+from integrations.llm.tokenizer import count_tokens
+
+
+class EchoProvider(BaseLLMProvider):
+    def __init__(self):
+        super().__init__({})
+
+    def generate(self, prompt, context=None, **kwargs):
+        return {"text": f"echo {prompt}", "tokens_used": 2, "model": "echo"}
+
+    async def agenerate(self, prompt, context=None, **kwargs):
+        return self.generate(prompt, context, **kwargs)
+
+    async def astream(self, prompt, context=None, **kwargs):
+        for word in ("streamed", "echo", prompt):
+            yield word + " "
+
+    def health_check(self):
+        return True
+
+
+def test_recording_uses_one_writer_per_cassette(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    recorder = ReplayProvider(path, mode="record", inner=EchoProvider())
+
+    recorder.generate("a")
+    asyncio.run(recorder.agenerate("b"))
+    ReplayProvider(path, mode="record", inner=EchoProvider()).generate("c")
+    ReplayProvider.close_all()
+
+    with open(path, "rb") as f:
+        assert f.read().count(b"\x1f\x8b\x08") == 1  # a single gzip member
+    replay = ReplayProvider(path, mode="replay", latency="none", on_miss="error")
+    assert replay.stats()["entries"] == 3
+    assert replay.generate("b")["text"] == "echo b"
+
+
+def test_truncated_cassette_keeps_complete_lines(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    recorder = ReplayProvider(path, mode="record", inner=EchoProvider())
+    for prompt in ("a", "b"):
+        recorder.generate(prompt)
+    recorder.close()
+
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-8])  # drop the gzip trailer, as after a crash
+
+    replay = ReplayProvider(path, mode="replay", latency="none")
+    assert replay.stats()["entries"] == 2
+
+
+def test_recording_does_not_keep_entries_in_memory(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    recorder = ReplayProvider(path, mode="record", inner=EchoProvider())
+    for i in range(50):
+        recorder.generate(f"prompt {i}")
+    recorder.close()
+
+    assert recorder.stats()["recorded"] == 50
+    assert recorder._entries == {} and recorder._all == []
+    assert ReplayProvider(path, mode="replay").stats()["entries"] == 50
+
+
+def test_recorded_streams_count_tokens(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    recorder = ReplayProvider(path, mode="record", inner=EchoProvider())
+
+    async def stream():
+        return [chunk async for chunk in recorder.astream("hello there")]
+
+    assert "".join(asyncio.run(stream())) == "streamed echo hello there "
+    recorder.close()
+
+    replay = ReplayProvider(path, mode="replay", latency="none", on_miss="error")
+    response = replay.generate("hello there")
+    assert response["text"] == "streamed echo hello there "
+    assert response["tokens_used"] == (count_tokens("hello there")
+                                       + count_tokens("streamed echo hello there "))
+    assert response["tokens_used"] > 0
@@ -0,0 +1,86 @@
+import time
+
+from orchestrator.response_cache import ResponseCache
+
+OK = {"status": "success", "reply": "hello"}
+
+
+def key(text="Hi there!", intent="chat", client_id="acme", version="v1",
+        context=None, context_keys=()):
+    return ResponseCache.make_key(text, intent, client_id, version, context, context_keys)
+
+
+def test_key_ignores_case_punctuation_and_whitespace():
+    assert key("Hi   there!") == key("hi there") == key(" HI, THERE ")
+    assert key("hi there") != key("hi where")
+
+
+def test_key_separates_tenants_intents_and_versions():
+    base = key()
+    assert key(client_id="other") != base
+    assert key(client_id=None) != base
+    assert key(intent="sales") != base
+    assert key(version="v2") != base
+
+
+def test_key_digests_only_declared_nonempty_context():
+    keys = ("customer_name",)
+    alice = key(context={"customer_name": "Alice"}, context_keys=keys)
+    bob = key(context={"customer_name": "Bob"}, context_keys=keys)
+
+    assert alice != bob
+    assert key(context={"customer_name": "Alice", "trace_id": "x"}, context_keys=keys) == alice
+    assert key(context={"customer_name": ""}, context_keys=keys) == key()
+    assert key(context={"customer_name": "Alice"}) == key()
+
+
+def test_context_keys_come_from_the_workflow_or_its_prompt_builder():
+    class Declared:
+        cache_context_keys = ["history"]
+
+    class Builder:
+        context_keys = ("customer_name",)
+
+    class Built:
+        prompt_builder = Builder()
+
+    assert ResponseCache.context_keys(Declared()) == ("history",)
+    assert ResponseCache.context_keys(Built()) == ("customer_name",)
+    assert ResponseCache.context_keys(object()) is None
+
+
+def test_only_successful_results_for_cacheable_intents_are_stored():
+    cache = ResponseCache(intent_ttls={"chat": 60})
+    assert cache.cacheable("chat") and not cache.cacheable("sales")
+
+    cache.put(key(intent="sales"), "sales", OK)
+    cache.put(key(text="blocked"), "chat", {"status": "blocked"})
+    cache.put(key(), "chat", OK)
+
+    assert cache.get(key(intent="sales")) is None
+    assert cache.get(key(text="blocked")) is None
+    assert cache.get(key()) == OK
+
+
+def test_entries_expire_and_are_copies():
+    cache = ResponseCache(intent_ttls={"chat": 0.05})
+    cache.put(key(), "chat", OK)
+
+    cache.get(key())["reply"] = "mutated"
+    assert cache.get(key()) == OK
+
+    time.sleep(0.06)
+    assert cache.get(key()) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_lru_evicts_the_least_recently_used():
+    cache = ResponseCache(max_entries=2, intent_ttls={"chat": 60})
+    for text in ("a", "b"):
+        cache.put(key(text), "chat", OK)
+    cache.get(key("a"))
+    cache.put(key("c"), "chat", OK)
+
+    assert cache.get(key("b")) is None
+    assert cache.get(key("a")) == OK
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import numpy as np
+
+from integrations.llm import BaseLLMProvider
+from integrations.llm.semantic_cache import SemanticCache
+
+# Fixed unit vectors: cos(a, a_close) = 0.95, cos(a, a_far) = 0.5
+VECTORS = {
+    "a": [1.0, 0.0],
+    "a_close": [0.95, np.sqrt(1 - 0.95 ** 2)],
+    "a_far": [0.5, np.sqrt(0.75)],
+}
+
+
+def embedder(text):
+    return np.asarray(VECTORS[text], dtype=np.float32)
+
+
+class CountingLLM(BaseLLMProvider):
+    def __init__(self):
+        super().__init__({})
+        self.calls = 0
+
+    def generate(self, prompt, context=None, **kwargs):
+        self.calls += 1
+        return {"text": f"reply {self.calls}", "tokens_used": 3}
+
+    async def astream(self, prompt, context=None, **kwargs):
+        self.calls += 1
+        for word in ("streamed", "reply"):
+            yield word + " "
+
+    def health_check(self):
+        return True
+
+
+def make_cache(**kwargs):
+    llm = CountingLLM()
+    return SemanticCache(llm, embedder, **kwargs), llm
+
+
+def test_similar_prompts_hit_above_the_threshold():
+    cache, llm = make_cache(threshold=0.9)
+    first = cache.generate("a")
+
+    hit = cache.generate("a_close")
+    assert hit["text"] == first["text"] and hit["cached"] is True
+    assert cache.generate("a_far")["text"] == "reply 2"
+    assert llm.calls == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_a_stricter_threshold_misses():
+    cache, llm = make_cache(threshold=0.99)
+    cache.generate("a")
+    assert "cached" not in cache.generate("a_close")
+    assert llm.calls == 2
+
+
+def test_entries_expire_after_the_ttl():
+    cache, llm = make_cache(ttl=0.05)
+    cache.generate("a")
+    assert cache.generate("a")["cached"] is True
+
+    time.sleep(0.06)
+    assert "cached" not in cache.generate("a")
+    assert llm.calls == 2
+    assert cache.stats()["expired"] == 1
+
+
+def test_tenants_never_share_entries():
+    cache, llm = make_cache()
+    cache.generate("a", tenant="acme")
+
+    assert "cached" not in cache.generate("a", tenant="globex")
+    assert "cached" not in cache.generate("a")
+    assert cache.generate("a", tenant="acme")["cached"] is True
+
+    cache.clear("acme")
+    assert "cached" not in cache.generate("a", tenant="acme")
+    assert cache.generate("a", tenant="globex")["cached"] is True
+    assert llm.calls == 4
+
+
+def test_prompt_template_and_params_are_part_of_the_namespace():
+    cache, llm = make_cache()
+    cache.generate("Q: a", semantic_key="a")
+
+    assert cache.generate("Q: a_close", semantic_key="a_close")["cached"] is True
+    assert "cached" not in cache.generate("Other: a", semantic_key="a")
+    assert "cached" not in cache.generate("Q: a", semantic_key="a", temperature=0.1)
+
+
+def test_calls_with_context_bypass_the_cache():
+    cache, llm = make_cache()
+    history = [{"role": "user", "content": "earlier"}]
+    cache.generate("a", history)
+    cache.generate("a", history)
+    assert llm.calls == 2 and cache.stats()["bypassed"] == 2
+
+
+def test_streams_are_stored_and_replayed():
+    cache, llm = make_cache()
+
+    async def stream(prompt):
+        return [chunk async for chunk in cache.astream(prompt)]
+
+    assert asyncio.run(stream("a")) == ["streamed ", "reply "]
+    assert asyncio.run(stream("a_close")) == ["streamed reply "]
+    assert llm.calls == 1
+
+
+def test_each_namespace_keeps_at_most_max_entries():
+    cache, llm = make_cache(max_entries=1)
+    cache.generate("a")
+    cache.generate("a_far")
+
+    assert cache.stats()["entries"] == 1 and cache.stats()["evictions"] == 1
+    assert "cached" not in cache.generate("a")
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from integrations.llm import BaseLLMProvider
+from integrations.llm.single_flight import SingleFlight
+
+
+class GatedLLM(BaseLLMProvider):
+    """
+    Calls block until `release` is set, then answer or raise `error`.
+    """
+
+    def __init__(self):
+        super().__init__({})
+        self.calls = 0
+        self.cancelled = 0
+        self.error = None
+        self.release = None
+        self.sync_release = threading.Event()
+
+    def _answer(self, prompt):
+        if self.error is not None:
+            raise self.error
+        return {"text": f"reply to {prompt}", "tokens_used": 1}
+
+    def generate(self, prompt, context=None, **kwargs):
+        self.calls += 1
+        self.sync_release.wait(5)
+        return self._answer(prompt)
+
+    async def agenerate(self, prompt, context=None, **kwargs):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self._answer(prompt)
+
+    def health_check(self):
+        return True
+
+
+async def start(flight, n, prompt="hi", **kwargs):
+    tasks = [asyncio.create_task(flight.agenerate(prompt, **kwargs)) for _ in range(n)]
+    await asyncio.sleep(0)
+    return tasks
+
+
+def test_identical_async_calls_share_one_upstream_call():
+    llm = GatedLLM()
+    flight = SingleFlight(llm)
+
+    async def run():
+        llm.release = asyncio.Event()
+        tasks = await start(flight, 5)
+        other = await start(flight, 1, prompt="other")
+        llm.release.set()
+        return await asyncio.gather(*tasks, *other)
+
+    results = asyncio.run(run())
+    assert [r["text"] for r in results] == ["reply to hi"] * 5 + ["reply to other"]
+    assert llm.calls == 2
+    assert flight.stats() == {"calls": 6, "upstream": 2, "coalesced": 4, "in_flight": 0}
+
+    results[0]["text"] = "mutated"
+    assert results[1]["text"] == "reply to hi"
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    llm = GatedLLM()
+    llm.error = RuntimeError("upstream down")
+    flight = SingleFlight(llm)
+
+    async def run():
+        llm.release = asyncio.Event()
+        tasks = await start(flight, 3)
+        llm.release.set()
+        errors = await asyncio.gather(*tasks, return_exceptions=True)
+
+        llm.error = None
+        return errors, await flight.agenerate("hi")
+
+    errors, retry = asyncio.run(run())
+    assert [str(e) for e in errors] == ["upstream down"] * 3
+    assert retry["text"] == "reply to hi"
+    assert llm.calls == 2
+
+
+def test_cancelling_one_waiter_leaves_the_others():
+    llm = GatedLLM()
+    flight = SingleFlight(llm)
+
+    async def run():
+        llm.release = asyncio.Event()
+        first, second = await start(flight, 2)
+        first.cancel()
+        await asyncio.sleep(0)
+        llm.release.set()
+        return first, await second
+
+    first, result = asyncio.run(run())
+    assert first.cancelled()
+    assert result["text"] == "reply to hi"
+    assert llm.cancelled == 0
+
+
+def test_upstream_is_cancelled_when_every_waiter_leaves():
+    llm = GatedLLM()
+    flight = SingleFlight(llm)
+
+    async def run():
+        llm.release = asyncio.Event()
+        tasks = await start(flight, 2)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        # The next call starts a fresh upstream call
+        llm.release.set()
+        return await flight.agenerate("hi")
+
+    result = asyncio.run(run())
+    assert llm.cancelled == 1
+    assert result["text"] == "reply to hi"
+    assert llm.calls == 2
+
+
+def test_sync_callers_wait_for_the_leader():
+    llm = GatedLLM()
+    flight = SingleFlight(llm)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.generate, "hi") for _ in range(4)]
+        while flight.stats()["calls"] < 4:
+            threading.Event().wait(0.005)
+        llm.sync_release.set()
+        results = [f.result() for f in futures]
+
+    assert [r["text"] for r in results] == ["reply to hi"] * 4
+    assert llm.calls == 1
+
+
+def test_sync_errors_reach_every_caller():
+    llm = GatedLLM()
+    llm.error = ValueError("bad request")
+    flight = SingleFlight(llm)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.generate, "hi") for _ in range(3)]
+        while flight.stats()["calls"] < 3:
+            threading.Event().wait(0.005)
+        llm.sync_release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="bad request"):
+                future.result()
+
+    assert llm.calls == 1
+    assert flight.stats()["in_flight"] == 0
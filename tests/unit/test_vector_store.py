@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from memory.vector_store import VectorStore, normalize, top_k_indices
+
+DIM = 16
+
+
+def vectors(n, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+
+
+def brute_force(data, query, k):
+    scores = normalize(data) @ normalize(query)
+    return list(np.argsort(-scores, kind="stable")[:k])
+
+
+def test_search_matches_a_brute_force_scan():
+    data = vectors(200)
+    store = VectorStore(capacity=8)  # grows several times
+    store.add_many([f"id{i}" for i in range(200)], data, [{"n": i} for i in range(200)])
+
+    for query in vectors(5, seed=1):
+        hits = store.search(query, top_k=10)
+        assert [item_id for _, item_id, _ in hits] == [f"id{i}" for i in brute_force(data, query, 10)]
+        scores = [score for score, _, _ in hits]
+        assert scores == sorted(scores, reverse=True)
+    assert store.search(data[42])[0][:2] == (pytest.approx(1.0), "id42")
+
+
+def test_search_many_equals_search():
+    store = VectorStore()
+    store.add_many([f"id{i}" for i in range(50)], vectors(50))
+    queries = vectors(4, seed=2)
+
+    for batched, query in zip(store.search_many(queries, top_k=5), queries):
+        single = store.search(query, top_k=5)
+        assert [hit[1] for hit in batched] == [hit[1] for hit in single]
+        assert [hit[0] for hit in batched] == pytest.approx([hit[0] for hit in single])
+
+
+def test_remove_keeps_ids_metadata_and_rows_aligned():
+    data = vectors(5)
+    store = VectorStore()
+    store.add_many([f"id{i}" for i in range(5)], data, [{"n": i} for i in range(5)])
+    store.remove("id1")
+    store.remove("missing")
+
+    assert len(store) == 4 and store.ids == ["id0", "id2", "id3", "id4"]
+    for i in (0, 2, 3, 4):
+        score, item_id, metadata = store.search(data[i])[0]
+        assert (item_id, metadata) == (f"id{i}", {"n": i})
+
+
+def test_empty_store_and_bad_input():
+    store = VectorStore()
+    assert store.search(vectors(1)[0]) == []
+    assert store.search_many(vectors(2)) == [[], []]
+
+    store.add("a", vectors(1)[0])
+    with pytest.raises(ValueError):
+        store.add("b", np.ones(DIM + 1))
+    with pytest.raises(ValueError):
+        store.add_many(["c", "d"], vectors(1))
+    assert store.search(vectors(1)[0], top_k=10)[0][1] == "a"
+
+
+def test_helpers():
+    assert np.allclose(np.linalg.norm(normalize(vectors(3)), axis=1), 1.0)
+    assert not normalize(np.zeros((1, DIM))).any()
+    scores = np.array([[0.1, 0.9, 0.5, 0.7]])
+    assert top_k_indices(scores, 2).tolist() == [[1, 3]]
+    assert top_k_indices(scores, 10).tolist() == [[1, 3, 2, 0]]
+    assert top_k_indices(scores, 0).shape == (1, 0)
@@ -0,0 +1,40 @@
+import asyncio
+
+from workflows import registry as registry_module
+from workflows.registry import WorkflowRegistry
+
+
+class Builtin:
+    def execute(self, user_input, context):
+        return {"status": "success", "reply": "builtin"}
+
+
+def make_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry_module, "CLIENT_PROJECTS_DIR", tmp_path)
+    registry = WorkflowRegistry(builtins={})
+    registry.register("custom", Builtin)
+    return registry
+
+
+def test_tenant_workflows_are_discovered(tmp_path, monkeypatch):
+    directory = tmp_path / "acme" / "custom_workflows"
+    directory.mkdir(parents=True)
+    (directory / "sales.py").write_text(
+        "class Workflow:\n"
+        "    def execute(self, user_input, context):\n"
+        "        return {'status': 'success', 'reply': 'acme'}\n")
+    registry = make_registry(tmp_path, monkeypatch)
+
+    workflow = registry.get("sales", client_id="acme")
+    assert workflow.execute("hi", {})["reply"] == "acme"
+    assert asyncio.run(registry.aget("sales", client_id="acme")) is workflow
+    assert isinstance(registry.get("sales"), Builtin)
+
+
+def test_invalid_client_ids_use_the_builtin_workflows(tmp_path, monkeypatch):
+    registry = make_registry(tmp_path, monkeypatch)
+
+    for client_id in ("../acme", "a/b", "", None):
+        assert isinstance(registry.get("sales", client_id=client_id), Builtin)
+        assert isinstance(asyncio.run(registry.aget("sales", client_id=client_id)), Builtin)
+    assert not registry._tenants